@@ -0,0 +1,104 @@
+import logging
+import uuid
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from apps.organizations.models import Organization
+from .revocation import is_token_denied
+from .tenancy import TENANT_RELATED_FIELDS, resolve_organization, set_request_organization
+from .tokens import PRINCIPAL_CLAIMS
+
+logger = logging.getLogger(__name__)
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that loads the user together with its organization in a single query and exposes
+    the tenant as `request.organization` for views and permission classes.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            user, validated_token = result
+            set_request_organization(request, self.get_organization(user, validated_token))
+        return result
+
+    def get_organization(self, user, validated_token):
+        return resolve_organization(user)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = self.user_model.objects.select_related(*TENANT_RELATED_FIELDS).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+class ClaimsJWTAuthentication(TenantJWTAuthentication):
+    """
+    Authenticates from the access token claims alone, without loading the user.
+
+    The user and organization are model instances built from the claims (see `TenantRefreshToken`),
+    any other field is loaded from the database on first access. Tokens of users that were deactivated
+    or changed since the token was issued are rejected through the Redis deny list. Tokens issued
+    before the claims existed, or requests made while the deny list is unreachable, fall back to the
+    database lookup of TenantJWTAuthentication.
+    """
+
+    def has_principal_claims(self, validated_token):
+        return all(claim in validated_token for claim in PRINCIPAL_CLAIMS)
+
+    def get_user(self, validated_token):
+        if not self.has_principal_claims(validated_token):
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        try:
+            denied = is_token_denied(user_id, validated_token['iat'])
+        except Exception:
+            logger.exception("Token deny list unavailable, loading the user from the database")
+            return super().get_user(validated_token)
+        if denied:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not validated_token['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        try:
+            values = [validated_token['pk'], uuid.UUID(str(user_id)), validated_token['role'],
+                      validated_token['is_active'], validated_token['is_verified']]
+        except (TypeError, ValueError):
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        user = self.user_model.from_db(
+            router.db_for_read(self.user_model), ['pkid', 'id', 'role', 'is_active', 'is_verified'], values
+        )
+        user.from_token_claims = True
+        return user
+
+    def get_organization(self, user, validated_token):
+        if not getattr(user, 'from_token_claims', False):
+            return super().get_organization(user, validated_token)
+        if validated_token['org'] is None:
+            return None
+        return Organization.from_db(
+            router.db_for_read(Organization), ['pkid', 'id'], [validated_token['org'], uuid.UUID(validated_token['org_id'])]
+        )
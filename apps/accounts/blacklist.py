@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+logger = logging.getLogger(__name__)
+
+# Highest BlacklistedToken id, bumped on every blacklisting so each process knows when its filter is behind
+BLACKLIST_VERSION_KEY = 'blacklist-version'
+
+
+class BloomFilter:
+    """
+    Fixed size bloom filter over strings. `in` never misses an added item and wrongly matches
+    other items with roughly `error_rate` probability.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big')
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+
+class TokenBlacklistFilter:
+    """
+    Per process bloom filter of blacklisted refresh token jtis, kept in sync through a version number in the shared cache.
+
+    A jti missing from the filter is certainly not blacklisted, so most checks cost one cache read instead of a
+    query. A match may be a false positive and is confirmed against the BlacklistedToken table. The filter only
+    grows, so it is rebuilt from the unexpired blacklisted tokens once it is full or older than the rebuild interval.
+
+    Ids are not committed in order, so ids skipped while syncing are kept as gaps and looked up again
+    until they show up or GAP_TIMEOUT passes (the transaction that took them was rolled back).
+    """
+    GAP_TIMEOUT = 60
+    # Ids before the latest one checked for gaps when rebuilding
+    GAP_WINDOW = 1000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.synced_through = 0
+        self.built_at = 0
+        self.gaps = {}
+
+    def is_stale(self):
+        return (
+            self.bloom is None
+            or self.bloom.count >= settings.TOKEN_BLACKLIST_FILTER_CAPACITY
+            or time.monotonic() - self.built_at > settings.TOKEN_BLACKLIST_FILTER_REBUILD_INTERVAL
+        )
+
+    def track_gaps(self, first_id, last_id, found_ids):
+        now = time.monotonic()
+        for missing_id in set(range(first_id, last_id + 1)) - found_ids:
+            self.gaps.setdefault(missing_id, now)
+        self.gaps = {gap: since for gap, since in self.gaps.items() if gap not in found_ids and now - since < self.GAP_TIMEOUT}
+
+    def rebuild(self):
+        bloom = BloomFilter(settings.TOKEN_BLACKLIST_FILTER_CAPACITY, settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+        latest = latest_blacklisted_id()
+        # Expired tokens fail verification anyway, only the live ones need to be in the filter
+        rows = BlacklistedToken.objects.filter(id__lte=latest, token__expires_at__gt=timezone.now())
+        for jti in rows.values_list('token__jti', flat=True).iterator(chunk_size=5000):
+            bloom.add(jti)
+        window_start = max(latest - self.GAP_WINDOW, 0) + 1
+        recent_ids = set(BlacklistedToken.objects.filter(id__gte=window_start, id__lte=latest).values_list('id', flat=True))
+        self.bloom, self.synced_through, self.built_at, self.gaps = bloom, latest, time.monotonic(), {}
+        self.track_gaps(window_start, latest, recent_ids)
+
+    def sync(self, version):
+        if self.is_stale():
+            self.rebuild()
+        if version <= self.synced_through and not self.gaps:
+            return
+        rows = BlacklistedToken.objects.filter(
+            Q(id__gt=self.synced_through) | Q(id__in=list(self.gaps))
+        ).values_list('id', 'token__jti')
+        found_ids = set()
+        for blacklisted_id, jti in rows:
+            self.bloom.add(jti)
+            found_ids.add(blacklisted_id)
+        latest = max(found_ids | {self.synced_through})
+        self.track_gaps(self.synced_through + 1, latest, found_ids)
+        self.synced_through = latest
+
+    def might_contain(self, jti):
+        """
+        Returns False when the jti is certainly not blacklisted, None when the filter can't tell.
+        """
+        try:
+            version = get_blacklist_cache().get(BLACKLIST_VERSION_KEY)
+            # The version is lost when the cache is flushed, it is republished from the table
+            if version is None:
+                version = publish_blacklist_version()
+        except Exception:
+            logger.warning("Token blacklist cache unavailable, checking the database", exc_info=True)
+            return None
+        with self.lock:
+            self.sync(version)
+            return jti in self.bloom
+
+
+token_blacklist_filter = TokenBlacklistFilter()
+
+
+def get_blacklist_cache():
+    return caches[settings.AUTH_DENYLIST_CACHE]
+
+
+def latest_blacklisted_id():
+    return BlacklistedToken.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def publish_blacklist_version(blacklisted_id=None):
+    """
+    Tells every process that tokens up to `blacklisted_id` (the latest by default) are blacklisted.
+    """
+    if blacklisted_id is None:
+        blacklisted_id = latest_blacklisted_id()
+    cache = get_blacklist_cache()
+    # Concurrent blacklistings may publish out of order, the version only moves forward
+    if not cache.add(BLACKLIST_VERSION_KEY, blacklisted_id, timeout=None):
+        if blacklisted_id > (cache.get(BLACKLIST_VERSION_KEY) or 0):
+            cache.set(BLACKLIST_VERSION_KEY, blacklisted_id, timeout=None)
+    return blacklisted_id
+
+
+def is_jti_blacklisted(jti):
+    if token_blacklist_filter.might_contain(jti) is False:
+        return False
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def prune_expired_tokens(batch_size=None):
+    """
+    Deletes expired outstanding tokens, and their blacklist entries with them, in batches of `batch_size`.
+
+    Each batch is its own transaction, so locks are short and a large backlog never builds one huge delete.
+    Returns the number of outstanding tokens deleted.
+    """
+    batch_size = batch_size or settings.TOKEN_PRUNE_BATCH_SIZE
+    now = timezone.now()
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                OutstandingToken.objects.filter(expires_at__lte=now).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            BlacklistedToken.objects.filter(token_id__in=batch).delete()
+            OutstandingToken.objects.filter(id__in=batch).delete()
+        deleted += len(batch)
+    if deleted:
+        logger.info(f"Pruned {deleted} expired outstanding tokens")
+    return deleted
@@ -0,0 +1,26 @@
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+
+DENYLIST_KEY = 'denied-since:{}'
+
+
+def get_denylist():
+    return caches[settings.AUTH_DENYLIST_CACHE]
+
+
+def deny_user_tokens(user_id):
+    """
+    Rejects every access token issued to the user up to now.
+
+    Entries only have to outlive the tokens they reject, so they expire after the access token lifetime.
+    Tokens issued afterwards, e.g. after the user is reactivated and logs in again, are accepted.
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    get_denylist().set(DENYLIST_KEY.format(user_id), int(time.time()), timeout=timeout)
+
+
+def is_token_denied(user_id, issued_at):
+    denied_since = get_denylist().get(DENYLIST_KEY.format(user_id))
+    return denied_since is not None and issued_at <= denied_since
@@ -7,7 +7,11 @@ from .user_roles import UserRoles
 from apps.organizations.models import Organization, User  
 import logging
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .tenancy import TENANT_RELATED_FIELDS
+from .tokens import TenantRefreshToken, set_principal_claims
 from rest_framework.exceptions import AuthenticationFailed
 
 logger = logging.getLogger(__name__)
@@ -95,7 +99,7 @@ class LoginSerializer(serializers.Serializer):
             raise AuthenticationFailed("Your account is not verified. Please check your email.")
 
         # Generate JWT tokens using SimpleJWT
-        refresh = RefreshToken.for_user(user)
+        refresh = TenantRefreshToken.for_user(user)
         access = refresh.access_token
 
         return {
@@ -108,5 +112,47 @@ class LoginSerializer(serializers.Serializer):
         }
 
 
+class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = TenantRefreshToken
+
+
+class TenantTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refreshes the principal claims from the current state of the user, so a refreshed access token
+    never carries a stale role, organization or status.
+    """
+    token_class = TenantRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = get_user_model().objects.select_related(*TENANT_RELATED_FIELDS).filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        set_principal_claims(refresh, user)
+
+        access = refresh.access_token
+        # The access token copies the refresh token's "iat", the deny list needs the actual issue time
+        access.set_iat()
+        data = {"access": str(access)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.register_outstanding()
+
+            data["refresh"] = str(refresh)
+
+        return data
+
+
 # class ResendActivationSerializer(serializers.Serializer):
 #     email = serializers.EmailField()
@@ -0,0 +1,111 @@
+import logging
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from apps.caregivers.models import Caregiver
+from apps.patients.models import Patient
+from .blacklist import publish_blacklist_version
+from .models import User
+from .revocation import deny_user_tokens
+
+logger = logging.getLogger(__name__)
+
+# Fields copied into the access token claims, a change makes the issued tokens stale
+CLAIM_FIELDS = ('is_active', 'is_verified', 'role')
+# Profiles whose organization is copied into the `org` claim
+TENANT_PROFILES = (Caregiver, Patient)
+
+
+def revoke_user_tokens(user_id):
+    """
+    Denies the user's access tokens now and again once the transaction commits. A token refreshed before
+    the commit still carries the old claims and is issued after the first entry.
+    """
+    deny_user_tokens(user_id)
+    transaction.on_commit(lambda: deny_user_tokens(user_id))
+
+
+@receiver(pre_save, sender=User)
+def snapshot_token_claims(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._claims_snapshot = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(CLAIM_FIELDS) & set(update_fields):
+        return
+    instance._claims_snapshot = User.objects.filter(pkid=instance.pkid).values(*CLAIM_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_claims_change(sender, instance, created, raw=False, **kwargs):
+    """
+    Revokes the user's access tokens when they are toggled, (un)verified or change role.
+    """
+    old = getattr(instance, '_claims_snapshot', None)
+    if raw or created or old is None:
+        return
+    if any(old[field] != getattr(instance, field) for field in CLAIM_FIELDS):
+        revoke_user_tokens(instance.id)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_user_tokens(instance.id)
+
+
+def get_profile_user_id(profile):
+    if type(profile).user.is_cached(profile):
+        return profile.user.id
+    # None when the profile is deleted along with its user, whose own deletion revokes the tokens
+    return User.objects.filter(pkid=profile.user_id).values_list('id', flat=True).first()
+
+
+def snapshot_profile_organization(sender, instance, **kwargs):
+    # None when the organization is deferred, assigning one later then counts as a change
+    instance._loaded_organization_id = instance.__dict__.get('organization_id')
+
+
+def revoke_tokens_on_organization_change(sender, instance, created, raw=False, **kwargs):
+    """
+    Revokes the access tokens of a caregiver or patient moved to another organization.
+    """
+    organization_id = instance.__dict__.get('organization_id')
+    loaded_organization_id = getattr(instance, '_loaded_organization_id', None)
+    instance._loaded_organization_id = organization_id
+    if raw or created or organization_id is None or organization_id == loaded_organization_id:
+        return
+    user_id = get_profile_user_id(instance)
+    if user_id is not None:
+        revoke_user_tokens(user_id)
+
+
+def revoke_tokens_on_profile_delete(sender, instance, **kwargs):
+    """
+    Revokes the access tokens of a removed caregiver or patient, their `org` claim would keep them in the tenant.
+    """
+    user_id = get_profile_user_id(instance)
+    if user_id is not None:
+        revoke_user_tokens(user_id)
+
+
+for profile_model in TENANT_PROFILES:
+    post_init.connect(snapshot_profile_organization, sender=profile_model)
+    post_save.connect(revoke_tokens_on_organization_change, sender=profile_model)
+    post_delete.connect(revoke_tokens_on_profile_delete, sender=profile_model)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def publish_blacklisted_token(sender, instance, created, **kwargs):
+    """
+    Makes every process pick up the blacklisted token once it is committed.
+    """
+    if not created:
+        return
+
+    def publish():
+        try:
+            publish_blacklist_version(instance.id)
+        except Exception:
+            # Other processes then only see the token once their filter is rebuilt
+            logger.warning("Could not publish the token blacklist version", exc_info=True)
+    transaction.on_commit(publish)
@@ -3,17 +3,17 @@ from django.conf import settings
 from django.template.loader import render_to_string
 from django.contrib.auth.tokens import default_token_generator
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import User
-from apps.organizations.models import Organization
 from django.core.mail import EmailMessage
-from django.conf import settings
 from datetime import datetime, timedelta,timezone
-from .exceptions import UserDoesNotExistException
+from apps.notifications.outbox import queue_email
 import jwt
+from .blacklist import prune_expired_tokens
+from .tokens import get_password_fingerprint
 
-@shared_task
-def send_organization_activation_email(current_site,organization_email):
-    organization = Organization.objects.get(user__email=organization_email)
+def queue_organization_activation_email(current_site, organization):
+    """
+    Queues the account activation email of an organization in the outbox, within the caller's transaction.
+    """
     token = RefreshToken.for_user(organization.user).access_token
     activation_link = f"{settings.REACT_FRONTEND_URL}/auth/verify-email/{str(token)}"
 
@@ -32,30 +32,34 @@ def send_organization_activation_email(current_site,organization_email):
         subject=subject,
         body=html_message,
         from_email=from_email,
-        to=[organization_email],
+        to=[organization.user.email],
     )
     email.content_subtype = "html" 
-    email.send(fail_silently=False)
+    queue_email(f"organization-activation:{token['jti']}", email)
 
-@shared_task
-def send_password_reset_email(user_email):
+
+def build_password_reset_link(user, issued_at, lifetime=timedelta(hours=1)):
     """
-    Sends a password reset email with a JWT token.
+    Returns the frontend link to set a new password, with the JWT token PasswordResetConfirmView accepts.
+    The token is bound to the current password, it stops working once a password is set.
     """
-    try:
-        user = User.objects.get(email=user_email)
-    except User.DoesNotExist:
-        raise UserDoesNotExistException(f"User with email {user_email} does not exist.")
-
-    # Generate a JWT token for password reset (valid for 1 hour)
     payload = {
         "user_id": str(user.id),
-        "exp": datetime.now(timezone.utc) + timedelta(hours=1),  # Use timezone-aware datetime
-        "iat": datetime.now(timezone.utc)
+        "pwd": get_password_fingerprint(user),
+        "exp": issued_at + lifetime,  # Use timezone-aware datetime
+        "iat": issued_at
     }
     reset_token = jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+    return f"{settings.REACT_FRONTEND_URL}/auth/reset-password/{reset_token}"
 
-    reset_link = f"{settings.REACT_FRONTEND_URL}/auth/reset-password/{reset_token}"
+
+def queue_password_reset_email(user):
+    """
+    Queues a password reset email with a JWT token in the outbox.
+    """
+    issued_at = datetime.now(timezone.utc)
+    # The token is valid for 1 hour
+    reset_link = build_password_reset_link(user, issued_at)
 
     context = {
         "user_name": user.get_full_name if user.get_full_name else user.email,
@@ -70,9 +74,17 @@ def send_password_reset_email(user_email):
         subject=subject,
         body=html_message,
         from_email=from_email,
-        to=[user_email],
+        to=[user.email],
     )
     email.content_subtype = "html"
 
-    email.send(fail_silently=False)
-    return f"Password reset email sent to {user_email}"
\ No newline at end of file
+    # Requests within the same second share a key, so a double submit sends one email
+    queue_email(f"password-reset:{user.id}:{int(issued_at.timestamp())}", email)
+
+
+@shared_task
+def prune_expired_refresh_tokens():
+    """
+    Removes expired outstanding and blacklisted refresh tokens so the tables stay the size of the live tokens.
+    """
+    return prune_expired_tokens()
@@ -0,0 +1,48 @@
+from rest_framework.exceptions import NotFound
+from .user_roles import UserRoles
+
+# Reverse relations loaded together with the user, so resolving the organization costs no extra query
+TENANT_RELATED_FIELDS = ('organization', 'caregiver__organization')
+
+
+def resolve_organization(user):
+    """
+    Returns the organization a user works for: its own for organization accounts and the employer for caregivers.
+    Returns None for every other user.
+    """
+    if not user or not user.is_authenticated:
+        return None
+    if user.role == UserRoles.ORGANIZATION:
+        return getattr(user, 'organization', None)
+    if user.role == UserRoles.CAREGIVER:
+        caregiver = getattr(user, 'caregiver', None)
+        return caregiver.organization if caregiver else None
+    return None
+
+
+def set_request_organization(request, organization):
+    # A DRF Request reads unknown attributes from the wrapped HttpRequest, store it there so both see it
+    setattr(getattr(request, '_request', request), 'organization', organization)
+
+
+def get_request_organization(request):
+    """
+    Returns `request.organization`, resolving it from `request.user` the first time when the authentication
+    class did not set it (e.g. token or forced authentication).
+    """
+    try:
+        return request.organization
+    except AttributeError:
+        organization = resolve_organization(request.user)
+        set_request_organization(request, organization)
+        return organization
+
+
+def require_request_organization(request):
+    """
+    Same as `get_request_organization` but raises NotFound when the user has no organization.
+    """
+    organization = get_request_organization(request)
+    if organization is None:
+        raise NotFound("Organization not found for user.")
+    return organization
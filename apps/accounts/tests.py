@@ -1,3 +1,137 @@
-from django.test import TestCase
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.caregivers.models import Caregiver
+from apps.organizations.models import Organization
+from apps.patients.models import Patient
+from shared.text_choices import CaregiverTypes
+from .models import User
+from .revocation import get_denylist, is_token_denied
+from .tasks import build_password_reset_link
+from .tokens import TenantRefreshToken
+from .user_roles import UserRoles
 
-# Create your tests here.
+
+def create_user(email, role):
+    return User.objects.create_user(email=email, password='Test-pass-2025', role=role, is_active=True, is_verified=True)
+
+
+def create_organization(name):
+    user = create_user(f'admin@{name.lower()}.com', UserRoles.ORGANIZATION)
+    return Organization.objects.create(user=user, name=name, acronym=name[:3].upper())
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'auth': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'KEY_PREFIX': 'auth'},
+    },
+    AUTH_DENYLIST_CACHE='auth',
+)
+class TokenRevocationTests(TestCase):
+    """
+    Access tokens carry the user's claims and organization, changing them or removing a caregiver or patient
+    from the organization must revoke the tokens already issued.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization('Lagos')
+        cls.other_organization = create_organization('Abuja')
+        cls.caregiver = Caregiver.objects.create(
+            user=create_user('nurse@lagos.com', UserRoles.CAREGIVER), organization=cls.organization,
+            first_name='Ada', last_name='Okafor', caregiver_type=CaregiverTypes.NURSE,
+        )
+        cls.patient = Patient.objects.create(
+            user=create_user('patient@example.com', UserRoles.PATIENT), organization=cls.organization,
+            first_name='Tunde', last_name='Eze',
+        )
+
+    def setUp(self):
+        get_denylist().clear()
+
+    def get_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {TenantRefreshToken.for_user(user).access_token}')
+        return client
+
+    def search_diagnoses(self, client):
+        return client.get(reverse('diagnosis-search'), {'search': 'malaria'})
+
+    def test_deleting_caregiver_revokes_its_tokens(self):
+        client = self.get_client(self.caregiver.user)
+        self.assertEqual(self.search_diagnoses(client).status_code, 200)
+
+        organization_client = self.get_client(self.organization.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = organization_client.delete(reverse('caregiver-detail', kwargs={'slug': self.caregiver.slug}))
+        self.assertEqual(response.status_code, 204)
+
+        self.assertEqual(self.search_diagnoses(client).status_code, 401)
+
+    def test_moving_caregiver_to_another_organization_revokes_its_tokens(self):
+        client = self.get_client(self.caregiver.user)
+        caregiver = Caregiver.objects.get(pkid=self.caregiver.pkid)
+        caregiver.organization = self.other_organization
+        with self.captureOnCommitCallbacks(execute=True):
+            caregiver.save()
+        self.assertEqual(self.search_diagnoses(client).status_code, 401)
+
+    def test_saving_caregiver_in_same_organization_keeps_its_tokens(self):
+        client = self.get_client(self.caregiver.user)
+        caregiver = Caregiver.objects.get(pkid=self.caregiver.pkid)
+        caregiver.address = '7 Awolowo Road, Ikoyi'
+        with self.captureOnCommitCallbacks(execute=True):
+            caregiver.save()
+        self.assertEqual(self.search_diagnoses(client).status_code, 200)
+
+    def test_deleting_or_moving_patient_revokes_its_tokens(self):
+        token = TenantRefreshToken.for_user(self.patient.user).access_token
+        patient = Patient.objects.get(pkid=self.patient.pkid)
+        patient.organization = self.other_organization
+        with self.captureOnCommitCallbacks(execute=True):
+            patient.save()
+        self.assertTrue(is_token_denied(str(self.patient.user.id), token['iat']))
+
+        get_denylist().clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            patient.delete()
+        self.assertTrue(is_token_denied(str(self.patient.user.id), token['iat']))
+
+    def test_token_refreshed_before_commit_is_revoked_on_commit(self):
+        user = self.caregiver.user
+        # The claims change is written a minute before a refresh that still reads the old claims
+        with mock.patch('apps.accounts.revocation.time.time', return_value=time.time() - 60):
+            with self.captureOnCommitCallbacks() as callbacks:
+                user.is_active = False
+                user.save()
+        stale_token = TenantRefreshToken.for_user(self.caregiver.user).access_token
+        self.assertFalse(is_token_denied(str(user.id), stale_token['iat']))
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(is_token_denied(str(user.id), stale_token['iat']))
+
+
+class PasswordResetTokenTests(TestCase):
+    """
+    A password reset link stops working once it has been used to set a password.
+    """
+
+    def confirm(self, link, password):
+        token = link.rsplit('/', 1)[1]
+        data = {'reset_token': token, 'new_password': password, 'confirm_password': password}
+        return APIClient().post(reverse('password-reset-confirm'), data, format='json')
+
+    def test_reset_link_is_single_use(self):
+        user = create_user('patient@example.com', UserRoles.PATIENT)
+        link = build_password_reset_link(user, datetime.now(timezone.utc), timedelta(days=7))
+
+        self.assertEqual(self.confirm(link, 'Fresh-pass-2025').status_code, 200)
+        response = self.confirm(link, 'Other-pass-2025')
+        self.assertEqual(response.status_code, 400)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('Fresh-pass-2025'))
@@ -0,0 +1,71 @@
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from .blacklist import is_jti_blacklisted
+from .tenancy import resolve_organization
+
+# Claims describing the user, copied into every access token minted from the refresh token
+PRINCIPAL_CLAIMS = ('pk', 'role', 'is_active', 'is_verified', 'org', 'org_id')
+
+
+def set_principal_claims(token, user):
+    """
+    Stores what authentication and the permission classes need to know about the user in the token.
+    """
+    organization = resolve_organization(user)
+    token['pk'] = user.pkid
+    token['role'] = user.role
+    token['is_active'] = user.is_active
+    token['is_verified'] = user.is_verified
+    token['org'] = organization.pkid if organization else None
+    token['org_id'] = str(organization.id) if organization else None
+
+
+def get_password_fingerprint(user):
+    """
+    Digest of the user's password hash carried by password reset tokens. Setting a password changes it,
+    so a reset link only works once.
+    """
+    return salted_hmac('apps.accounts.password-reset', user.password).hexdigest()
+
+
+class TenantRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the principal claims read by ClaimsJWTAuthentication.
+    Its blacklist check goes through the in-memory filter before the BlacklistedToken table.
+    """
+
+    def check_blacklist(self):
+        if is_jti_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def outstanding_defaults(self):
+        # The "user_id" claim holds the uuid while OutstandingToken.user references the integer primary key
+        return {
+            'user_id': self.payload.get('pk'),
+            'created_at': self.current_time,
+            'token': str(self),
+            'expires_at': datetime_from_epoch(self.payload['exp']),
+        }
+
+    def register_outstanding(self):
+        """
+        Records a token minted outside `for_user`, e.g. by rotation, in the outstanding token list.
+        """
+        return OutstandingToken.objects.create(jti=self.payload[api_settings.JTI_CLAIM], **self.outstanding_defaults())
+
+    def blacklist(self):
+        token, _ = OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM], defaults=self.outstanding_defaults()
+        )
+        return BlacklistedToken.objects.get_or_create(token=token)
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        set_principal_claims(token, user)
+        return token
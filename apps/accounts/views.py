@@ -3,10 +3,13 @@ from rest_framework.response import Response
 from shared.custom_validation_error import CustomValidationError
 from .serializers import OrganizationSignupSerializer,LoginSerializer
 from .models import User
-from apps.accounts.tasks import send_organization_activation_email,send_password_reset_email
+from .tokens import TenantRefreshToken, get_password_fingerprint
+from apps.accounts.tasks import queue_organization_activation_email,queue_password_reset_email
 from django.contrib.sites.shortcuts import get_current_site
 import jwt
 from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from .user_roles import UserRoles
 from rest_framework import generics, status
@@ -36,14 +39,13 @@ class OrganizationSignupView(generics.GenericAPIView):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             try:
-                organization = serializer.save()
-                organization_user = organization.user
-                organization_email = organization_user.email
                 current_site_domain = get_current_site(request).domain
-                try:
-                    send_organization_activation_email.delay(current_site_domain, organization_email)
-                except Exception as email_error:
-                    raise OrganizationVerificationEmailFailedException()    
+                with transaction.atomic():
+                    organization = serializer.save()
+                    try:
+                        queue_organization_activation_email(current_site_domain, organization)
+                    except Exception as email_error:
+                        raise OrganizationVerificationEmailFailedException()    
                 return Response({"message": "Organization registered successfully","data":serializer.data}, status=status.HTTP_201_CREATED)
             except Exception as e:
                 raise OrganizationSignupException(detail=e.add_note("An unexpected error occurred. Please try again later."))
@@ -247,14 +249,14 @@ class ResendActivationLinkView(APIView):
             raise ValidationError({"Email is required"})
 
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.select_related('organization').get(email=email, organization__isnull=False)
 
             if user.is_active and user.is_verified:
                 raise AccountAlreadyActiveException()
 
             current_site_domain = get_current_site(request).domain
 
-            send_organization_activation_email.delay(current_site_domain, email)
+            queue_organization_activation_email(current_site_domain, user.organization)
 
             return Response({"message": "Activation link has been resent. Please check your email"},status=status.HTTP_200_OK)
 
@@ -300,7 +302,7 @@ class LogoutView(APIView):
             raise ValidationError("Refresh token is required.")
 
         try:
-            RefreshToken(refresh_token).blacklist()
+            TenantRefreshToken(refresh_token).blacklist()
             return Response({"message": "Successfully logged out"}, status=200)
         
         except TokenError:
@@ -314,7 +316,7 @@ class PasswordResetRequestView(APIView):
         email = request.data.get("email")
         try:
             user = User.objects.get(email=email)
-            send_password_reset_email.delay(user.email)
+            queue_password_reset_email(user)
             return Response({"message": "Password reset link sent","data":email}, status=status.HTTP_200_OK)
         except User.DoesNotExist:
             raise UserDoesNotExistException()
@@ -336,6 +338,8 @@ class PasswordResetConfirmView(APIView):
             # Decode the token
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
             user = User.objects.get(id=payload["user_id"])
+            if not constant_time_compare(str(payload.get("pwd", "")), get_password_fingerprint(user)):
+                raise InvalidPasswordResetTokenException("This reset link has already been used.")
 
             # Validate the password using Django's built-in validators
             try:
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0002_alter_caregiver_profile_picture'),
+        ('organizations', '0002_remove_organization_logo_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='caregiver',
+            index=models.Index(fields=['organization', '-created_at', '-pkid'], name='caregiver_org_created_idx'),
+        ),
+    ]
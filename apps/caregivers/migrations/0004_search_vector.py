@@ -0,0 +1,71 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:26
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The search vector, its GIN index and the trigram indexes are PostgreSQL only.
+# They are created here rather than in Meta.indexes so the app still migrates on other databases.
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('simple', coalesce({prefix}first_name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce({prefix}last_name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce({prefix}{code_field}, '')), 'B')
+"""
+
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := """ + SEARCH_VECTOR_SQL.format(prefix='NEW.', code_field='{code_field}') + """;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER {table}_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF first_name, last_name, {code_field} ON {table}
+    FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update();
+    """,
+    "UPDATE {table} SET search_vector = " + SEARCH_VECTOR_SQL.format(prefix='', code_field='{code_field}') + ";",
+    "CREATE INDEX {index_prefix}_search_vector_idx ON {table} USING gin (search_vector);",
+    "CREATE INDEX {index_prefix}_first_name_trgm_idx ON {table} USING gin (first_name gin_trgm_ops);",
+    "CREATE INDEX {index_prefix}_last_name_trgm_idx ON {table} USING gin (last_name gin_trgm_ops);",
+    "CREATE INDEX {index_prefix}_{code_field}_trgm_idx ON {table} USING gin ({code_field} gin_trgm_ops);",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS {index_prefix}_{code_field}_trgm_idx;",
+    "DROP INDEX IF EXISTS {index_prefix}_last_name_trgm_idx;",
+    "DROP INDEX IF EXISTS {index_prefix}_first_name_trgm_idx;",
+    "DROP INDEX IF EXISTS {index_prefix}_search_vector_idx;",
+    "DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table};",
+    "DROP FUNCTION IF EXISTS {table}_search_vector_update();",
+]
+
+SEARCH_OPTIONS = {'table': 'caregivers_caregiver', 'index_prefix': 'caregiver', 'code_field': 'staff_number'}
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement.format(**SEARCH_OPTIONS))
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='caregiver',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(run_statements(FORWARD_SQL), run_statements(REVERSE_SQL)),
+    ]
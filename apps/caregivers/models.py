@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 
 # Create your models here.
 from django.db import models
@@ -11,7 +12,7 @@ from django.utils.translation import gettext_lazy as _
 from shared.validators import validate_phone_number
 from shared.text_choices import Gender,MaritalStatus,CaregiverTypes
 from apps.accounts.models import User
-from apps.organizations.models import Organization
+from apps.organizations.models import Organization, OrganizationSequence
 from .utils import role_abbreviation
 from datetime import date
 from cloudinary.models import CloudinaryField
@@ -42,6 +43,8 @@ class Caregiver(TimeStampedUUID):
     address = models.TextField(verbose_name=_("Caregiver's Address"),blank=True,null=True)
     slug = AutoSlugField(populate_from='user', unique=True)
     staff_number = models.CharField(max_length=30, unique=True,blank=True,null=True)
+    # Maintained by a database trigger, see the search_vector migration
+    search_vector = SearchVectorField(blank=True,null=True,editable=False)
     
 
 
@@ -49,6 +52,9 @@ class Caregiver(TimeStampedUUID):
         verbose_name = _("Caregiver")
         verbose_name_plural = _("Caregivers")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=['organization', '-created_at', '-pkid'], name='caregiver_org_created_idx'),
+        ]
 
     @property
     def profile_picture_url(self):
@@ -68,17 +74,17 @@ class Caregiver(TimeStampedUUID):
 
 
     def generate_unique_staff_number(self):
-        acronym = self.organization.acronym.upper() 
-        role_abbr = role_abbreviation.get(self.caregiver_type, "UNK")  # Use UNK if role is not found
-        caregiver_count = Caregiver.objects.filter(organization=self.organization, caregiver_type=self.caregiver_type).count() + 1
+        return Caregiver.allocate_staff_numbers(self.organization, self.caregiver_type)[0]
 
-        while True:
-            # Generate the staff number
-            staff_number = f"{acronym}_{role_abbr}_{caregiver_count}"
-            # Check for conflicts
-            if not Caregiver.objects.filter(staff_number=staff_number).exists():
-                return staff_number
-            caregiver_count += 1  # Increment the count if conflict exists
+    @staticmethod
+    def allocate_staff_numbers(organization, caregiver_type, count=1):
+        """
+        Reserves `count` staff numbers for the organization and caregiver type in one query, e.g. ACME_DR_12.
+        """
+        acronym = organization.acronym.upper()
+        role_abbr = role_abbreviation.get(caregiver_type, "UNK")  # Use UNK if role is not found
+        values = OrganizationSequence.allocate(f"staff_number:{acronym}_{role_abbr}", count)
+        return [f"{acronym}_{role_abbr}_{value}" for value in values]
     
     @property
     def full_name(self):
@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from apps.accounts.user_roles import UserRoles
+from apps.accounts.tenancy import get_request_organization
 
 class IsCaregiver(BasePermission):
     """Allows access to caregivers within their organization."""
@@ -7,7 +8,9 @@ class IsCaregiver(BasePermission):
         return request.user and request.user.role == UserRoles.CAREGIVER
 
     def has_object_permission(self, request, view, obj):
-        return obj.organization == request.user.caregiver.organization
+        # Compare keys so the object's organization is not loaded
+        organization = get_request_organization(request)
+        return organization is not None and obj.organization_id == organization.pkid
 
 class IsOrganizationOrCaregiver(BasePermission):
     """
@@ -1,4 +1,5 @@
 from django.shortcuts import render
+from django.db import transaction
 from rest_framework.response import Response
 from rest_framework import status
 from .serializers import CaregiverSerializer,CaregiverBasicInfoSerializer
@@ -6,18 +7,21 @@ from rest_framework.generics import ListAPIView,CreateAPIView,UpdateAPIView,Retr
 from rest_framework.permissions import IsAuthenticated
 from .permissions import IsOrganizationOrCaregiver
 from apps.accounts.user_roles import UserRoles
+from apps.accounts.tenancy import require_request_organization
 from .models import Caregiver
 from apps.organizations.permissions import IsOrganization
 from rest_framework.mixins import RetrieveModelMixin,UpdateModelMixin,DestroyModelMixin,ListModelMixin
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter
-from shared.pagination import StandardResultsSetPagination
+from shared.pagination import KeysetPagination
+from shared.search import FullTextSearchFilter
+from shared.mixins import SerializerRelationsMixin
 from .exceptions import CaregiverNotFoundException
 
 
 # Create your views here.
-class LatestCaregiversView(ListAPIView):
+class LatestCaregiversView(SerializerRelationsMixin,ListAPIView):
     """
     Lists the 5 most recently hired caregivers in the authenticated user's organization
     (whether the user is an organization or a caregiver).
@@ -27,43 +31,22 @@ class LatestCaregiversView(ListAPIView):
     serializer_class = CaregiverSerializer
 
     def get_queryset(self):
-        user = self.request.user
-
-        if user.role == UserRoles.ORGANIZATION:
-            organization = user.organization
-        # elif user.role == UserRoles.CAREGIVER:
-        #     organization = user.caregiver.organization
-        else:
-            raise NotFound("Organization not found for user.")
-
-        if organization is None:
-            raise NotFound("Organization not found for user.")
+        organization = require_request_organization(self.request)
 
         return Caregiver.objects.filter(organization=organization,user__is_verified=True,user__is_active=True,user__role=UserRoles.CAREGIVER)[:5]
 
-class CaregiverViewSet(ListModelMixin,RetrieveModelMixin,UpdateModelMixin,DestroyModelMixin,viewsets.GenericViewSet):
+class CaregiverViewSet(SerializerRelationsMixin,ListModelMixin,RetrieveModelMixin,UpdateModelMixin,DestroyModelMixin,viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated, IsOrganization]
     serializer_class = CaregiverSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     search_fields = ['first_name', 'last_name', 'staff_number']
     filterset_fields = ['caregiver_type', 'user__is_active']
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetPagination
     lookup_field = 'slug'
     
 
     def get_queryset(self):
-        user = self.request.user
-
-        if user.role == UserRoles.ORGANIZATION:
-            organization = user.organization
-        # elif user.role == UserRoles.CAREGIVER:
-        #     organization = user.caregiver.organization
-
-        else:
-            raise NotFound("Organization not found for user.")
-
-        if organization is None:
-            raise NotFound("Organization not found for user.")
+        organization = require_request_organization(self.request)
 
         return Caregiver.objects.filter(organization=organization,user__is_verified=True,user__is_active=True,user__role=UserRoles.CAREGIVER)
 
@@ -80,7 +63,7 @@ class ToggleCaregiverStatusView(UpdateAPIView):
 
     def get_object(self):
         caregiver_slug = self.kwargs['slug']
-        caregiver = Caregiver.objects.filter(slug=caregiver_slug, organization=self.request.user.organization).first()
+        caregiver = Caregiver.objects.filter(slug=caregiver_slug, organization=require_request_organization(self.request)).first()
         if not caregiver:
             raise CaregiverNotFoundException()
         return caregiver
@@ -88,7 +71,9 @@ class ToggleCaregiverStatusView(UpdateAPIView):
     def update(self, request, *args, **kwargs):
         caregiver = self.get_object()
         caregiver.user.is_active = not caregiver.user.is_active
-        caregiver.user.save() 
+        # The organization statistics are updated by a signal and must commit together with the toggle
+        with transaction.atomic():
+            caregiver.user.save()
         serializer = CaregiverSerializer(caregiver,many=False)
         return Response({ "message": "Caregiver status toggled successfully", "data": serializer.data},status=status.HTTP_200_OK)
     
@@ -103,5 +88,5 @@ class OrganizationAllCaregiversBasicInfoView(ListAPIView):
     permission_classes = [IsAuthenticated,IsOrganization]
 
     def get_queryset(self):
-        organization = self.request.user.organization
+        organization = require_request_organization(self.request)
         return Caregiver.objects.filter(organization=organization)
@@ -0,0 +1,136 @@
+import uuid
+from collections import Counter
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from .exceptions import CaregiverInvitationException
+from .models import CaregiverInvite, InvitationStatus, default_expires_at
+from .serializers import BulkInvitationEntrySerializer
+from .tasks import queue_invitations_to_caregivers
+
+User = get_user_model()
+
+# Outcome of each address in the bulk invitation report
+INVITED = 'invited'
+RESENT = 'resent'
+INVALID = 'invalid'
+DUPLICATE = 'duplicate'
+USER_EXISTS = 'user_exists'
+ALREADY_ACCEPTED = 'already_accepted'
+ACTIVE_INVITATION_EXISTS = 'active_invitation_exists'
+MAX_RESENDS_EXCEEDED = 'max_resends_exceeded'
+
+OUTCOME_DETAILS = {
+    INVITED: "Invitation sent.",
+    RESENT: "Expired invitation renewed and sent again.",
+    DUPLICATE: "This email appears more than once in the request.",
+    USER_EXISTS: "A user with this email already exists.",
+    ALREADY_ACCEPTED: "Invitation has already been accepted.",
+    ACTIVE_INVITATION_EXISTS: "An active invitation already exists for this email.",
+    MAX_RESENDS_EXCEEDED: "Maximum resend limit reached for this invitation.",
+}
+
+
+def validate_entries(entries):
+    """
+    Validates each (email, role) entry on its own and returns (valid entries by email, results of rejected entries).
+    Emails are lowercased, later copies of an email already in the request are rejected as duplicates.
+    """
+    valid, rejected = {}, {}
+    for index, entry in enumerate(entries):
+        serializer = BulkInvitationEntrySerializer(data=entry)
+        if not serializer.is_valid():
+            rejected[index] = {'email': entry.get('email') if isinstance(entry, dict) else None, 'status': INVALID, 'errors': serializer.errors}
+            continue
+        email = serializer.validated_data['email'].lower()
+        if email in valid:
+            rejected[index] = {'email': email, 'status': DUPLICATE, 'detail': OUTCOME_DETAILS[DUPLICATE]}
+            continue
+        valid[email] = (index, serializer.validated_data['role'])
+    return valid, rejected
+
+
+def bulk_invite_caregivers(organization, invited_by, entries):
+    """
+    Invites many caregivers to the organization at once and returns one result per entry, in request order.
+
+    Existing users and existing invitations are looked up for every address with one query each. New invitations
+    are inserted with a single bulk_create, expired ones are renewed with a single bulk_update within the
+    MAX_INVITATION_RESENDS limit, and all their emails are queued in the outbox together.
+    """
+    valid, results = validate_entries(entries)
+    emails = list(valid)
+    max_resends = getattr(settings, "MAX_INVITATION_RESENDS", 3)
+    now = timezone.now()
+
+    try:
+        with transaction.atomic():
+            existing_users = set(
+                User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=emails).values_list('email_lower', flat=True)
+            )
+            existing_invites = {
+                invite.email_lower: invite
+                for invite in CaregiverInvite.objects.select_for_update()
+                .annotate(email_lower=Lower('email'))
+                .filter(organization=organization, email_lower__in=emails)
+            }
+            for invite in existing_invites.values():
+                invite.organization = organization
+
+            created, renewed = [], []
+            for email, (index, role) in valid.items():
+                invite = existing_invites.get(email)
+                if email in existing_users:
+                    outcome = USER_EXISTS
+                elif invite is None:
+                    invite = CaregiverInvite(email=email, organization=organization, role=role, invited_by=invited_by)
+                    created.append(invite)
+                    outcome = INVITED
+                elif invite.status == InvitationStatus.ACCEPTED:
+                    outcome = ALREADY_ACCEPTED
+                elif not invite.is_expired():
+                    outcome = ACTIVE_INVITATION_EXISTS
+                elif invite.resend_count >= max_resends:
+                    outcome = MAX_RESENDS_EXCEEDED
+                else:
+                    invite.token = uuid.uuid4()
+                    invite.expires_at = default_expires_at()
+                    invite.resend_count += 1
+                    invite.status = InvitationStatus.PENDING
+                    invite.role = role
+                    invite.invited_by = invited_by
+                    invite.updated_at = now
+                    renewed.append(invite)
+                    outcome = RESENT
+
+                result = {'email': email, 'role': role, 'status': outcome, 'detail': OUTCOME_DETAILS[outcome]}
+                if outcome in (INVITED, RESENT):
+                    result['invitation'] = invite
+                results[index] = result
+
+            CaregiverInvite.objects.bulk_create(created, batch_size=500)
+            CaregiverInvite.objects.bulk_update(
+                renewed, ['token', 'expires_at', 'resend_count', 'status', 'role', 'invited_by', 'updated_at'], batch_size=500
+            )
+            queue_invitations_to_caregivers(created + renewed)
+    except IntegrityError:
+        # Another request invited one of these addresses at the same time
+        raise CaregiverInvitationException(
+            detail="Some of these emails were invited concurrently, please try again.",
+            code="concurrent_invitation"
+        )
+
+    report = []
+    for index in sorted(results):
+        result = results[index]
+        invitation = result.pop('invitation', None)
+        if invitation is not None:
+            result['invitation_id'] = str(invitation.id)
+        report.append(result)
+    return report
+
+
+def summarize(report):
+    return dict(Counter(result['status'] for result in report))
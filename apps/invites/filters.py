@@ -0,0 +1,25 @@
+from django.db.models import Q
+from django.utils import timezone
+from django_filters import rest_framework as filters
+from .models import CaregiverInvite, InvitationStatus
+
+
+class InvitationFilterSet(filters.FilterSet):
+    """
+    Narrows the invitation listing by status and/or role.
+    Pending invitations past their expiry date count as expired, even before the sweeper marks them.
+    """
+    status = filters.ChoiceFilter(choices=InvitationStatus.choices, method='filter_status')
+    role = filters.CharFilter(field_name='role')
+
+    class Meta:
+        model = CaregiverInvite
+        fields = ['status', 'role']
+
+    def filter_status(self, queryset, name, value):
+        now = timezone.now()
+        if value == InvitationStatus.PENDING:
+            return queryset.filter(status=InvitationStatus.PENDING, expires_at__gt=now)
+        if value == InvitationStatus.EXPIRED:
+            return queryset.filter(Q(status=InvitationStatus.EXPIRED) | Q(status=InvitationStatus.PENDING, expires_at__lte=now))
+        return queryset.filter(status=value)
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-17 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invites', '0002_remove_caregiverinvite_deleted_at_and_more'),
+        ('organizations', '0005_daily_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='caregiverinvite',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['expires_at'], name='invite_pending_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='caregiverinvite',
+            index=models.Index(fields=['organization', 'status', '-created_at', '-pkid'], name='invite_org_status_created_idx'),
+        ),
+    ]
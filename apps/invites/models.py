@@ -62,6 +62,14 @@ class CaregiverInvite(TimeStampedUUID):
         ]
         indexes = [
             models.Index(fields=["token"]),  # Optimize token lookups
+            # Overdue pending invitations, kept small because only pending rows are indexed
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(status=InvitationStatus.PENDING),
+                name="invite_pending_expiry_idx"
+            ),
+            # Invitation listing filtered by status, paginated by keyset over (created_at, pkid)
+            models.Index(fields=["organization", "status", "-created_at", "-pkid"], name="invite_org_status_created_idx"),
         ]
 
     def __str__(self):
@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from django.utils import timezone
 from django.db import transaction
+from django.conf import settings
 from apps.accounts.models import User
 from apps.caregivers.models import Caregiver
 from apps.accounts.user_roles import UserRoles
+from apps.accounts.tenancy import require_request_organization
+from shared.text_choices import CaregiverTypes
 from .models import CaregiverInvite, InvitationStatus
 from .exceptions import (
     CaregiverInvitationException,
@@ -25,7 +28,7 @@ class CaregiverInvitationSerializer(serializers.ModelSerializer):
         """Validate the email and check for existing users or invitations."""
         email = value.lower()  # Normalize to lowercase
         request = self.context["request"]
-        organization = request.user.organization
+        organization = require_request_organization(request)
 
         # Check if a user with this email already exists
         if User.objects.filter(email__iexact=email).exists():
@@ -46,14 +49,46 @@ class CaregiverInvitationSerializer(serializers.ModelSerializer):
             if invitation.status == InvitationStatus.PENDING and not invitation.is_expired():
                 raise ActiveInvitationExistsException()
 
+        # Reused by the view, which resends an expired invitation instead of creating one
+        self.context["existing_invite"] = invitation
         return email
 
     def create(self, validated_data):
         """Create a new invitation with the requesting user as invited_by."""
-        validated_data["organization"] = self.context["request"].user.organization
+        validated_data["organization"] = require_request_organization(self.context["request"])
         validated_data["invited_by"] = self.context["request"].user
         return super().create(validated_data)
 
+class CaregiverInviteListSerializer(serializers.ModelSerializer):
+    """Serializer for the organization's invitation listing."""
+    status = serializers.SerializerMethodField()
+    invited_by = serializers.EmailField(source="invited_by.email", default=None, read_only=True)
+
+    class Meta:
+        model = CaregiverInvite
+        fields = ["id", "email", "role", "status", "expires_at", "resend_count", "invited_by", "created_at"]
+
+    def get_status(self, obj):
+        # Pending invitations past their expiry date are reported as expired before the sweeper marks them
+        if obj.status == InvitationStatus.PENDING and obj.is_expired():
+            return InvitationStatus.EXPIRED
+        return obj.status
+
+
+class BulkInvitationEntrySerializer(serializers.Serializer):
+    """Validates one (email, role) entry of a bulk invitation."""
+    email = serializers.EmailField()
+    role = serializers.ChoiceField(choices=CaregiverTypes.choices)
+
+
+class CaregiverBulkInvitationSerializer(serializers.Serializer):
+    """Accepts the entries of a bulk invitation, each entry is validated on its own by the bulk invite."""
+    invitations = serializers.ListField(
+        allow_empty=False,
+        max_length=getattr(settings, "MAX_BULK_INVITATIONS", 500),
+    )
+
+
 class CaregiverAcceptInvitationSerializer(serializers.Serializer):
     """Serializer to validate and process caregiver invitation acceptance."""
     first_name = serializers.CharField(max_length=100)
@@ -76,9 +111,10 @@ class CaregiverAcceptInvitationSerializer(serializers.Serializer):
         if not token:
             raise InvalidInvitationTokenException()
 
-        invitation = CaregiverInvite.objects.filter(
+        # The accepting view passes the invitation it has locked
+        invitation = self.context.get("invitation") or CaregiverInvite.objects.filter(
             token=token
-        ).first()  # Removed deleted_at__isnull=True
+        ).select_related("organization").first()  # Removed deleted_at__isnull=True
 
         if not invitation:
             raise InvitationNotFoundException()
@@ -2,54 +2,67 @@ from celery import shared_task
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.conf import settings
-from celery.exceptions import MaxRetriesExceededError
+from django.utils import timezone
 import logging
-from apps.invites.exceptions import EmailSendingFailedException
+from apps.notifications.outbox import queue_email, queue_emails
+from .models import CaregiverInvite, InvitationStatus
 
 logger = logging.getLogger(__name__)
 
-@shared_task(bind=True, max_retries=3)
-def send_invitation_to_caregiver(self, email, invitation_token, role, organization_name):
-    """
-    Sends an email invitation to a caregiver with a tokenized invite URL pointing to the frontend.
-    """
-    try:
-        invite_url = f"{settings.REACT_FRONTEND_URL}/auth/caregiver-accept-invitation/{invitation_token}"
-
-        context = {
-            'organization_name': organization_name,
-            'invite_url': invite_url,
-            'caregiver_role': role,
-            'expiry_days': getattr(settings, "INVITATION_EXPIRY_DAYS", 7),
-        }
-
-        subject = f"You're invited to join {organization_name}"
-        html_message = render_to_string(
-            'invites/mails/caregiver_invitation_email.html',
-            context
-        )
-
-        from_email = settings.EMAIL_HOST_USER
-        recipient_list = [email]
-
-        # Create and send the email
-        email = EmailMessage(
-            subject=subject,
-            body=html_message,
-            from_email=from_email,
-            to=recipient_list,
-        )
-        email.content_subtype = "html"
-        email.send(fail_silently=False)
-
-        logger.info(f"Invitation email sent to {email} for role {role} in {organization_name} {invite_url}")
-
-    except Exception as e:
-        logger.error(f"Failed to send invitation email to {email}: {str(e)}")
-        try:
-            self.retry(countdown=60)  # Retry after 60 seconds
-        except MaxRetriesExceededError:
-            logger.error(f"Max retries exceeded for invitation email to {email}")
-            raise EmailSendingFailedException(
-                detail=f"Failed to send invitation email to {email} after {self.max_retries} attempts."
-            )
\ No newline at end of file
+
+def build_invitation_email(invitation):
+    """
+    Builds the email invitation of a caregiver, with a tokenized invite URL pointing to the frontend.
+    """
+    organization_name = invitation.organization.name
+    invite_url = f"{settings.REACT_FRONTEND_URL}/auth/caregiver-accept-invitation/{invitation.token}"
+
+    context = {
+        'organization_name': organization_name,
+        'invite_url': invite_url,
+        'caregiver_role': invitation.role,
+        'expiry_days': getattr(settings, "INVITATION_EXPIRY_DAYS", 7),
+    }
+
+    subject = f"You're invited to join {organization_name}"
+    html_message = render_to_string(
+        'invites/mails/caregiver_invitation_email.html',
+        context
+    )
+
+    email = EmailMessage(
+        subject=subject,
+        body=html_message,
+        from_email=settings.EMAIL_HOST_USER,
+        to=[invitation.email],
+    )
+    email.content_subtype = "html"
+    return email
+
+
+def queue_invitation_to_caregiver(invitation):
+    """
+    Queues the invitation email in the outbox. A resent invitation has a new token and therefore a new email.
+    """
+    queue_email(f"caregiver-invitation:{invitation.token}", build_invitation_email(invitation))
+
+
+def queue_invitations_to_caregivers(invitations):
+    """
+    Queues the emails of many invitations with a single outbox insert, delivered together by one drain.
+    """
+    queue_emails([(f"caregiver-invitation:{invitation.token}", build_invitation_email(invitation)) for invitation in invitations])
+
+
+@shared_task
+def expire_overdue_invitations():
+    """
+    Marks every pending invitation past its expiry date as expired with a single UPDATE.
+    """
+    now = timezone.now()
+    expired = CaregiverInvite.objects.filter(status=InvitationStatus.PENDING, expires_at__lte=now).update(
+        status=InvitationStatus.EXPIRED, updated_at=now
+    )
+    if expired:
+        logger.info(f"Expired {expired} overdue caregiver invitations")
+    return expired
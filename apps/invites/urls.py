@@ -1,8 +1,10 @@
 from django.urls import path,include
-from .views import InviteCaregiverView,CaregiverAcceptInvitationView
+from .views import InviteCaregiverView,BulkInviteCaregiverView,CaregiverInviteListView,CaregiverAcceptInvitationView
 
 urlpatterns = [
     path('invite-caregiver/', InviteCaregiverView.as_view(), name='invite-caregiver'),
+    path('bulk-invite-caregivers/', BulkInviteCaregiverView.as_view(), name='bulk-invite-caregivers'),
+    path('invitations/', CaregiverInviteListView.as_view(), name='caregiver-invitations'),
     path('caregivers/invite/accept/<uuid:token>/',CaregiverAcceptInvitationView.as_view(),name="caregiver_accept_invitation",),   
 ]
 
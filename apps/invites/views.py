@@ -5,27 +5,36 @@ from django.db import transaction
 from django.conf import settings
 from rest_framework import status
 from rest_framework.views import APIView
-from rest_framework.generics import CreateAPIView
+from rest_framework.generics import CreateAPIView, ListAPIView
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.throttling import UserRateThrottle
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from apps.organizations.permissions import IsOrganization
+from apps.accounts.tenancy import require_request_organization
 from .models import CaregiverInvite, InvitationStatus
-from .serializers import CaregiverInvitationSerializer, CaregiverAcceptInvitationSerializer
-from .tasks import send_invitation_to_caregiver
+from .serializers import (
+    CaregiverInvitationSerializer,
+    CaregiverAcceptInvitationSerializer,
+    CaregiverBulkInvitationSerializer,
+    CaregiverInviteListSerializer,
+)
+from .filters import InvitationFilterSet
+from .bulk import bulk_invite_caregivers, summarize
+from .tasks import queue_invitation_to_caregiver
 from .exceptions import (
     CaregiverInvitationException,
     ActiveInvitationExistsException,
     InvitationAlreadyAcceptedException,
     MaxResendsExceededException,
-    EmailSendingFailedException,
     InvalidInvitationTokenException,
     InvitationNotFoundException,
     InvitationExpiredException,
 )
 from shared.validators import validate_uuid
+from shared.pagination import KeysetPagination
 
 logger = logging.getLogger(__name__)
 
@@ -60,10 +69,7 @@ class InviteCaregiverView(APIView):
 
         try:
             with transaction.atomic():
-                existing_invite = CaregiverInvite.objects.filter(
-                    email__iexact=email,
-                    organization=request.user.organization
-                ).first()  # Removed deleted_at__isnull=True
+                existing_invite = serializer.context.get("existing_invite")
 
                 if existing_invite:
                     if existing_invite.status == InvitationStatus.ACCEPTED:
@@ -82,23 +88,9 @@ class InviteCaregiverView(APIView):
                 else:
                     invitation = serializer.save(invited_by=request.user)
 
-            try:
-                send_invitation_to_caregiver.delay(
-                    email=invitation.email,
-                    invitation_token=str(invitation.token),
-                    role=invitation.role,
-                    organization_name=invitation.organization.name,
-                )
+                queue_invitation_to_caregiver(invitation)
                 logger.info(
-                    f"Invitation sent to {invitation.email} for role {invitation.role} by user {request.user.id}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to queue invitation email for {invitation.email}: {str(e)}")
-                raise EmailSendingFailedException(
-                    detail={
-                        "message": "Invitation created, but email sending failed.",
-                        "invitation_id": str(invitation.id),
-                    }
+                    f"Invitation queued for {invitation.email} for role {invitation.role} by user {request.user.id}"
                 )
 
             return Response(
@@ -120,6 +112,56 @@ class InviteCaregiverView(APIView):
                 ) from e
             raise
 
+class BulkInviteCaregiverView(APIView):
+    """
+    Invites up to MAX_BULK_INVITATIONS caregivers in one request.
+    - Every address gets its own result: invited, resent, or the reason it was skipped.
+    - Expired invitations are renewed within the MAX_INVITATION_RESENDS limit.
+    - All invitation emails are queued together.
+    """
+    permission_classes = [IsAuthenticated, IsOrganization]
+    throttle_classes = [UserRateThrottle]
+
+    @swagger_auto_schema(
+        request_body=CaregiverBulkInvitationSerializer,
+        responses={
+            200: openapi.Response("Per address invitation report"),
+            400: openapi.Response("Validation error"),
+        },
+    )
+    def post(self, request):
+        serializer = CaregiverBulkInvitationSerializer(data=request.data)
+        if not serializer.is_valid():
+            raise CaregiverInvitationException(detail=serializer.errors)
+
+        report = bulk_invite_caregivers(
+            require_request_organization(request), request.user, serializer.validated_data["invitations"]
+        )
+        logger.info(f"Bulk invitation of {len(report)} caregivers by user {request.user.id}")
+        return Response(
+            {
+                "message": "Bulk invitation processed.",
+                "data": {"summary": summarize(report), "results": report},
+            },
+            status=status.HTTP_200_OK
+        )
+
+class CaregiverInviteListView(ListAPIView):
+    """
+    Lists the organization's caregiver invitations, newest first, paginated by keyset over (created_at, pkid).
+    Filter with `?status=PENDING|ACCEPTED|EXPIRED` and `?role=`.
+    """
+    permission_classes = [IsAuthenticated, IsOrganization]
+    serializer_class = CaregiverInviteListSerializer
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = InvitationFilterSet
+
+    def get_queryset(self):
+        return CaregiverInvite.objects.filter(
+            organization=require_request_organization(self.request)
+        ).select_related("invited_by")
+
 class CaregiverAcceptInvitationView(CreateAPIView):
     """
     Handles caregiver invitation acceptance by creating a user account.
@@ -155,7 +197,7 @@ class CaregiverAcceptInvitationView(CreateAPIView):
                 try:
                     invitation = CaregiverInvite.objects.filter(
                         token=token
-                    ).select_for_update().get()  # Removed deleted_at__isnull=True
+                    ).select_related("organization").select_for_update(of=("self",)).get()  # Removed deleted_at__isnull=True
                 except CaregiverInvite.DoesNotExist:
                     raise InvitationNotFoundException()
 
@@ -166,14 +208,12 @@ class CaregiverAcceptInvitationView(CreateAPIView):
                 if invitation.status != InvitationStatus.PENDING:
                     raise InvitationAlreadyAcceptedException()
 
-                serializer = self.get_serializer(data=request.data, context={"token": token})
+                serializer = self.get_serializer(data=request.data, context={"token": token, "invitation": invitation})
                 if not serializer.is_valid():
                     raise CaregiverInvitationException(detail=serializer.errors)
+                # Creates the caregiver and marks the invitation accepted
                 user = serializer.save()
 
-                invitation.status = InvitationStatus.ACCEPTED
-                invitation.save()
-
                 logger.info(
                     f"Invitation accepted for {invitation.email} by user {user.id} in organization {invitation.organization.name}"
                 )
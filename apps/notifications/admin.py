@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'status', 'attempts', 'available_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('idempotency_key', 'subject', 'to')
+    readonly_fields = ('idempotency_key', 'attempts', 'sent_at', 'last_error', 'created_at', 'updated_at')
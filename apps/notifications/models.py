@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from shared.models import TimeStampedUUID
+
+
+class OutboxStatus(models.TextChoices):
+    PENDING = "PENDING", _("Pending")
+    SENDING = "SENDING", _("Sending")
+    SENT = "SENT", _("Sent")
+    FAILED = "FAILED", _("Failed")
+
+
+class OutboxEmail(TimeStampedUUID):
+    """
+    An email written in the same transaction as the change it reports, delivered later by the outbox worker.
+    """
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text=_("Identifies the email, queuing it again with the same key does nothing.")
+    )
+    subject = models.CharField(max_length=998)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=20, default="html")
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=OutboxStatus.choices, default=OutboxStatus.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = _("Outbox Email")
+        verbose_name_plural = _("Outbox Emails")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["available_at"],
+                condition=models.Q(status=OutboxStatus.PENDING),
+                name="outbox_email_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.to)}"
@@ -0,0 +1,167 @@
+import hashlib
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.utils import DNS_NAME
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboxEmail, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_row(idempotency_key, message):
+    return OutboxEmail(
+        idempotency_key=idempotency_key,
+        subject=message.subject,
+        body=message.body,
+        content_subtype=message.content_subtype,
+        from_email=message.from_email or settings.EMAIL_HOST_USER,
+        to=list(message.to),
+    )
+
+
+def queue_email(idempotency_key, message):
+    """
+    Writes an EmailMessage to the outbox as part of the current transaction.
+
+    The email is only delivered if the transaction commits, and queuing the same key twice,
+    e.g. when a request or task is retried, keeps the first email. Returns the outbox row.
+    """
+    row = outbox_row(idempotency_key, message)
+    email, created = OutboxEmail.objects.get_or_create(
+        idempotency_key=idempotency_key,
+        defaults={field: getattr(row, field) for field in ('subject', 'body', 'content_subtype', 'from_email', 'to')},
+    )
+    if created:
+        transaction.on_commit(wake_outbox_worker)
+    return email
+
+
+def queue_emails(messages):
+    """
+    Writes many (idempotency key, EmailMessage) pairs to the outbox with a single insert.
+    """
+    rows = [outbox_row(idempotency_key, message) for idempotency_key, message in messages]
+    if rows:
+        OutboxEmail.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+        transaction.on_commit(wake_outbox_worker)
+
+
+def wake_outbox_worker():
+    """
+    Starts a drain right away instead of waiting for the scheduled one.
+    """
+    from .tasks import drain_email_outbox
+
+    try:
+        drain_email_outbox.delay()
+    except Exception as e:
+        # The emails are safe in the outbox, the scheduled drain picks them up
+        logger.warning(f"Could not queue an email outbox drain: {str(e)}")
+
+
+def to_message(email):
+    # A stable Message-ID lets mail servers drop a copy delivered twice
+    digest = hashlib.sha256(email.idempotency_key.encode()).hexdigest()[:32]
+    message = EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        headers={'Message-ID': f"<{digest}@{DNS_NAME}>"},
+    )
+    message.content_subtype = email.content_subtype
+    return message
+
+
+def fail_interrupted_deliveries():
+    """
+    Marks emails left in SENDING by a worker that died as failed.
+
+    Whether they reached the SMTP server is unknown, so they are not retried to avoid sending them twice.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT)
+    interrupted = OutboxEmail.objects.filter(status=OutboxStatus.SENDING, updated_at__lt=cutoff).update(
+        status=OutboxStatus.FAILED,
+        last_error="Delivery was interrupted and is not retried to avoid sending the email twice.",
+        updated_at=timezone.now(),
+    )
+    if interrupted:
+        logger.error(f"{interrupted} outbox emails were interrupted during delivery")
+
+
+def claim_batch(batch_size):
+    """
+    Moves up to batch_size due emails to SENDING. Rows locked by another worker are skipped.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxStatus.PENDING, available_at__lte=timezone.now())
+            .order_by('available_at')[:batch_size]
+        )
+        OutboxEmail.objects.filter(pkid__in=[email.pkid for email in emails]).update(
+            status=OutboxStatus.SENDING, updated_at=timezone.now()
+        )
+    return emails
+
+
+def deliver(emails):
+    """
+    Sends the emails over one SMTP connection and returns (sent, {email: error}).
+    """
+    sent, failed = [], {}
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for email in emails:
+                try:
+                    connection.send_messages([to_message(email)])
+                except Exception as e:
+                    failed[email] = e
+                else:
+                    sent.append(email)
+    except Exception as e:
+        # Opening or closing the connection failed, whatever was not sent is retried
+        for email in emails:
+            if email not in sent:
+                failed.setdefault(email, e)
+    return sent, failed
+
+
+def record_delivery(sent, failed):
+    now = timezone.now()
+    with transaction.atomic():
+        OutboxEmail.objects.filter(pkid__in=[email.pkid for email in sent]).update(
+            status=OutboxStatus.SENT, sent_at=now, last_error='', updated_at=now
+        )
+        for email, error in failed.items():
+            email.attempts += 1
+            email.last_error = str(error)
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = OutboxStatus.FAILED
+                logger.error(f"Giving up on outbox email {email.idempotency_key}: {str(error)}")
+            else:
+                email.status = OutboxStatus.PENDING
+                email.available_at = now + timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1))
+            email.save(update_fields=['attempts', 'last_error', 'status', 'available_at', 'updated_at'])
+
+
+def drain_outbox(batch_size=None):
+    """
+    Delivers due outbox emails batch by batch, each batch over a single SMTP connection.
+    Returns the number of emails sent.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    fail_interrupted_deliveries()
+    total_sent = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return total_sent
+        sent, failed = deliver(emails)
+        record_delivery(sent, failed)
+        total_sent += len(sent)
+        if failed:
+            logger.warning(f"Sent {len(sent)} outbox emails, {len(failed)} failed and will be retried")
@@ -0,0 +1,10 @@
+from celery import shared_task
+from .outbox import drain_outbox
+
+
+@shared_task
+def drain_email_outbox():
+    """
+    Delivers the pending emails in the outbox.
+    """
+    return drain_outbox()
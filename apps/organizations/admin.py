@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Organization
+from .models import (
+    CaregiverDailyRollup, Organization, OrganizationDailyRollup, OrganizationSequence, OrganizationStatistics, RollupWatermark,
+)
 
 @admin.register(Organization)
 class OrganizationAdmin(admin.ModelAdmin):
@@ -9,3 +11,36 @@ class OrganizationAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
 
 
+
+
+@admin.register(OrganizationSequence)
+class OrganizationSequenceAdmin(admin.ModelAdmin):
+    list_display = ('key', 'last_value')
+    search_fields = ('key',)
+    readonly_fields = ('key', 'last_value')
+
+
+@admin.register(OrganizationStatistics)
+class OrganizationStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('organization', 'caregivers_total', 'patients_total', 'updated_at', 'reconciled_at')
+    search_fields = ('organization__name', 'organization__acronym')
+    readonly_fields = [field.name for field in OrganizationStatistics._meta.fields]
+
+
+@admin.register(OrganizationDailyRollup)
+class OrganizationDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('organization', 'day', 'new_patients', 'new_caregivers', 'new_diagnoses', 'computed_at')
+    list_filter = ('day',)
+    search_fields = ('organization__name', 'organization__acronym')
+
+
+@admin.register(CaregiverDailyRollup)
+class CaregiverDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('caregiver', 'organization', 'day', 'diagnoses', 'computed_at')
+    list_filter = ('day',)
+    search_fields = ('caregiver__staff_number', 'organization__name')
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ('name', 'processed_through', 'updated_at')
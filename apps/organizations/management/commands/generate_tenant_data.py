@@ -0,0 +1,295 @@
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from autoslug import AutoSlugField
+from apps.accounts.models import User
+from apps.accounts.user_roles import UserRoles
+from apps.caregivers.models import Caregiver
+from apps.organizations.models import Organization
+from apps.organizations.rollups import catch_up_rollups
+from apps.organizations.statistics import reconcile_statistics
+from apps.patients.models import Patient, PatientDiagnosisDetails, PatientMedicalRecord, VitalSign
+from shared.text_choices import CaregiverTypes, Gender, MaritalStatus
+
+INSERT_BATCH_SIZE = 1000
+
+FIRST_NAMES = [
+    'Ada', 'Chidi', 'Ngozi', 'Tunde', 'Amaka', 'Emeka', 'Funke', 'Bola', 'Ifeoma', 'Segun', 'Kemi', 'Yusuf',
+    'Zainab', 'Ibrahim', 'Halima', 'Musa', 'Chiamaka', 'Obinna', 'Folake', 'Kunle', 'Aisha', 'Uche', 'Bisi', 'Efe',
+]
+LAST_NAMES = [
+    'Okafor', 'Adeyemi', 'Balogun', 'Eze', 'Nwosu', 'Bello', 'Okonkwo', 'Adebayo', 'Obi', 'Lawal', 'Abubakar',
+    'Ogunleye', 'Danjuma', 'Ibekwe', 'Olawale', 'Suleiman', 'Chukwu', 'Akinola', 'Ekwueme', 'Yakubu',
+]
+CITIES = ['Lagos', 'Abuja', 'Ibadan', 'Kano', 'Enugu', 'Port Harcourt', 'Benin', 'Jos', 'Kaduna', 'Owerri']
+FACILITIES = ['General Hospital', 'Medical Centre', 'Specialist Hospital', 'Family Clinic', 'Teaching Hospital']
+STREETS = ['Allen Avenue', 'Broad Street', 'Awolowo Road', 'Herbert Macaulay Way', 'Ahmadu Bello Way', 'Aba Road']
+
+# Nurses and doctors make up most of the staff, every other type is rare
+CAREGIVER_TYPE_WEIGHTS = {
+    CaregiverTypes.NURSE: 40, CaregiverTypes.DOCTOR: 18, CaregiverTypes.ADMINISTRATIVE_STAFF: 10,
+    CaregiverTypes.PHARMACIST: 6, CaregiverTypes.MEDICAL_LAB_TECHNICIAN: 5, CaregiverTypes.MIDWIFE: 4,
+}
+
+# (diagnosis, medication, body temperature mean, systolic shift), ordered from most to least common
+DIAGNOSES = [
+    ('Malaria', 'Artemether/lumefantrine', 38.6, 0), ('Upper respiratory infection', 'Amoxicillin', 37.8, 0),
+    ('Hypertension', 'Amlodipine', 36.8, 30), ('Typhoid fever', 'Ciprofloxacin', 38.9, 0),
+    ('Type 2 diabetes', 'Metformin', 36.8, 10), ('Peptic ulcer', 'Omeprazole', 36.9, 0),
+    ('Gastroenteritis', 'Oral rehydration salts', 37.6, -5), ('Asthma', 'Salbutamol inhaler', 37.0, 0),
+    ('Migraine', 'Ibuprofen', 36.8, 5), ('Urinary tract infection', 'Nitrofurantoin', 37.9, 0),
+]
+DIAGNOSIS_WEIGHTS = [30, 18, 14, 10, 8, 6, 5, 4, 3, 2]
+BLOOD_GROUPS = (['O+', 'A+', 'B+', 'AB+', 'O-', 'A-', 'B-', 'AB-'], [46, 22, 21, 4, 4, 1, 1, 1])
+GENOTYPES = (['AA', 'AS', 'SS', 'AC'], [72, 24, 2, 2])
+
+
+@contextmanager
+def assigned_values(*models):
+    """
+    Makes the slug and timestamp fields of the models save the value assigned on the instance.
+    This skips the AutoSlugField uniqueness query run for every row and lets auto_now fields take a historical date.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if isinstance(field, AutoSlugField) or getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.pre_save = lambda instance, add, field=field: getattr(instance, field.attname)
+    try:
+        yield
+    finally:
+        for field in fields:
+            del field.pre_save
+
+
+def counted(rng, mean, limit):
+    """
+    Draws a long tailed count averaging `mean`: most rows get a few children, some none and a few very many.
+    """
+    if mean <= 0:
+        return 0
+    return min(int(rng.expovariate(1 / mean) + 0.5), limit)
+
+
+def clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates organizations filled with caregivers, patients, diagnoses and vital signs for benchmarks and "
+        "query plan checks. Rows are written with bulk_create, skipping the per-row save() work."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organizations', type=int, default=5, help="Number of organizations to create.")
+        parser.add_argument('--caregivers', type=int, default=50, help="Caregivers per organization.")
+        parser.add_argument('--patients', type=int, default=10000, help="Patients per organization.")
+        parser.add_argument('--diagnoses', type=float, default=3, help="Average number of diagnoses per patient.")
+        parser.add_argument('--vitals', type=float, default=10, help="Average number of monitor readings per patient.")
+        parser.add_argument('--days', type=int, default=365, help="Length of the generated history in days.")
+        parser.add_argument('--batch-size', type=int, default=2000, help="Number of patients written per transaction.")
+        parser.add_argument('--password', help="Password of every generated account, unusable when omitted.")
+        parser.add_argument('--seed', type=int, help="Seed for a reproducible data set, the identifiers still differ per run.")
+
+    def handle(self, *args, **options):
+        if options['organizations'] < 1 or options['batch_size'] < 1 or options['days'] < 1:
+            raise CommandError("--organizations, --batch-size and --days must be at least 1.")
+
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.now = timezone.now()
+        self.start = self.now - timedelta(days=options['days'])
+        # Hashed once, hashing per account would dominate the run
+        self.password = make_password(options['password'])
+        self.totals = dict.fromkeys(['organizations', 'caregivers', 'patients', 'diagnoses', 'vital signs'], 0)
+        # Acronyms key the medical ID and staff number sequences, a run tag keeps them unique across runs
+        run_tag = uuid.uuid4().hex[:4].upper()
+        started = time.monotonic()
+
+        with assigned_values(User, Organization, Caregiver, Patient, PatientMedicalRecord, PatientDiagnosisDetails, VitalSign):
+            for index in range(options['organizations']):
+                organization = self.create_organization(f"SYN{run_tag}{index:04d}")
+                caregivers = self.create_caregivers(organization)
+                self.create_patients(organization, caregivers)
+                reconcile_statistics(organization.pkid)
+
+        catch_up_rollups(timezone.localdate(self.start))
+        elapsed = time.monotonic() - started
+        summary = ", ".join(f"{count} {name}" for name, count in self.totals.items())
+        self.stdout.write(self.style.SUCCESS(f"Generated {summary} in {elapsed:.0f}s."))
+
+    def random_moment(self, after, recent=False):
+        """
+        Returns a moment between `after` and now. With `recent`, later moments are likelier, like a growing user base.
+        """
+        position = self.rng.random() ** 0.5 if recent else self.rng.random()
+        return after + (self.now - after) * position
+
+    def create_user(self, email, role, created_at, is_active=True, is_verified=True):
+        return User(
+            email=email, role=role, password=self.password, is_active=is_active, is_verified=is_verified,
+            created_at=created_at, updated_at=created_at,
+        )
+
+    def create_organization(self, acronym):
+        rng = self.rng
+        name = f"{rng.choice(CITIES)} {rng.choice(FACILITIES)}"
+        user = User.objects.bulk_create([
+            self.create_user(f"admin@{acronym.lower()}.example.com", UserRoles.ORGANIZATION, self.start)
+        ])[0]
+        organization = Organization.objects.bulk_create([Organization(
+            user=user, name=name, acronym=acronym, slug=slugify(f"{name} {acronym}"),
+            address=f"{rng.randint(1, 200)} {rng.choice(STREETS)}, {name.split()[0]}",
+            phone_number=f"080{rng.randint(0, 99999999):08d}", created_at=self.start, updated_at=self.start,
+        )])[0]
+        self.totals['organizations'] += 1
+        return organization
+
+    def create_caregivers(self, organization):
+        rng = self.rng
+        count = self.options['caregivers']
+        types = list(CAREGIVER_TYPE_WEIGHTS)
+        caregiver_types = rng.choices(types, weights=[CAREGIVER_TYPE_WEIGHTS[type] for type in types], k=count)
+        staff_numbers = {
+            caregiver_type: iter(Caregiver.allocate_staff_numbers(organization, caregiver_type, caregiver_types.count(caregiver_type)))
+            for caregiver_type in set(caregiver_types)
+        }
+
+        caregivers = []
+        with transaction.atomic():
+            for index, caregiver_type in enumerate(caregiver_types):
+                # Staff join throughout the first half of the history
+                created_at = self.start + (self.now - self.start) * rng.random() / 2
+                first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                staff_number = next(staff_numbers[caregiver_type])
+                caregivers.append(Caregiver(
+                    user=self.create_user(f"caregiver{index}@{organization.acronym.lower()}.example.com", UserRoles.CAREGIVER,
+                                          created_at, is_active=rng.random() < 0.95),
+                    organization=organization, first_name=first_name, last_name=last_name,
+                    caregiver_type=caregiver_type, gender=rng.choice(Gender.values), staff_number=staff_number,
+                    slug=slugify(f"{staff_number} {first_name} {last_name}"), created_at=created_at, updated_at=created_at,
+                ))
+            self.bulk_create(User, [caregiver.user for caregiver in caregivers])
+            self.bulk_create(Caregiver, caregivers)
+        self.totals['caregivers'] += len(caregivers)
+        return caregivers
+
+    def create_patients(self, organization, caregivers):
+        rng = self.rng
+        # A few caregivers see most of the patients
+        workload = [rng.paretovariate(1.5) for _ in caregivers]
+        remaining = self.options['patients']
+        while remaining > 0:
+            count = min(remaining, self.options['batch_size'])
+            started = time.monotonic()
+            with transaction.atomic():
+                self.create_patient_batch(organization, caregivers, workload, count)
+            remaining -= count
+            self.stdout.write(
+                f"{organization.acronym}: {self.options['patients'] - remaining}/{self.options['patients']} patients "
+                f"({count / (time.monotonic() - started):.0f} patients/s)"
+            )
+
+    def create_patient_batch(self, organization, caregivers, workload, count):
+        rng = self.rng
+        offset = self.totals['patients']
+        patients, records, histories = [], [], []
+        for index, medical_id in enumerate(Patient.allocate_medical_ids(organization, count)):
+            registered_at = self.random_moment(self.start, recent=True)
+            age = clamp(rng.gauss(34, 18), 0, 95)
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            diagnosis_times = sorted(self.random_moment(registered_at) for _ in range(counted(rng, self.options['diagnoses'], 60)))
+            patient = Patient(
+                user=self.create_user(f"patient{offset + index}@{organization.acronym.lower()}.example.com", UserRoles.PATIENT,
+                                      registered_at, is_active=rng.random() < 0.95, is_verified=rng.random() < 0.9),
+                organization=organization, medical_id=medical_id, first_name=first_name, last_name=last_name,
+                date_of_birth=(self.now - timedelta(days=age * 365.25)).date(),
+                gender=rng.choices(Gender.values, weights=[48, 52])[0],
+                marital_status=MaritalStatus.SINGLE if age < 25 else rng.choice(MaritalStatus.values),
+                phone_number=f"080{rng.randint(0, 99999999):08d}",
+                address=f"{rng.randint(1, 300)} {rng.choice(STREETS)}",
+                slug=slugify(f"{medical_id} {first_name} {last_name}"),
+                diagnosis_count=len(diagnosis_times),
+                created_at=registered_at, updated_at=registered_at,
+            )
+            patients.append(patient)
+            records.append(PatientMedicalRecord(
+                patient=patient, slug=slugify(f"{medical_id} record"),
+                blood_group=rng.choices(*BLOOD_GROUPS)[0], genotype=rng.choices(*GENOTYPES)[0],
+                weight=Decimal(str(round(clamp(rng.gauss(70, 14), 3, 180), 2))),
+                height=Decimal(str(round(clamp(rng.gauss(166, 10), 50, 210), 1))),
+                created_at=registered_at, updated_at=registered_at,
+            ))
+            histories.append(diagnosis_times)
+
+        # bulk_create fills in the foreign keys from the primary keys of the related objects created before
+        self.bulk_create(User, [patient.user for patient in patients])
+        self.bulk_create(Patient, patients)
+        self.bulk_create(PatientMedicalRecord, records)
+        self.create_history(organization, caregivers, workload, patients, histories)
+        self.totals['patients'] += len(patients)
+
+    def create_history(self, organization, caregivers, workload, patients, histories):
+        rng = self.rng
+        diagnoses, readings = [], []
+        for patient, diagnosis_times in zip(patients, histories):
+            # Every patient has their own blood pressure, readings scatter around it
+            systolic = rng.gauss(122, 14)
+            for recorded_at in diagnosis_times:
+                diagnosis, medication, temperature, systolic_shift = rng.choices(DIAGNOSES, weights=DIAGNOSIS_WEIGHTS)[0]
+                record = PatientDiagnosisDetails(
+                    id=uuid.uuid4(), patient=patient, organization=organization,
+                    caregiver=rng.choices(caregivers, weights=workload)[0],
+                    assessment=f"Presented with symptoms consistent with {diagnosis.lower()}", diagnoses=diagnosis,
+                    medication=medication, health_care_center=organization.name, notes="Review in two weeks.",
+                    created_at=recorded_at, updated_at=recorded_at,
+                )
+                record.slug = str(record.id)
+                diagnoses.append(record)
+                readings.append(self.reading(patient, recorded_at, systolic + systolic_shift, temperature, record))
+            for _ in range(counted(rng, self.options['vitals'], 500)):
+                readings.append(self.reading(patient, self.random_moment(patient.created_at), systolic))
+
+        self.bulk_create(PatientDiagnosisDetails, diagnoses)
+        self.bulk_create(VitalSign, readings)
+
+        # The summary signals do not run for bulk_create, the last diagnosis created is the latest one
+        latest = {}
+        for record in diagnoses:
+            latest[record.patient_id] = record
+        diagnosed = [patient for patient in patients if patient.pkid in latest]
+        for patient in diagnosed:
+            patient.latest_diagnosis = latest[patient.pkid]
+        Patient.objects.bulk_update(diagnosed, ['latest_diagnosis'], batch_size=INSERT_BATCH_SIZE)
+
+        self.totals['diagnoses'] += len(diagnoses)
+        self.totals['vital signs'] += len(readings)
+
+    def reading(self, patient, recorded_at, systolic, temperature=36.8, diagnosis=None):
+        rng = self.rng
+        systolic = round(clamp(rng.gauss(systolic, 8), 80, 220))
+        diastolic = round(clamp(systolic * 0.65 + rng.gauss(0, 5), 45, 130))
+        reading = VitalSign(
+            id=uuid.uuid4(), patient=patient, patient_diagnoses_details=diagnosis, recorded_at=recorded_at,
+            body_temperature=Decimal(str(round(clamp(rng.gauss(temperature, 0.4), 34, 42), 1))),
+            pulse_rate=round(clamp(rng.gauss(78 + (temperature - 36.8) * 10, 10), 40, 180)),
+            blood_pressure=f"{systolic}/{diastolic}", systolic=systolic, diastolic=diastolic,
+            blood_oxygen=Decimal(str(round(clamp(rng.gauss(97.5, 1.5), 80, 100), 1))),
+            respiration_rate=round(clamp(rng.gauss(16, 2.5), 8, 40)),
+            created_at=recorded_at, updated_at=recorded_at,
+        )
+        reading.slug = str(reading.id)
+        return reading
+
+    def bulk_create(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=INSERT_BATCH_SIZE)
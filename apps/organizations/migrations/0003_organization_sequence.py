@@ -0,0 +1,60 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:32
+
+from django.db import migrations, models
+
+# Legacy medical IDs carry a random 8 hex digit suffix. Sequential IDs only start after the
+# highest legacy suffix in the low range, which keeps them collision free for the first 16.7M
+# patients of an organization without jumping to a random offset.
+LEGACY_MEDICAL_ID_LOW_RANGE = 16 ** 6
+
+
+def seed_sequences(apps, schema_editor):
+    OrganizationSequence = apps.get_model('organizations', 'OrganizationSequence')
+    Patient = apps.get_model('patients', 'Patient')
+    Caregiver = apps.get_model('caregivers', 'Caregiver')
+    sequences = {}
+
+    for staff_number in Caregiver.objects.exclude(staff_number=None).values_list('staff_number', flat=True).iterator():
+        prefix, _, number = staff_number.rpartition('_')
+        if prefix and number.isdigit():
+            key = f"staff_number:{prefix}"
+            sequences[key] = max(sequences.get(key, 0), int(number))
+
+    for medical_id in Patient.objects.exclude(medical_id=None).values_list('medical_id', flat=True).iterator():
+        prefix, _, suffix = medical_id.rpartition('_')
+        try:
+            value = int(suffix, 16)
+        except ValueError:
+            continue
+        if prefix and value < LEGACY_MEDICAL_ID_LOW_RANGE:
+            key = f"medical_id:{prefix}"
+            sequences[key] = max(sequences.get(key, 0), value)
+
+    OrganizationSequence.objects.bulk_create(
+        [OrganizationSequence(key=key, last_value=value) for key, value in sequences.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0004_search_vector'),
+        ('organizations', '0002_remove_organization_logo_and_more'),
+        ('patients', '0006_diagnosis_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationSequence',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('last_value', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Organization Sequence',
+                'verbose_name_plural': 'Organization Sequences',
+            },
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
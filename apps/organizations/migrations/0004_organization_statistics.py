@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_organization_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationStatistics',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='organizations.organization')),
+                ('caregivers_total', models.IntegerField(default=0)),
+                ('caregivers_active', models.IntegerField(default=0)),
+                ('caregivers_verified', models.IntegerField(default=0)),
+                ('patients_total', models.IntegerField(default=0)),
+                ('patients_active', models.IntegerField(default=0)),
+                ('patients_verified', models.IntegerField(default=0)),
+                ('patients_active_male', models.IntegerField(default=0)),
+                ('patients_active_female', models.IntegerField(default=0)),
+                ('patients_verified_male', models.IntegerField(default=0)),
+                ('patients_verified_female', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Organization Statistics',
+                'verbose_name_plural': 'Organization Statistics',
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0004_search_vector'),
+        ('organizations', '0004_organization_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('processed_through', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Watermark',
+                'verbose_name_plural': 'Rollup Watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='CaregiverDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('diagnoses', models.IntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('caregiver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='caregivers.caregiver')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='caregiver_daily_rollups', to='organizations.organization')),
+            ],
+            options={
+                'verbose_name': 'Caregiver Daily Rollup',
+                'verbose_name_plural': 'Caregiver Daily Rollups',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['organization', 'day'], name='caregiver_rollup_org_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('caregiver', 'day'), name='caregiver_daily_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrganizationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('new_patients', models.IntegerField(default=0)),
+                ('new_caregivers', models.IntegerField(default=0)),
+                ('new_diagnoses', models.IntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='organizations.organization')),
+            ],
+            options={
+                'verbose_name': 'Organization Daily Rollup',
+                'verbose_name_plural': 'Organization Daily Rollups',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('organization', 'day'), name='org_daily_rollup_unique')],
+            },
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import connection, models
 from shared.models import TimeStampedUUID
 from django.core.validators import FileExtensionValidator
 from autoslug import AutoSlugField
@@ -52,4 +52,145 @@ class Organization(TimeStampedUUID):
     @property
     def full_name(self):
         return self.name
-    
\ No newline at end of file
+    
+
+class OrganizationSequence(models.Model):
+    """
+    Named counter used to hand out per-organization identifiers such as medical IDs and staff numbers.
+
+    The key is the identifier prefix (e.g. `medical_id:ACME` or `staff_number:ACME_DR`) rather than the
+    organization itself, so two organizations whose acronyms only differ in case can never be handed
+    the same identifier.
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Organization Sequence")
+        verbose_name_plural = _("Organization Sequences")
+
+    def __str__(self):
+        return f"{self.key} = {self.last_value}"
+
+    @classmethod
+    def allocate(cls, key, count=1):
+        """
+        Reserves `count` consecutive values for `key` in a single statement and returns them as a range.
+
+        The upsert locks the counter row until the surrounding transaction ends, so concurrent callers are
+        serialized and a rolled back transaction gives its values back.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1.")
+        quote = connection.ops.quote_name
+        table, key_column, value_column = quote(cls._meta.db_table), quote('key'), quote('last_value')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({key_column}, {value_column}) VALUES (%s, %s) "
+                f"ON CONFLICT ({key_column}) DO UPDATE "
+                f"SET {value_column} = {table}.{value_column} + EXCLUDED.{value_column} "
+                f"RETURNING {value_column}",
+                [key, count],
+            )
+            last_value = cursor.fetchone()[0]
+        return range(last_value - count + 1, last_value + 1)
+
+
+class OrganizationStatistics(models.Model):
+    """
+    Dashboard counters for an organization, kept current by the signals in `apps.organizations.signals`.
+
+    Counters are adjusted with relative `F()` updates so concurrent writers never overwrite each other.
+    Writes that bypass signals (bulk imports, `QuerySet.update`) are repaired by `reconcile_organization_statistics`.
+    """
+    organization = models.OneToOneField(Organization, on_delete=models.CASCADE, primary_key=True, related_name='statistics')
+    caregivers_total = models.IntegerField(default=0)
+    caregivers_active = models.IntegerField(default=0)
+    caregivers_verified = models.IntegerField(default=0)
+    patients_total = models.IntegerField(default=0)
+    patients_active = models.IntegerField(default=0)
+    patients_verified = models.IntegerField(default=0)
+    patients_active_male = models.IntegerField(default=0)
+    patients_active_female = models.IntegerField(default=0)
+    patients_verified_male = models.IntegerField(default=0)
+    patients_verified_female = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    reconciled_at = models.DateTimeField(blank=True, null=True)
+
+    COUNTER_FIELDS = [
+        'caregivers_total', 'caregivers_active', 'caregivers_verified',
+        'patients_total', 'patients_active', 'patients_verified',
+        'patients_active_male', 'patients_active_female', 'patients_verified_male', 'patients_verified_female',
+    ]
+
+    class Meta:
+        verbose_name = _("Organization Statistics")
+        verbose_name_plural = _("Organization Statistics")
+
+    def __str__(self):
+        return f"Statistics for {self.organization_id}"
+
+
+class OrganizationDailyRollup(models.Model):
+    """
+    Activity of an organization on one local day (TIME_ZONE), built by the `build_daily_rollups` task.
+    Days without any activity have no row.
+    """
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='daily_rollups')
+    day = models.DateField()
+    new_patients = models.IntegerField(default=0)
+    new_caregivers = models.IntegerField(default=0)
+    new_diagnoses = models.IntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Organization Daily Rollup")
+        verbose_name_plural = _("Organization Daily Rollups")
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(fields=['organization', 'day'], name='org_daily_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.organization_id} on {self.day}"
+
+
+class CaregiverDailyRollup(models.Model):
+    """
+    Diagnoses recorded by a caregiver on one local day (TIME_ZONE). A caregiver with a row on a day was active that day.
+    """
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='caregiver_daily_rollups')
+    caregiver = models.ForeignKey('caregivers.Caregiver', on_delete=models.CASCADE, related_name='daily_rollups')
+    day = models.DateField()
+    diagnoses = models.IntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Caregiver Daily Rollup")
+        verbose_name_plural = _("Caregiver Daily Rollups")
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(fields=['caregiver', 'day'], name='caregiver_daily_rollup_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['organization', 'day'], name='caregiver_rollup_org_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.caregiver_id} on {self.day}"
+
+
+class RollupWatermark(models.Model):
+    """
+    Last local day a rollup has been completely built for. Later days are built on the next run.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    processed_through = models.DateField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Rollup Watermark")
+        verbose_name_plural = _("Rollup Watermarks")
+
+    def __str__(self):
+        return f"{self.name} through {self.processed_through}"
@@ -0,0 +1,100 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from apps.caregivers.models import Caregiver
+from apps.patients.models import Patient, PatientDiagnosisDetails
+from .models import CaregiverDailyRollup, Organization, OrganizationDailyRollup, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+DAILY_ROLLUP = 'daily_rollup'
+# Days rebuilt per transaction while catching up, keeps the first run over a long history in small steps
+CATCH_UP_CHUNK_DAYS = 31
+
+
+def local_midnight(day):
+    return datetime.combine(day, time.min, tzinfo=timezone.get_default_timezone())
+
+
+def count_per_local_day(model, start_day, end_day, *fields):
+    """
+    Counts the rows of `model` created on each local day between start_day and end_day (inclusive), grouped by `fields`.
+    """
+    return (
+        model.objects
+        .filter(created_at__gte=local_midnight(start_day), created_at__lt=local_midnight(end_day + timedelta(days=1)))
+        .annotate(day=TruncDate('created_at', tzinfo=timezone.get_default_timezone()))
+        .values(*fields, 'day')
+        .annotate(count=Count('pkid'))
+        .order_by()
+    )
+
+
+def build_rollups(start_day, end_day):
+    """
+    Rebuilds the daily rollups of every organization for the local days start_day to end_day (inclusive).
+    Rebuilding a range replaces its rows, so running it twice gives the same result.
+    """
+    organization_rows = defaultdict(lambda: {'new_patients': 0, 'new_caregivers': 0, 'new_diagnoses': 0})
+    for row in count_per_local_day(Patient, start_day, end_day, 'organization_id'):
+        organization_rows[(row['organization_id'], row['day'])]['new_patients'] = row['count']
+    for row in count_per_local_day(Caregiver, start_day, end_day, 'organization_id'):
+        organization_rows[(row['organization_id'], row['day'])]['new_caregivers'] = row['count']
+
+    caregiver_rollups = []
+    for row in count_per_local_day(PatientDiagnosisDetails, start_day, end_day, 'organization_id', 'caregiver_id'):
+        organization_rows[(row['organization_id'], row['day'])]['new_diagnoses'] += row['count']
+        caregiver_rollups.append(CaregiverDailyRollup(
+            organization_id=row['organization_id'], caregiver_id=row['caregiver_id'], day=row['day'], diagnoses=row['count']
+        ))
+
+    organization_rollups = [
+        OrganizationDailyRollup(organization_id=organization_id, day=day, **counts)
+        for (organization_id, day), counts in organization_rows.items()
+    ]
+
+    with transaction.atomic():
+        OrganizationDailyRollup.objects.filter(day__gte=start_day, day__lte=end_day).delete()
+        CaregiverDailyRollup.objects.filter(day__gte=start_day, day__lte=end_day).delete()
+        OrganizationDailyRollup.objects.bulk_create(organization_rollups, batch_size=1000)
+        CaregiverDailyRollup.objects.bulk_create(caregiver_rollups, batch_size=1000)
+
+
+def first_activity_day():
+    first = Organization.objects.aggregate(first=Min('created_at'))['first']
+    return timezone.localdate(first) if first else None
+
+
+def catch_up_rollups(rebuild_from=None):
+    """
+    Builds the daily rollups from the day after the watermark up to today, one chunk per transaction.
+
+    Today is rebuilt on every run but the watermark only moves up to yesterday, so a day is final
+    once the first run after its local midnight has counted it. Passing `rebuild_from` rebuilds
+    every day from that date on, e.g. after correcting historical data.
+    """
+    today = timezone.localdate()
+    while True:
+        with transaction.atomic():
+            # The lock keeps overlapping runs from building the same days
+            watermark, _ = RollupWatermark.objects.get_or_create(name=DAILY_ROLLUP)
+            watermark = RollupWatermark.objects.select_for_update().get(pk=watermark.pk)
+            if rebuild_from is not None:
+                start_day, rebuild_from = rebuild_from, None
+            elif watermark.processed_through is not None:
+                start_day = watermark.processed_through + timedelta(days=1)
+            else:
+                start_day = first_activity_day() or today
+            start_day = min(start_day, today)
+            end_day = min(start_day + timedelta(days=CATCH_UP_CHUNK_DAYS - 1), today)
+
+            build_rollups(start_day, end_day)
+            watermark.processed_through = min(end_day, today - timedelta(days=1))
+            watermark.save()
+        logger.info(f"Built daily rollups from {start_day} to {end_day}")
+        if end_day >= today:
+            return
@@ -1,10 +1,13 @@
+from datetime import timedelta
 from rest_framework import serializers
+from django.utils import timezone
 from apps.accounts.models import User
 from django.contrib.auth.password_validation import validate_password
 from apps.patients.models import Patient
 from apps.patients.serializers import PatientMedicalRecordSerializer
 from django.db import IntegrityError, transaction
 from apps.accounts.user_roles import UserRoles
+from apps.accounts.tenancy import require_request_organization
 from apps.patients.models import PatientMedicalRecord
 from .models import Organization
 
@@ -89,7 +92,7 @@ class OrganizationRegisterPatientSerializer(serializers.ModelSerializer):
                 user = User.objects.create_user(**user_data)
 
                 # Create patient
-                patient = Patient.objects.create(user=user,organization=self.context['request'].user.organization, **validated_data)
+                patient = Patient.objects.create(user=user,organization=require_request_organization(self.context['request']), **validated_data)
 
                 # Create patient medical record
                 PatientMedicalRecord.objects.create(patient=patient, **medical_record_data)
@@ -143,3 +146,50 @@ class OrganizationBasicInfoSerializer(serializers.ModelSerializer):
 
         # For the rest of the organization fields, update using the parent's update method
         return super().update(instance, validated_data)
+
+
+class TrendQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the trend endpoints. Dates are local days (TIME_ZONE), both ends inclusive.
+    Defaults to daily buckets over the last 30 days (weekly: 26 weeks, monthly: 12 months) and rejects ranges of more than MAX_BUCKETS buckets.
+    """
+    DEFAULT_RANGES = {'day': timedelta(days=29), 'week': timedelta(weeks=26), 'month': timedelta(days=365)}
+    MAX_BUCKETS = 400
+
+    bucket = serializers.ChoiceField(choices=list(DEFAULT_RANGES), default='day')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        end = attrs.get('end') or timezone.localdate()
+        start = attrs.get('start') or end - self.DEFAULT_RANGES[attrs['bucket']]
+        if start > end:
+            raise serializers.ValidationError("start must not be after end.")
+        attrs.update(start=start, end=end, periods=trend_periods(attrs['bucket'], start, end))
+        if len(attrs['periods']) > self.MAX_BUCKETS:
+            raise serializers.ValidationError(
+                f"The range spans more than {self.MAX_BUCKETS} {attrs['bucket']} buckets, use a larger bucket or a shorter range."
+            )
+        return attrs
+
+
+def trend_periods(bucket, start, end):
+    """
+    Returns the first day of every bucket overlapping start..end, matching the dates returned by Trunc
+    (weeks start on Monday, months on the 1st).
+    """
+    if bucket == 'week':
+        period = start - timedelta(days=start.weekday())
+    elif bucket == 'month':
+        period = start.replace(day=1)
+    else:
+        period = start
+
+    periods = []
+    while period <= end and len(periods) <= TrendQuerySerializer.MAX_BUCKETS:
+        periods.append(period)
+        if bucket == 'month':
+            period = (period + timedelta(days=32)).replace(day=1)
+        else:
+            period += timedelta(days=7 if bucket == 'week' else 1)
+    return periods
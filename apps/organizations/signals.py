@@ -0,0 +1,145 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from apps.accounts.models import User
+from apps.accounts.user_roles import UserRoles
+from apps.caregivers.models import Caregiver
+from apps.patients.models import Patient
+from .models import Organization, OrganizationStatistics
+from .statistics import apply_counter_changes, caregiver_counters, patient_counters
+
+# A save that only writes other fields cannot change the statistics
+PATIENT_STATISTICS_FIELDS = {'organization', 'gender'}
+CAREGIVER_STATISTICS_FIELDS = {'organization'}
+USER_STATISTICS_FIELDS = {'is_active', 'is_verified'}
+
+
+def affects_statistics(update_fields, fields):
+    return update_fields is None or bool(fields & set(update_fields))
+
+
+@receiver(post_save, sender=Organization)
+def create_organization_statistics(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        OrganizationStatistics.objects.get_or_create(organization=instance)
+
+
+@receiver(pre_save, sender=Patient)
+def snapshot_patient_statistics(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._statistics_snapshot = None
+    if raw or instance._state.adding or not affects_statistics(update_fields, PATIENT_STATISTICS_FIELDS):
+        return
+    instance._statistics_snapshot = Patient.objects.filter(pkid=instance.pkid).values(
+        'organization_id', 'gender', 'user__is_active', 'user__is_verified'
+    ).first()
+
+
+@receiver(post_save, sender=Patient)
+def update_statistics_on_patient_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_counter_changes(new=patient_counters(
+            instance.organization_id, instance.gender, instance.user.is_active, instance.user.is_verified
+        ))
+        return
+
+    old = getattr(instance, '_statistics_snapshot', None)
+    if old is None or (old['organization_id'], old['gender']) == (instance.organization_id, instance.gender):
+        return
+    # Saving a patient never changes its user, so the stored flags are still current
+    apply_counter_changes(
+        old=patient_counters(old['organization_id'], old['gender'], old['user__is_active'], old['user__is_verified']),
+        new=patient_counters(instance.organization_id, instance.gender, old['user__is_active'], old['user__is_verified']),
+    )
+
+
+@receiver(pre_save, sender=Caregiver)
+def snapshot_caregiver_statistics(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._statistics_snapshot = None
+    if raw or instance._state.adding or not affects_statistics(update_fields, CAREGIVER_STATISTICS_FIELDS):
+        return
+    instance._statistics_snapshot = Caregiver.objects.filter(pkid=instance.pkid).values(
+        'organization_id', 'user__is_active', 'user__is_verified'
+    ).first()
+
+
+@receiver(post_save, sender=Caregiver)
+def update_statistics_on_caregiver_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_counter_changes(new=caregiver_counters(
+            instance.organization_id, instance.user.is_active, instance.user.is_verified
+        ))
+        return
+
+    old = getattr(instance, '_statistics_snapshot', None)
+    if old is None or old['organization_id'] == instance.organization_id:
+        return
+    apply_counter_changes(
+        old=caregiver_counters(old['organization_id'], old['user__is_active'], old['user__is_verified']),
+        new=caregiver_counters(instance.organization_id, old['user__is_active'], old['user__is_verified']),
+    )
+
+
+@receiver(pre_save, sender=User)
+def snapshot_user_statistics(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._statistics_snapshot = None
+    if raw or instance._state.adding or instance.role not in (UserRoles.PATIENT, UserRoles.CAREGIVER):
+        return
+    if not affects_statistics(update_fields, USER_STATISTICS_FIELDS):
+        return
+    instance._statistics_snapshot = User.objects.filter(pkid=instance.pkid).values('is_active', 'is_verified').first()
+
+
+@receiver(post_save, sender=User)
+def update_statistics_on_user_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Moves the user's patient or caregiver between the active and verified counters when a flag is toggled.
+    """
+    old = getattr(instance, '_statistics_snapshot', None)
+    if raw or created or old is None:
+        return
+    if (old['is_active'], old['is_verified']) == (instance.is_active, instance.is_verified):
+        return
+
+    if instance.role == UserRoles.PATIENT:
+        patient = Patient.objects.filter(user=instance).values('organization_id', 'gender').first()
+        if patient:
+            apply_counter_changes(
+                old=patient_counters(patient['organization_id'], patient['gender'], old['is_active'], old['is_verified']),
+                new=patient_counters(patient['organization_id'], patient['gender'], instance.is_active, instance.is_verified),
+            )
+    else:
+        caregiver = Caregiver.objects.filter(user=instance).values('organization_id').first()
+        if caregiver:
+            apply_counter_changes(
+                old=caregiver_counters(caregiver['organization_id'], old['is_active'], old['is_verified']),
+                new=caregiver_counters(caregiver['organization_id'], instance.is_active, instance.is_verified),
+            )
+
+
+@receiver(pre_delete, sender=Patient)
+def snapshot_deleted_patient_statistics(sender, instance, **kwargs):
+    user = User.objects.filter(pkid=instance.user_id).values('is_active', 'is_verified').first() or {}
+    instance._statistics_snapshot = patient_counters(
+        instance.organization_id, instance.gender, user.get('is_active'), user.get('is_verified')
+    )
+
+
+@receiver(post_delete, sender=Patient)
+def update_statistics_on_patient_delete(sender, instance, **kwargs):
+    apply_counter_changes(old=getattr(instance, '_statistics_snapshot', None))
+
+
+@receiver(pre_delete, sender=Caregiver)
+def snapshot_deleted_caregiver_statistics(sender, instance, **kwargs):
+    user = User.objects.filter(pkid=instance.user_id).values('is_active', 'is_verified').first() or {}
+    instance._statistics_snapshot = caregiver_counters(
+        instance.organization_id, user.get('is_active'), user.get('is_verified')
+    )
+
+
+@receiver(post_delete, sender=Caregiver)
+def update_statistics_on_caregiver_delete(sender, instance, **kwargs):
+    apply_counter_changes(old=getattr(instance, '_statistics_snapshot', None))
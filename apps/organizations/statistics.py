@@ -0,0 +1,116 @@
+import logging
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from apps.caregivers.models import Caregiver
+from apps.patients.models import Patient
+from shared.text_choices import Gender
+from .models import Organization, OrganizationStatistics
+
+logger = logging.getLogger(__name__)
+
+GENDER_SUFFIXES = {Gender.MALE: 'male', Gender.FEMALE: 'female'}
+
+
+def patient_counters(organization_id, gender, is_active, is_verified, count=1):
+    """
+    Returns the statistics a patient in the given state contributes to, as {(organization_id, field): count}.
+    """
+    counters = Counter({(organization_id, 'patients_total'): count})
+    suffix = GENDER_SUFFIXES.get(gender)
+    for state, enabled in (('active', is_active), ('verified', is_verified)):
+        if not enabled:
+            continue
+        counters[(organization_id, f'patients_{state}')] += count
+        if suffix:
+            counters[(organization_id, f'patients_{state}_{suffix}')] += count
+    return counters
+
+
+def caregiver_counters(organization_id, is_active, is_verified):
+    """
+    Returns the statistics a caregiver in the given state contributes to, as {(organization_id, field): count}.
+    """
+    counters = Counter({(organization_id, 'caregivers_total'): 1})
+    if is_active:
+        counters[(organization_id, 'caregivers_active')] += 1
+    if is_verified:
+        counters[(organization_id, 'caregivers_verified')] += 1
+    return counters
+
+
+def apply_counter_changes(old=None, new=None):
+    """
+    Moves the statistics from the `old` contribution to the `new` one with one relative UPDATE per organization.
+    Organizations without a statistics row yet are skipped, the row is counted from scratch when first read.
+    """
+    deltas = defaultdict(dict)
+    for key in set(old or {}) | set(new or {}):
+        delta = (new or {}).get(key, 0) - (old or {}).get(key, 0)
+        if delta:
+            organization_id, field = key
+            deltas[organization_id][field] = F(field) + delta
+
+    for organization_id, changes in deltas.items():
+        OrganizationStatistics.objects.filter(organization_id=organization_id).update(updated_at=timezone.now(), **changes)
+
+
+def compute_statistics(organization_id):
+    """
+    Counts the organization's caregivers and patients from scratch.
+    """
+    caregiver_stats = Caregiver.objects.filter(organization_id=organization_id).aggregate(
+        caregivers_total=Count("pkid"),
+        caregivers_active=Count("pkid", filter=Q(user__is_active=True)),
+        caregivers_verified=Count("pkid", filter=Q(user__is_verified=True)),
+    )
+    patient_stats = Patient.objects.filter(organization_id=organization_id).aggregate(
+        patients_total=Count("pkid"),
+        patients_active=Count("pkid", filter=Q(user__is_active=True)),
+        patients_verified=Count("pkid", filter=Q(user__is_verified=True)),
+        patients_active_male=Count("pkid", filter=Q(user__is_active=True, gender=Gender.MALE)),
+        patients_active_female=Count("pkid", filter=Q(user__is_active=True, gender=Gender.FEMALE)),
+        patients_verified_male=Count("pkid", filter=Q(user__is_verified=True, gender=Gender.MALE)),
+        patients_verified_female=Count("pkid", filter=Q(user__is_verified=True, gender=Gender.FEMALE)),
+    )
+    return {**caregiver_stats, **patient_stats}
+
+
+def reconcile_statistics(organization_id):
+    """
+    Recounts an organization's statistics and returns the repaired row, logging any drift that was found.
+
+    The row is locked before counting, so signal updates from concurrent transactions wait and are applied
+    on top of the recount rather than being lost.
+    """
+    with transaction.atomic():
+        statistics, _ = OrganizationStatistics.objects.get_or_create(organization_id=organization_id)
+        statistics = OrganizationStatistics.objects.select_for_update().get(pk=statistics.pk)
+        counts = compute_statistics(organization_id)
+        drift = {
+            field: (getattr(statistics, field), value)
+            for field, value in counts.items() if getattr(statistics, field) != value
+        }
+        if drift and statistics.reconciled_at is not None:
+            logger.warning(f"Repaired statistics drift for organization {organization_id}: {drift}")
+        for field, value in counts.items():
+            setattr(statistics, field, value)
+        statistics.reconciled_at = timezone.now()
+        statistics.save()
+    return statistics
+
+
+def get_organization_statistics(organization):
+    """
+    Returns the statistics row of the organization, counting it once if it does not exist yet.
+    """
+    statistics = OrganizationStatistics.objects.filter(organization=organization).first()
+    if statistics is None:
+        statistics = reconcile_statistics(organization.pkid)
+    return statistics
+
+
+def reconcile_all_statistics():
+    for organization_id in Organization.objects.values_list('pkid', flat=True).iterator():
+        reconcile_statistics(organization_id)
@@ -1,7 +1,10 @@
+from datetime import date
 from celery import shared_task
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.conf import settings
+from .rollups import catch_up_rollups
+from .statistics import reconcile_all_statistics, reconcile_statistics
 
 @shared_task
 def send_patient_account_creation_notification_email(patient_email, patient_password,patient_full_name, organization_name):
@@ -35,3 +38,22 @@ def send_patient_account_creation_notification_email(patient_email, patient_pass
     )
     email.content_subtype = "html" 
     email.send(fail_silently=False)
+
+
+@shared_task
+def reconcile_organization_statistics(organization_id=None):
+    """
+    Recounts the dashboard statistics of one organization, or of all of them, repairing any drift.
+    """
+    if organization_id is None:
+        reconcile_all_statistics()
+    else:
+        reconcile_statistics(organization_id)
+
+
+@shared_task
+def build_daily_rollups(rebuild_from=None):
+    """
+    Brings the daily analytics rollups up to date. `rebuild_from` (YYYY-MM-DD) rebuilds every day since that date.
+    """
+    catch_up_rollups(date.fromisoformat(rebuild_from) if rebuild_from else None)
@@ -1,5 +1,6 @@
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q,Sum
+from django.db.models import Count, DateField, Q,Sum
+from django.db.models.functions import Trunc
 from apps.patients.serializers import  PatientSerializer
 # from apps.patients.serializers import PatientDiagnosisDetailsSerializer, PatientSerializer,CreatePatientDiagnosisWithVitalSignSerializer
 from apps.patients.models import Patient
@@ -14,11 +15,12 @@ from apps.caregivers.serializers import CaregiverSerializer
 # from apps.caregivers.serializers import CaregiverSerializer,BasicCaregiverSerializer
 # from apps.patients.exceptions import PatientNotFoundException
 # from apps.organizations.utils import StandardResultsSetPagination
-from .models import Organization
+from .models import CaregiverDailyRollup, Organization, OrganizationDailyRollup
 from .permissions import IsOrganization,IsOrganizationAndOwnsObject
 from apps.caregivers.models import Caregiver
 from django_filters.rest_framework import DjangoFilterBackend
 from apps.accounts.user_roles import UserRoles
+from apps.accounts.tenancy import require_request_organization
 from shared.validators import validate_uuid
 from rest_framework.exceptions import ValidationError
 # from .exceptions import PatientNotificationFailedException
@@ -30,36 +32,35 @@ from django.db.models import Prefetch
 # from apps.caregivers.permissions import IsCaregiver
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import RetrieveUpdateAPIView
-from .serializers import OrganizationSerializer
+from .serializers import OrganizationSerializer, TrendQuerySerializer
+from .statistics import get_organization_statistics
 
 
 class OrganizationDashboardView(APIView):
     """
     Retrieves organization statistics and latest 10 caregivers and patient for the dashboard.
+    Statistics are read from the organization's precomputed statistics row.
     """
     permission_classes = [IsAuthenticated, IsOrganization]
 
     def get(self, request, *args, **kwargs):
-        if not hasattr(request.user, "organization") or request.user.organization is None:
-            raise NotFound("Organization not found for user.")
+        statistics = get_organization_statistics(require_request_organization(request))
 
-        organization = request.user.organization
-
-        caregiver_stats = Caregiver.objects.filter(organization=organization).aggregate(
-            total=Count("pkid"),
-            active=Count("pkid", filter=Q(user__is_active=True)),
-            verified=Count("pkid", filter=Q(user__is_verified=True)),
-        )
+        caregiver_stats = {
+            "total": statistics.caregivers_total,
+            "active": statistics.caregivers_active,
+            "verified": statistics.caregivers_verified,
+        }
 
-        patient_stats = Patient.objects.filter(organization=organization).aggregate(
-            total=Count("pkid"),
-            active=Count("pkid", filter=Q(user__is_active=True)),
-            verified=Count("pkid", filter=Q(user__is_verified=True)),
-            active_male=Count("pkid", filter=Q(user__is_active=True, gender="Male")),
-            active_female=Count("pkid", filter=Q(user__is_active=True, gender="Female")),
-            verified_male=Count("pkid", filter=Q(user__is_verified=True, gender="Male")),
-            verified_female=Count("pkid", filter=Q(user__is_verified=True, gender="Female")),
-        )
+        patient_stats = {
+            "total": statistics.patients_total,
+            "active": statistics.patients_active,
+            "verified": statistics.patients_verified,
+            "active_male": statistics.patients_active_male,
+            "active_female": statistics.patients_active_female,
+            "verified_male": statistics.patients_verified_male,
+            "verified_female": statistics.patients_verified_female,
+        }
 
         response_data = {
             "statistics": {
@@ -267,3 +268,103 @@ class OrganizationProfileView(APIView):
 #             .filter(diagnoses__isnull=False)  # Ensures only patients with diagnosis records are included
 #             .distinct()
 #         )
+
+
+def bucket_rollups(rollups, bucket, *fields):
+    """
+    Groups daily rollups by bucket (and `fields`), ready for aggregation.
+    """
+    return rollups.annotate(period=Trunc('day', bucket, output_field=DateField())).values('period', *fields)
+
+
+class OrganizationTrendView(APIView):
+    """
+    Organization activity over time, read from the daily rollups only.
+    GET /api/v1/organizations/trends/?bucket=day|week|month&start=<date>&end=<date>
+    Returns new patients, caregivers and diagnoses and the number of distinct caregivers who recorded a diagnosis, per bucket.
+    Rollups are rebuilt every 15 minutes, so the current day may lag slightly behind.
+    """
+    permission_classes = [IsAuthenticated, IsOrganization]
+
+    def get(self, request, *args, **kwargs):
+        organization = require_request_organization(request)
+        query = TrendQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        days = {'organization': organization, 'day__gte': params['start'], 'day__lte': params['end']}
+
+        totals = bucket_rollups(OrganizationDailyRollup.objects.filter(**days), params['bucket']).annotate(
+            new_patients=Sum('new_patients'),
+            new_caregivers=Sum('new_caregivers'),
+            new_diagnoses=Sum('new_diagnoses'),
+        ).order_by()
+        active = bucket_rollups(CaregiverDailyRollup.objects.filter(**days), params['bucket']).annotate(
+            active_caregivers=Count('caregiver', distinct=True),
+        ).order_by()
+
+        series = {
+            period: {'period': period, 'new_patients': 0, 'new_caregivers': 0, 'new_diagnoses': 0, 'active_caregivers': 0}
+            for period in params['periods']
+        }
+        for row in [*totals, *active]:
+            series[row.pop('period')].update(row)
+
+        return Response({
+            "message": "Organization trends retrieved successfully",
+            "data": {
+                'bucket': params['bucket'],
+                'start': params['start'],
+                'end': params['end'],
+                'series': list(series.values()),
+            }
+        }, status=status.HTTP_200_OK)
+
+
+class CaregiverTrendView(APIView):
+    """
+    Diagnoses recorded per caregiver over time, read from the daily rollups only.
+    GET /api/v1/organizations/trends/caregivers/?bucket=day|week|month&start=<date>&end=<date>&caregiver=<uuid>
+    Only buckets in which a caregiver recorded at least one diagnosis are returned.
+    """
+    permission_classes = [IsAuthenticated, IsOrganization]
+
+    def get(self, request, *args, **kwargs):
+        query = TrendQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        rollups = CaregiverDailyRollup.objects.filter(
+            organization=require_request_organization(request), day__gte=params['start'], day__lte=params['end']
+        )
+        caregiver_id = request.query_params.get('caregiver')
+        if caregiver_id:
+            if not validate_uuid(caregiver_id):
+                raise ValidationError({'caregiver': ["Must be a valid UUID."]})
+            rollups = rollups.filter(caregiver__id=caregiver_id)
+
+        rows = (
+            bucket_rollups(rollups, params['bucket'], 'caregiver__id', 'caregiver__first_name', 'caregiver__last_name')
+            .annotate(diagnoses=Sum('diagnoses'))
+            .order_by('period', '-diagnoses', 'caregiver__id')
+        )
+        series = [
+            {
+                'period': row['period'],
+                'caregiver': {
+                    'id': row['caregiver__id'],
+                    'name': f"{row['caregiver__first_name']} {row['caregiver__last_name']}".title(),
+                },
+                'diagnoses': row['diagnoses'],
+            }
+            for row in rows
+        ]
+
+        return Response({
+            "message": "Caregiver trends retrieved successfully",
+            "data": {
+                'bucket': params['bucket'],
+                'start': params['start'],
+                'end': params['end'],
+                'series': series,
+            }
+        }, status=status.HTTP_200_OK)
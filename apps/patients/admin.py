@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Patient,PatientMedicalRecord,PatientDiagnosisDetails,VitalSign
+from .models import Patient,PatientMedicalRecord,PatientDiagnosisDetails,VitalSign,PatientImportJob
 
 @admin.register(Patient)
 class PatientAdmin(admin.ModelAdmin):
@@ -23,3 +23,10 @@ class VitalSignAdmin(admin.ModelAdmin):
 class PatientMedicalRecordAdmin(admin.ModelAdmin):
     list_display = ('patient', 'blood_group', 'genotype', 'weight', 'height','id')
     search_fields = ('patient__first_name', 'patient__last_name')
+
+
+@admin.register(PatientImportJob)
+class PatientImportJobAdmin(admin.ModelAdmin):
+    list_display = ('organization', 'status', 'processed_rows', 'created_count', 'failed_count', 'created_at','id')
+    list_filter = ('status', 'organization')
+    readonly_fields = ('errors',)
@@ -20,4 +20,9 @@ class PatientNotificationFailedException(CustomValidationError):
 class PatientMedicalIDNotFoundException(CustomValidationError):
     status_code = status.HTTP_404_NOT_FOUND
     default_detail = "Patient not found or you do not have access to this patient."
-    default_code = "patient_not_found"
\ No newline at end of file
+    default_code = "patient_not_found"
+
+class PatientImportJobNotFoundException(CustomValidationError):
+    status_code = status.HTTP_404_NOT_FOUND
+    default_detail = "Patient import job not found."
+    default_code = "patient_import_job_not_found"
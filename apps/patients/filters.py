@@ -0,0 +1,39 @@
+from django_filters import rest_framework as filters
+from .models import PatientDiagnosisDetails, VitalSign
+
+
+class DiagnosisSearchFilterSet(filters.FilterSet):
+    """
+    Narrows a diagnosis search or export to one patient, one caregiver and/or a created_at range.
+    `created_after` is inclusive and `created_before` is exclusive; both accept a date or a datetime.
+    """
+    medical_id = filters.CharFilter(field_name='patient__medical_id')
+    caregiver = filters.UUIDFilter(field_name='caregiver__id')
+    created_after = filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = filters.DateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = PatientDiagnosisDetails
+        fields = ['medical_id', 'caregiver', 'created_after', 'created_before']
+
+
+class VitalSignFilterSet(filters.FilterSet):
+    """
+    Narrows a vital sign export to one patient, a recorded_at range and/or blood pressure thresholds,
+    e.g. `?systolic_min=140` for hypertensive readings. Thresholds are inclusive and run against the indexed
+    systolic and diastolic columns.
+    """
+    medical_id = filters.CharFilter(field_name='patient__medical_id')
+    systolic_min = filters.NumberFilter(field_name='systolic', lookup_expr='gte')
+    systolic_max = filters.NumberFilter(field_name='systolic', lookup_expr='lte')
+    diastolic_min = filters.NumberFilter(field_name='diastolic', lookup_expr='gte')
+    diastolic_max = filters.NumberFilter(field_name='diastolic', lookup_expr='lte')
+    recorded_after = filters.DateTimeFilter(field_name='recorded_at', lookup_expr='gte')
+    recorded_before = filters.DateTimeFilter(field_name='recorded_at', lookup_expr='lt')
+
+    class Meta:
+        model = VitalSign
+        fields = [
+            'medical_id', 'recorded_after', 'recorded_before',
+            'systolic_min', 'systolic_max', 'diastolic_min', 'diastolic_max',
+        ]
@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import logging
+from collections import Counter
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.text import slugify
+from apps.accounts.user_roles import UserRoles
+from apps.organizations.statistics import apply_counter_changes, patient_counters
+from shared.text_choices import ImportFileFormat, ImportStatus
+from .models import Patient, PatientImportJob, PatientMedicalRecord
+from .serializers import PatientImportRowSerializer, PatientMedicalRecordSerializer
+from .tasks import queue_patient_welcome_emails
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+IMPORT_CHUNK_SIZE = 500
+MEDICAL_RECORD_FIELDS = PatientMedicalRecordSerializer.Meta.fields
+
+
+def normalize_row(row):
+    """
+    Drops blank values and nests flat medical record columns under `medical_record`,
+    so CSV rows and flat or nested JSONL rows validate the same way.
+    """
+    data = {}
+    medical_record = {}
+    for key, value in row.items():
+        if key is None or value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        key = key.strip().lower()
+        value = value.strip() if isinstance(value, str) else value
+        if key in MEDICAL_RECORD_FIELDS:
+            medical_record[key] = value
+        else:
+            data[key] = value
+    if medical_record and not isinstance(data.get('medical_record'), dict):
+        data['medical_record'] = medical_record
+    return data
+
+
+def iter_rows(file, file_format):
+    """
+    Yields (row number, data, parse error) for every row of the file without loading it into memory.
+    Row numbers are file line numbers, so the CSV header is line 1.
+    """
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    if file_format == ImportFileFormat.CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, normalize_row(row), None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, "Invalid JSON."
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object."
+            continue
+        yield line_number, normalize_row(row), None
+
+
+class PatientImporter:
+    """
+    Streams an import file and creates patients chunk by chunk.
+
+    Each chunk is validated row by row in memory, checked for existing emails with a single query and
+    written with one bulk_create per table inside its own transaction. Imported accounts get an unusable
+    password (no hashing cost), their welcome email links to the password reset page to set one.
+    """
+    chunk_size = IMPORT_CHUNK_SIZE
+
+    def __init__(self, job):
+        self.job = job
+        self.organization = job.organization
+        self.seen_emails = set()
+
+    def run(self):
+        job = self.job
+        job.status = ImportStatus.PROCESSING
+        job.save(update_fields=['status', 'updated_at'])
+
+        try:
+            with job.file.open('rb') as file:
+                rows = iter_rows(file, job.file_format)
+                while chunk := list(islice(rows, self.chunk_size)):
+                    self.import_chunk(chunk)
+                    job.processed_rows += len(chunk)
+                    job.save(update_fields=['processed_rows', 'created_count', 'failed_count', 'errors', 'updated_at'])
+        except Exception as e:
+            logger.exception(f"Patient import {job.id} failed")
+            job.status = ImportStatus.FAILED
+            job.error_message = str(e)
+        else:
+            job.status = ImportStatus.COMPLETED
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'completed_at', 'updated_at'])
+        return job
+
+    def add_error(self, row_number, errors):
+        self.job.failed_count += 1
+        if len(self.job.errors) < PatientImportJob.MAX_ERRORS:
+            self.job.errors.append({'row': row_number, 'errors': errors})
+
+    def import_chunk(self, chunk):
+        valid_rows = []
+        for row_number, data, parse_error in chunk:
+            if parse_error:
+                self.add_error(row_number, {'non_field_errors': [parse_error]})
+                continue
+            serializer = PatientImportRowSerializer(data=data)
+            if not serializer.is_valid():
+                self.add_error(row_number, serializer.errors)
+                continue
+            email = serializer.validated_data['email']
+            if email in self.seen_emails:
+                self.add_error(row_number, {'email': ["Duplicate email in the import file."]})
+                continue
+            self.seen_emails.add(email)
+            valid_rows.append((row_number, serializer.validated_data))
+
+        valid_rows = self.exclude_existing_emails(valid_rows)
+        try:
+            self.create_patients(valid_rows)
+        except IntegrityError:
+            # An account was created concurrently for one of the emails, check again and retry once
+            self.create_patients(self.exclude_existing_emails(valid_rows))
+
+    def exclude_existing_emails(self, rows):
+        if not rows:
+            return rows
+        # Row emails are lowercased, existing accounts may differ from them only in case
+        emails = [data['email'] for _, data in rows]
+        existing = set(
+            User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=emails).values_list('email_lower', flat=True)
+        )
+        remaining = []
+        for row_number, data in rows:
+            if data['email'] in existing:
+                self.add_error(row_number, {'email': ["An account with this email already exists."]})
+            else:
+                remaining.append((row_number, data))
+        return remaining
+
+    def create_patients(self, rows):
+        if not rows:
+            return
+        unusable_password = make_password(None)
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    email=data['email'],
+                    password=unusable_password,
+                    role=UserRoles.PATIENT,
+                    is_active=True,
+                    is_verified=True,
+                )
+                for _, data in rows
+            ])
+            medical_ids = Patient.allocate_medical_ids(self.organization, len(rows))
+            patients = Patient.objects.bulk_create([
+                Patient(
+                    user=user,
+                    organization=self.organization,
+                    medical_id=medical_id,
+                    # AutoSlugField only checks uniqueness against saved rows, so siblings in a batch need distinct slugs
+                    slug=slugify(f"{medical_id} {data['first_name']} {data['last_name']}"),
+                    **{key: value for key, value in data.items() if key not in ('email', 'medical_record')}
+                )
+                for user, medical_id, (_, data) in zip(users, medical_ids, rows)
+            ])
+            PatientMedicalRecord.objects.bulk_create([
+                PatientMedicalRecord(patient=patient, slug=slugify(f"{patient.medical_id} record"), **data.get('medical_record', {}))
+                for patient, (_, data) in zip(patients, rows)
+            ])
+
+            # bulk_create skips the signals that maintain the dashboard statistics, count the whole chunk at once
+            new_counters = Counter()
+            for gender, count in Counter(patient.gender for patient in patients).items():
+                new_counters.update(patient_counters(self.organization.pkid, gender, True, True, count=count))
+            apply_counter_changes(new=new_counters)
+
+            queue_patient_welcome_emails(patients, set_password=True)
+        self.job.created_count += len(patients)
@@ -0,0 +1,181 @@
+import csv
+import io
+import uuid
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import Patient, VitalSign
+from .validators import parse_blood_pressure
+
+MAX_INGEST_BATCH_SIZE = 5000
+# Monitors clocks drift, readings slightly in the future are accepted
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def decimal_in_range(minimum, maximum, places):
+    exponent = Decimal(1).scaleb(-places)
+
+    def parse(value):
+        if isinstance(value, bool):
+            raise ValueError
+        number = Decimal(str(value)).quantize(exponent)
+        if not minimum <= number <= maximum:
+            raise ValueError
+        return number
+    return parse
+
+
+def integer_in_range(minimum, maximum):
+    def parse(value):
+        if isinstance(value, bool) or int(value) != value:
+            raise ValueError
+        if not minimum <= value <= maximum:
+            raise ValueError
+        return int(value)
+    return parse
+
+
+# Physiologically plausible bounds, anything outside is a sensor or typing error
+METRIC_PARSERS = {
+    'body_temperature': (decimal_in_range(Decimal('25'), Decimal('45'), 1), "between 25 and 45 °C"),
+    'pulse_rate': (integer_in_range(20, 300), "an integer between 20 and 300 bpm"),
+    'blood_oxygen': (decimal_in_range(Decimal('0'), Decimal('100'), 1), "between 0 and 100 %"),
+    'respiration_rate': (integer_in_range(0, 100), "an integer between 0 and 100 breaths per minute"),
+    'weight': (decimal_in_range(Decimal('0'), Decimal('500'), 2), "between 0 and 500 kg"),
+}
+
+# Column order of the COPY statement, must match the values built in `to_copy_row`
+COPY_COLUMNS = [
+    'id', 'created_at', 'updated_at', 'slug', 'patient_id', 'recorded_at', 'body_temperature', 'pulse_rate',
+    'blood_pressure', 'systolic', 'diastolic', 'blood_oxygen', 'respiration_rate', 'weight',
+]
+
+
+def validate_readings(readings, organization):
+    """
+    Validates a batch of readings and returns (valid rows, errors).
+
+    Patients are resolved for the whole batch with a single query and each field is checked with a plain
+    parser instead of a serializer per reading. Valid rows are dicts of VitalSign column values.
+    Errors are reported as [{"index": <position in the batch>, "errors": {...}}].
+    """
+    medical_ids = {
+        reading.get('medical_id') for reading in readings
+        if isinstance(reading, dict) and isinstance(reading.get('medical_id'), str)
+    }
+    patients = dict(
+        Patient.objects.filter(organization=organization, medical_id__in=medical_ids).values_list('medical_id', 'pkid')
+    )
+    latest_allowed = timezone.now() + MAX_CLOCK_SKEW
+
+    rows, errors = [], []
+    for index, reading in enumerate(readings):
+        if not isinstance(reading, dict):
+            errors.append({'index': index, 'errors': {'non_field_errors': ["Each reading must be an object."]}})
+            continue
+
+        row_errors = {}
+        medical_id = reading.get('medical_id')
+        row = {'patient_id': patients.get(medical_id) if isinstance(medical_id, str) else None}
+        if not isinstance(medical_id, str):
+            row_errors['medical_id'] = ["Enter a valid medical ID."]
+        elif row['patient_id'] is None:
+            row_errors['medical_id'] = ["Patient with this medical ID was not found in your organization."]
+
+        recorded_at = reading.get('recorded_at')
+        try:
+            recorded_at = parse_datetime(recorded_at) if isinstance(recorded_at, str) else None
+        except ValueError:
+            recorded_at = None
+        if recorded_at is None:
+            row_errors['recorded_at'] = ["Enter a valid ISO 8601 datetime."]
+        else:
+            if timezone.is_naive(recorded_at):
+                recorded_at = timezone.make_aware(recorded_at)
+            if recorded_at > latest_allowed:
+                row_errors['recorded_at'] = ["Reading cannot be in the future."]
+            row['recorded_at'] = recorded_at
+
+        has_metric = False
+        for metric, (parse, description) in METRIC_PARSERS.items():
+            value = reading.get(metric)
+            row[metric] = None
+            if value is None:
+                continue
+            try:
+                row[metric] = parse(value)
+                has_metric = True
+            except (TypeError, ValueError, OverflowError, InvalidOperation):
+                # OverflowError is int() of an infinite float, e.g. 1e400 in the JSON body
+                row_errors[metric] = [f"Must be {description}."]
+
+        blood_pressure = reading.get('blood_pressure')
+        row['blood_pressure'], row['systolic'], row['diastolic'] = None, None, None
+        if blood_pressure is not None:
+            systolic, diastolic = parse_blood_pressure(blood_pressure if isinstance(blood_pressure, str) else '')
+            if systolic is None:
+                row_errors['blood_pressure'] = ['Enter a valid blood pressure in the format "120/80".']
+            else:
+                # Stored normalized, e.g. "120/080" as "120/80"
+                row['blood_pressure'], row['systolic'], row['diastolic'] = f"{systolic}/{diastolic}", systolic, diastolic
+                has_metric = True
+
+        if not has_metric and not row_errors:
+            row_errors['non_field_errors'] = ["A reading must contain at least one vital sign."]
+
+        if row_errors:
+            errors.append({'index': index, 'errors': row_errors})
+        else:
+            rows.append(row)
+    return rows, errors
+
+
+def to_copy_row(reading_id, now, row):
+    return [
+        reading_id, now, now, str(reading_id), row['patient_id'], row['recorded_at'], row['body_temperature'],
+        row['pulse_rate'], row['blood_pressure'], row['systolic'], row['diastolic'], row['blood_oxygen'],
+        row['respiration_rate'], row['weight'],
+    ]
+
+
+def copy_readings(rows):
+    """
+    Streams the rows into the vital sign table with a single COPY, bypassing per-row ORM work.
+    """
+    now = timezone.now()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # None is written as an empty unquoted field, which COPY reads as NULL
+        writer.writerow(to_copy_row(uuid.uuid4(), now, row))
+    buffer.seek(0)
+
+    quote = connection.ops.quote_name
+    sql = (
+        f"COPY {quote(VitalSign._meta.db_table)} ({', '.join(quote(column) for column in COPY_COLUMNS)}) "
+        f"FROM STDIN WITH (FORMAT csv)"
+    )
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(sql, buffer)
+
+
+def bulk_create_readings(rows):
+    readings = [VitalSign(**row) for row in rows]
+    for reading in readings:
+        reading.slug = str(reading.id)
+    VitalSign.objects.bulk_create(readings, batch_size=1000)
+
+
+def ingest_readings(rows):
+    """
+    Writes validated readings with COPY on PostgreSQL and bulk_create elsewhere.
+    """
+    if not rows:
+        return
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            copy_readings(rows)
+        else:
+            bulk_create_readings(rows)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apps.patients.models import Patient, PatientDiagnosisDetails
+
+
+class Command(BaseCommand):
+    help = "Backfills Patient.latest_diagnosis and Patient.diagnosis_count from existing diagnoses."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Number of patients updated per transaction.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        diagnoses = PatientDiagnosisDetails.objects.filter(patient=OuterRef('pkid'))
+        latest_diagnosis = diagnoses.order_by('-created_at', '-pkid').values('pkid')[:1]
+        diagnosis_count = (
+            diagnoses.order_by()
+            .values('patient')
+            .annotate(total=Count('pkid'))
+            .values('total')
+        )
+
+        last_pkid = 0
+        updated = 0
+        while True:
+            pkids = list(
+                Patient.objects.filter(pkid__gt=last_pkid)
+                .order_by('pkid')
+                .values_list('pkid', flat=True)[:batch_size]
+            )
+            if not pkids:
+                break
+
+            with transaction.atomic():
+                updated += Patient.objects.filter(pkid__gte=pkids[0], pkid__lte=pkids[-1]).update(
+                    latest_diagnosis=Subquery(latest_diagnosis),
+                    diagnosis_count=Coalesce(Subquery(diagnosis_count, output_field=IntegerField()), 0),
+                )
+            last_pkid = pkids[-1]
+            self.stdout.write(f"Backfilled {updated} patients (up to pkid {last_pkid})")
+
+        self.stdout.write(self.style.SUCCESS(f"Diagnosis summary backfilled for {updated} patients."))
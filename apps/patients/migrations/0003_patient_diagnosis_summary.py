@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0002_alter_caregiver_profile_picture'),
+        ('organizations', '0002_remove_organization_logo_and_more'),
+        ('patients', '0002_alter_patient_profile_picture'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='diagnosis_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='latest_diagnosis',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='patients.patientdiagnosisdetails'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(condition=models.Q(('diagnosis_count__gt', 0)), fields=['organization', '-created_at'], name='patient_diagnosed_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patientdiagnosisdetails',
+            index=models.Index(fields=['patient', '-created_at'], name='diagnosis_patient_created_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0003_keyset_pagination_indexes'),
+        ('organizations', '0002_remove_organization_logo_and_more'),
+        ('patients', '0003_patient_diagnosis_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='patient',
+            name='patient_diagnosed_org_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='patientdiagnosisdetails',
+            name='diagnosis_patient_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['organization', '-created_at', '-pkid'], name='patient_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(condition=models.Q(('diagnosis_count__gt', 0)), fields=['organization', '-created_at', '-pkid'], name='patient_diagnosed_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patientdiagnosisdetails',
+            index=models.Index(fields=['patient', '-created_at', '-pkid'], name='diagnosis_patient_created_idx'),
+        ),
+    ]
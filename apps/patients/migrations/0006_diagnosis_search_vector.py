@@ -0,0 +1,70 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:30
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Clinical free text is indexed with the 'english' configuration so that stemming matches
+# e.g. "infection" against "infections". Like 0005 this is PostgreSQL only.
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({prefix}diagnoses, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({prefix}assessment, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({prefix}medication, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({prefix}health_allergies, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce({prefix}notes, '')), 'D')
+"""
+
+FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION patients_patientdiagnosisdetails_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := """ + SEARCH_VECTOR_SQL.format(prefix='NEW.') + """;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER patients_patientdiagnosisdetails_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF diagnoses, assessment, medication, health_allergies, notes
+    ON patients_patientdiagnosisdetails
+    FOR EACH ROW EXECUTE FUNCTION patients_patientdiagnosisdetails_search_vector_update();
+    """,
+    "UPDATE patients_patientdiagnosisdetails SET search_vector = " + SEARCH_VECTOR_SQL.format(prefix='') + ";",
+    "CREATE INDEX diagnosis_search_vector_idx ON patients_patientdiagnosisdetails USING gin (search_vector);",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS diagnosis_search_vector_idx;",
+    "DROP TRIGGER IF EXISTS patients_patientdiagnosisdetails_search_vector_trigger ON patients_patientdiagnosisdetails;",
+    "DROP FUNCTION IF EXISTS patients_patientdiagnosisdetails_search_vector_update();",
+]
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0004_search_vector'),
+        ('organizations', '0002_remove_organization_logo_and_more'),
+        ('patients', '0005_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patientdiagnosisdetails',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='patientdiagnosisdetails',
+            index=models.Index(fields=['organization', '-created_at', '-pkid'], name='diagnosis_org_created_idx'),
+        ),
+        migrations.RunPython(run_statements(FORWARD_SQL), run_statements(REVERSE_SQL)),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:37
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_blood_pressure_components(apps, schema_editor):
+    from apps.patients.validators import parse_blood_pressure
+
+    VitalSign = apps.get_model('patients', 'VitalSign')
+    readings = VitalSign.objects.exclude(blood_pressure=None).exclude(blood_pressure='').only('pkid', 'blood_pressure')
+    batch = []
+    for vital_sign in readings.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        vital_sign.systolic, vital_sign.diastolic = parse_blood_pressure(vital_sign.blood_pressure)
+        batch.append(vital_sign)
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            VitalSign.objects.bulk_update(batch, ['systolic', 'diastolic'])
+            batch = []
+    if batch:
+        VitalSign.objects.bulk_update(batch, ['systolic', 'diastolic'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0007_patient_import_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vitalsign',
+            name='diastolic',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Diastolic blood pressure in mmHg', null=True),
+        ),
+        migrations.AddField(
+            model_name='vitalsign',
+            name='systolic',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Systolic blood pressure in mmHg', null=True),
+        ),
+        migrations.RunPython(backfill_blood_pressure_components, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vitalsign',
+            index=models.Index(fields=['systolic'], name='vitalsign_systolic_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vitalsign',
+            index=models.Index(fields=['diastolic'], name='vitalsign_diastolic_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_vital_sign_patient(apps, schema_editor):
+    VitalSign = apps.get_model('patients', 'VitalSign')
+    PatientDiagnosisDetails = apps.get_model('patients', 'PatientDiagnosisDetails')
+    VitalSign.objects.filter(patient__isnull=True).update(
+        patient=Subquery(
+            PatientDiagnosisDetails.objects.filter(pkid=OuterRef('patient_diagnoses_details_id')).values('patient_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0008_vitalsign_blood_pressure_components'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vitalsign',
+            name='patient',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vital_signs', to='patients.patient', verbose_name='Patient'),
+        ),
+        migrations.RunPython(backfill_vital_sign_patient, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vitalsign',
+            index=models.Index(fields=['patient', 'created_at'], name='vitalsign_patient_created_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:40
+
+import apps.patients.models
+import autoslug.fields
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_recorded_at(apps, schema_editor):
+    # Readings created before ingestion existed were recorded when their diagnosis was saved
+    VitalSign = apps.get_model('patients', 'VitalSign')
+    VitalSign.objects.update(recorded_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0009_vitalsign_patient'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vitalsign',
+            name='vitalsign_patient_created_idx',
+        ),
+        migrations.AddField(
+            model_name='vitalsign',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When the reading was taken'),
+        ),
+        migrations.RunPython(backfill_recorded_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='vitalsign',
+            name='patient_diagnoses_details',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='patients.patientdiagnosisdetails', verbose_name='Patient Diagnosis Details'),
+        ),
+        migrations.AlterField(
+            model_name='vitalsign',
+            name='slug',
+            field=autoslug.fields.AutoSlugField(editable=False, populate_from=apps.patients.models.vital_sign_slug_source, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='vitalsign',
+            index=models.Index(fields=['patient', 'recorded_at'], name='vitalsign_patient_recorded_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils import timezone
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import Q
 from apps.accounts.models import User
 from shared.models import TimeStampedUUID
 from django.core.validators import FileExtensionValidator
@@ -9,11 +12,11 @@ from imagekit.models import ProcessedImageField
 from imagekit.processors import ResizeToFill
 from django.utils.translation import gettext_lazy as _ 
 from shared.validators import validate_phone_number
-from shared.text_choices import Gender,MaritalStatus
+from shared.text_choices import Gender,MaritalStatus,ImportStatus,ImportFileFormat
 import uuid
-from apps.organizations.models import Organization
+from apps.organizations.models import Organization, OrganizationSequence
 from apps.caregivers.models import Caregiver
-from .validators import validate_blood_pressure
+from .validators import validate_blood_pressure, parse_blood_pressure
 from cloudinary.models import CloudinaryField
 
 
@@ -40,15 +43,32 @@ class Patient(TimeStampedUUID):
     emergency_phone_number=models.CharField(max_length=15,validators=[validate_phone_number],blank=True,null=True)
     slug = AutoSlugField(populate_from='user', unique=True)
     address = models.TextField(verbose_name=_("Patient's Address"),blank=True,null=True)
+    # Denormalized diagnosis summary, kept current by the PatientDiagnosisDetails signals
+    latest_diagnosis = models.ForeignKey('PatientDiagnosisDetails',on_delete=models.SET_NULL,related_name='+',blank=True,null=True,editable=False)
+    diagnosis_count = models.PositiveIntegerField(default=0,editable=False)
+    # Maintained by a database trigger, see the search_vector migration
+    search_vector = SearchVectorField(blank=True,null=True,editable=False)
 
     class Meta:
         verbose_name = _("Patient")
         verbose_name_plural = _("Patients")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=['organization', '-created_at', '-pkid'], name='patient_org_created_idx'),
+            models.Index(fields=['organization', '-created_at', '-pkid'], condition=Q(diagnosis_count__gt=0), name='patient_diagnosed_org_idx'),
+        ]
+
+    DIAGNOSIS_SUMMARY_FIELDS = ('latest_diagnosis', 'diagnosis_count')
 
     def save(self, *args, **kwargs):
         if not self.medical_id:
             self.medical_id = self.generate_unique_medical_id()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # The diagnosis summary is owned by the diagnosis signals, never write back a stale copy
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DIAGNOSIS_SUMMARY_FIELDS
+            ]
         super(Patient, self).save(*args, **kwargs)
 
     @property
@@ -63,17 +83,34 @@ class Patient(TimeStampedUUID):
         return f"Patient account for {self.first_name.title()} {self.last_name.title()}"
     
     def generate_unique_medical_id(self):
-        acronym = self.organization.acronym.upper()  
-        while True:
-            unique_id = str(uuid.uuid4()).replace('-', '')[:8].upper()
-            medical_id = f"{acronym}_{unique_id}"
-            if not Patient.objects.filter(medical_id=medical_id).exists():
-                return medical_id
+        return Patient.allocate_medical_ids(self.organization)[0]
+
+    @staticmethod
+    def allocate_medical_ids(organization, count=1):
+        """
+        Reserves `count` medical IDs for the organization in one query, e.g. ACME_0000002A.
+        Bulk operations should reserve a block up front instead of saving patients one at a time.
+        """
+        acronym = organization.acronym.upper()
+        values = OrganizationSequence.allocate(f"medical_id:{acronym}", count)
+        return [f"{acronym}_{value:08X}" for value in values]
     
     @property
     def full_name(self):
         return self.last_name + ' ' + self.first_name 
 
+    def refresh_diagnosis_summary(self):
+        """
+        Recomputes latest_diagnosis and diagnosis_count from the patient's diagnoses.
+        """
+        diagnoses = PatientDiagnosisDetails.objects.filter(patient_id=self.pkid)
+        self.latest_diagnosis = diagnoses.order_by('-created_at', '-pkid').first()
+        self.diagnosis_count = diagnoses.count()
+        Patient.objects.filter(pkid=self.pkid).update(
+            latest_diagnosis=self.latest_diagnosis,
+            diagnosis_count=self.diagnosis_count,
+        )
+
 
 
 class PatientMedicalRecord(TimeStampedUUID):
@@ -121,6 +158,9 @@ class PatientDiagnosisDetails(TimeStampedUUID):
     health_care_center = models.CharField(max_length=255,verbose_name=_("Health Care Center"))
     slug = AutoSlugField(populate_from='patient', unique=True)
     notes=models.TextField()
+    # Weighted over diagnoses, assessment, medication, health allergies and notes.
+    # Maintained by a database trigger, see the search_vector migration
+    search_vector = SearchVectorField(blank=True,null=True,editable=False)
 
     def __str__(self):
         return f"Patient Diagnosis Details {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -129,22 +169,83 @@ class PatientDiagnosisDetails(TimeStampedUUID):
         ordering = ['-created_at']
         verbose_name = "Patient Diagnosis Details"
         verbose_name_plural = "Patient Diagnosis Details"
+        indexes = [
+            models.Index(fields=['patient', '-created_at', '-pkid'], name='diagnosis_patient_created_idx'),
+            models.Index(fields=['organization', '-created_at', '-pkid'], name='diagnosis_org_created_idx'),
+        ]
+
+
+def vital_sign_slug_source(instance):
+    # Readings ingested from ward monitors have no diagnosis, their slug is derived from their own id
+    if instance.patient_diagnoses_details_id:
+        return instance.patient_diagnoses_details
+    return instance.id
 
 
 class VitalSign(TimeStampedUUID):
-    patient_diagnoses_details = models.OneToOneField(PatientDiagnosisDetails,on_delete=models.CASCADE,verbose_name=_('Patient Diagnosis Details'))
+    # Empty for readings pushed through the vital sign ingestion endpoint
+    patient_diagnoses_details = models.OneToOneField(PatientDiagnosisDetails,on_delete=models.CASCADE,blank=True,null=True,verbose_name=_('Patient Diagnosis Details'))
+    # Copied from the diagnosis on save so a patient's readings can be range scanned without a join
+    patient = models.ForeignKey(Patient,on_delete=models.CASCADE,related_name='vital_signs',blank=True,null=True,editable=False,verbose_name=_("Patient"))
+    recorded_at = models.DateTimeField(default=timezone.now,help_text="When the reading was taken")
     body_temperature = models.DecimalField(max_digits=4, decimal_places=1, help_text="Body temperature in degrees Celsius (°C)",blank=True, null=True)
     pulse_rate = models.PositiveIntegerField(help_text="Pulse rate in beats per minute (bpm)",blank=True, null=True)
     blood_pressure = models.CharField(max_length=7, validators=[validate_blood_pressure], help_text="Blood pressure in the format 'Systolic/Diastolic' (e.g., '120/80')",blank=True, null=True)
+    # Parsed from blood_pressure on save so threshold filters and aggregates run in SQL
+    systolic = models.PositiveSmallIntegerField(help_text="Systolic blood pressure in mmHg",blank=True, null=True, editable=False)
+    diastolic = models.PositiveSmallIntegerField(help_text="Diastolic blood pressure in mmHg",blank=True, null=True, editable=False)
     blood_oxygen = models.DecimalField(max_digits=4, decimal_places=1, help_text="Blood oxygen level as a percentage (%)",blank=True, null=True)
     respiration_rate = models.PositiveIntegerField(help_text="Respiration rate in breaths per minute (bpm)",blank=True, null=True)
     weight = models.DecimalField(max_digits=5, decimal_places=2, help_text="Weight of the patient in kilograms (kg)",blank=True, null=True)
-    slug = AutoSlugField(populate_from='patient_diagnoses_details', unique=True)
+    slug = AutoSlugField(populate_from=vital_sign_slug_source, unique=True)
 
     def __str__(self):
         return f"Vital Signs recorded on {self.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
 
+    def save(self, *args, **kwargs):
+        if self.patient_id is None and self.patient_diagnoses_details_id:
+            self.patient_id = self.patient_diagnoses_details.patient_id
+        self.systolic, self.diastolic = parse_blood_pressure(self.blood_pressure)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'blood_pressure' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'systolic', 'diastolic'}
+        super(VitalSign, self).save(*args, **kwargs)
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Vital Sign"
         verbose_name_plural = "Vital Signs"
+        indexes = [
+            models.Index(fields=['patient', 'recorded_at'], name='vitalsign_patient_recorded_idx'),
+            models.Index(fields=['systolic'], name='vitalsign_systolic_idx'),
+            models.Index(fields=['diastolic'], name='vitalsign_diastolic_idx'),
+        ]
+
+
+class PatientImportJob(TimeStampedUUID):
+    """
+    A bulk patient import from an uploaded CSV or JSONL file, processed in chunks by a Celery task.
+    Progress counters are updated after every chunk so clients can poll the job.
+    """
+    organization = models.ForeignKey(Organization,on_delete=models.CASCADE,verbose_name=_("Organization"))
+    created_by = models.ForeignKey(User,on_delete=models.SET_NULL,blank=True,null=True,verbose_name=_("Created By"))
+    file = models.FileField(upload_to='patient_imports/')
+    file_format = models.CharField(max_length=10,choices=ImportFileFormat.choices)
+    status = models.CharField(max_length=20,choices=ImportStatus.choices,default=ImportStatus.PENDING)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    # Row level errors as [{"row": <line number>, "errors": {...}}], capped at MAX_ERRORS entries
+    errors = models.JSONField(default=list,blank=True)
+    error_message = models.TextField(blank=True,null=True)
+    completed_at = models.DateTimeField(blank=True,null=True)
+
+    MAX_ERRORS = 1000
+
+    def __str__(self):
+        return f"Patient import {self.id} for {self.organization.name} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Patient Import Job"
+        verbose_name_plural = "Patient Import Jobs"
@@ -2,6 +2,7 @@ from rest_framework.permissions import BasePermission
 from  apps.accounts.models import User
 from rest_framework.exceptions import PermissionDenied
 from apps.accounts.user_roles import UserRoles
+from apps.accounts.tenancy import get_request_organization
 
 
 class IsPatient(BasePermission):
@@ -27,11 +28,8 @@ class IsAllowedToUpdatePatientRegistrationDetails(BasePermission):
         if user.role == UserRoles.PATIENT and obj.user == user:
             return True
 
-        if user.role == UserRoles.ORGANIZATION and obj.organization == user.organization:
-            return True
-        
-
-        if user.role == UserRoles.CAREGIVER and user.caregiver.organization == obj.organization:
+        organization = get_request_organization(request)
+        if organization is not None and obj.organization_id == organization.pkid:
             return True
 
         # return False 
@@ -1,4 +1,4 @@
-from .models import Patient,PatientMedicalRecord,PatientDiagnosisDetails
+from .models import Patient,PatientMedicalRecord,PatientDiagnosisDetails,PatientImportJob
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import VitalSign
@@ -7,11 +7,15 @@ from django.db import IntegrityError, transaction
 from django.contrib.auth.password_validation import validate_password
 from django.core.validators import validate_email as django_validate_email
 from apps.accounts.user_roles import UserRoles
-from .exceptions import PatientNotificationFailedException
+from apps.accounts.tenancy import require_request_organization
+from shared.text_choices import ImportFileFormat
 import logging
-from .tasks import send_patient_account_creation_notification_email
+from datetime import timedelta
+from django.utils import timezone
+from .tasks import queue_patient_welcome_emails
 from .mixins import PatientRepresentationMixin
 from django.core.validators import RegexValidator
+from shared.serializers import CloudinaryValueField, ValuesSerializer
 
 
 logger = logging.getLogger(__name__)
@@ -25,12 +29,42 @@ class PatientSerializer(PatientRepresentationMixin,serializers.ModelSerializer):
 
     class Meta:
         model = Patient
-        exclude=['user']
+        exclude=['user', 'latest_diagnosis', 'diagnosis_count', 'search_vector']
     
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         return self.add_user_fields_to_representation(instance, representation)
 
+
+class PatientListSerializer(ValuesSerializer):
+    """
+    Read path of the patient lists, renders the same fields as PatientSerializer from values() rows.
+    """
+    pkid = serializers.IntegerField()
+    id = serializers.UUIDField()
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    medical_id = serializers.CharField()
+    date_of_birth = serializers.DateField()
+    marital_status = serializers.CharField()
+    profile_picture = CloudinaryValueField()
+    gender = serializers.CharField()
+    phone_number = serializers.CharField()
+    emergency_phone_number = serializers.CharField()
+    slug = serializers.CharField()
+    address = serializers.CharField()
+    organization = serializers.IntegerField(source='organization_id')
+    email = serializers.EmailField(source='user.email')
+    role = serializers.CharField(source='user.role')
+    active = serializers.BooleanField(source='user.is_active')
+    verified = serializers.BooleanField(source='user.is_verified')
+
+    class Meta:
+        model = Patient
+
+
 class PatientMedicalRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = PatientMedicalRecord
@@ -111,21 +145,12 @@ class OrganizationRegisterPatientSerializer(PatientRepresentationMixin,BasePatie
             user = User.objects.create_user(**user_data)
             patient = Patient.objects.create(
                 user=user,
-                organization=self.context['request'].user.organization,
+                organization=require_request_organization(self.context['request']),
                 **validated_data
             )
             PatientMedicalRecord.objects.create(patient=patient, **medical_record_data)
 
-            try:
-                # Send password reset link instead of plain password
-                send_patient_account_creation_notification_email.delay(
-                    patient_email=user.email,
-                    patient_full_name=f"{patient.first_name} {patient.last_name}",
-                    organization_name=self.context['request'].user.organization.name,
-                    patient_id=str(patient.id)  # For generating reset link
-                )
-            except Exception as e:
-                raise PatientNotificationFailedException(f"Patient created but failed to send notification: {str(e)}")
+            queue_patient_welcome_emails([patient])
 
         return patient
 
@@ -136,6 +161,51 @@ class OrganizationRegisterPatientSerializer(PatientRepresentationMixin,BasePatie
         return representation
 
 
+class PatientImportRowSerializer(BasePatientSerializer):
+    """
+    Validates one row of a bulk patient import.
+    Email uniqueness is checked once per chunk by the importer instead of once per row.
+    """
+    email = serializers.EmailField()
+
+    class Meta(BasePatientSerializer.Meta):
+        fields = [
+            field for field in BasePatientSerializer.Meta.fields if field not in ('id', 'medical_id', 'profile_picture')
+        ] + ['email']
+
+    def validate_email(self, value):
+        return User.objects.normalize_email(value).lower()
+
+
+class PatientImportJobSerializer(serializers.ModelSerializer):
+    """
+    Accepts a CSV or JSONL upload for a bulk patient import and reports the job's progress.
+    """
+    file = serializers.FileField(write_only=True)
+
+    class Meta:
+        model = PatientImportJob
+        fields = [
+            'id', 'file', 'file_format', 'status', 'processed_rows', 'created_count', 'failed_count',
+            'errors', 'error_message', 'created_at', 'completed_at'
+        ]
+        read_only_fields = [
+            'id', 'file_format', 'status', 'processed_rows', 'created_count', 'failed_count',
+            'errors', 'error_message', 'created_at', 'completed_at'
+        ]
+
+    def validate_file(self, value):
+        extension = value.name.rsplit('.', 1)[-1].lower() if '.' in value.name else ''
+        if extension not in ImportFileFormat.values:
+            raise serializers.ValidationError("Import file must be a .csv or .jsonl file.")
+        return value
+
+    def create(self, validated_data):
+        file = validated_data['file']
+        validated_data['file_format'] = file.name.rsplit('.', 1)[-1].lower()
+        return super().create(validated_data)
+
+
 class PatientDetailSerializer(PatientRepresentationMixin, BasePatientSerializer):
     # medical_record = PatientMedicalRecordSerializer(source='patientmedicalrecord', read_only=True)
     medical_record = PatientMedicalRecordSerializer(required=False, partial=True)
@@ -260,36 +330,35 @@ class PatientDiagnosisSerializer(serializers.ModelSerializer):
     class Meta:
         model = Patient
         fields = ['id', 'patient_name', 'medical_id', 'diagnoses', 'patient_profile_picture', 'address', 'diagnosis_count']
+        # Read by get_diagnoses on the list page
+        related_fields = ['latest_diagnosis']
 
     def get_diagnoses(self, obj):
         """
         Get diagnosis details for a specific patient based on view type.
         """
         view_type = self.context.get('view_type', 'all')
-        
-        if hasattr(obj, 'patientdiagnosisdetails_set'):
-            diagnoses = obj.patientdiagnosisdetails_set.all()
-        else:
-            diagnoses = PatientDiagnosisDetails.objects.filter(patient=obj).order_by('-created_at')
 
         if view_type == 'latest':
-            # Return only the latest diagnosis for list page
-            latest_diagnosis = diagnoses.first()
+            # Return only the latest diagnosis for list page, read from the denormalized pointer
+            latest_diagnosis = obj.latest_diagnosis
             if latest_diagnosis:
                 return DiagnosisSerializer([latest_diagnosis], many=True, context=self.context).data
             return []
-        else:
-            # Return all diagnoses for history page
-            return DiagnosisSerializer(diagnoses, many=True, context=self.context).data
+
+        diagnoses = self.context.get('diagnoses_queryset')
+        if diagnoses is None:
+            diagnoses = PatientDiagnosisDetails.objects.filter(patient=obj).order_by('-created_at')
+
+        # Return all diagnoses for history page
+        return DiagnosisSerializer(diagnoses, many=True, context=self.context).data
 
     def get_diagnosis_count(self, obj):
         """
         Get total count of diagnoses for this patient.
         Useful for showing "X diagnoses" in the UI.
         """
-        if hasattr(obj, 'patientdiagnosisdetails_set'):
-            return obj.patientdiagnosisdetails_set.count()
-        return PatientDiagnosisDetails.objects.filter(patient=obj).count()
+        return obj.diagnosis_count
 
     def get_patient_profile_picture(self, obj):
         """
@@ -337,6 +406,8 @@ class SingleDiagnosisSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at'
         ]
+        # Read by get_vital_signs
+        related_fields = ['vitalsign']
 
     def get_patient_profile_picture(self, obj):
         """
@@ -367,6 +438,77 @@ class SingleDiagnosisSerializer(serializers.ModelSerializer):
         except VitalSign.DoesNotExist:
             return None
 
+class DiagnosisSearchResultSerializer(serializers.ModelSerializer):
+    """
+    Serializer for diagnosis search hits.
+    `rank` and `headline` are only present when a full-text search is active, otherwise they are null.
+    """
+    patient_name = serializers.CharField(source='patient.full_name', read_only=True)
+    patient_medical_id = serializers.CharField(source='patient.medical_id', read_only=True)
+    caregiver_name = serializers.CharField(source='caregiver.full_name_with_role', read_only=True)
+    caregiver_id = serializers.CharField(source='caregiver.id', read_only=True)
+    rank = serializers.SerializerMethodField()
+    headline = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PatientDiagnosisDetails
+        fields = [
+            'id',
+            'patient_name',
+            'patient_medical_id',
+            'caregiver_name',
+            'caregiver_id',
+            'assessment',
+            'diagnoses',
+            'medication',
+            'health_care_center',
+            'rank',
+            'headline',
+            'created_at',
+        ]
+
+    def get_rank(self, obj):
+        return getattr(obj, 'search_rank', None)
+
+    def get_headline(self, obj):
+        return getattr(obj, 'headline', None)
+
+
+class VitalSignSeriesQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the vital sign series endpoint.
+    Defaults to daily buckets over the last 30 days (hourly: 2 days, weekly: 26 weeks) and rejects ranges that would produce more than MAX_BUCKETS buckets.
+    """
+    BUCKET_SIZES = {'hour': timedelta(hours=1), 'day': timedelta(days=1), 'week': timedelta(weeks=1)}
+    DEFAULT_RANGES = {'hour': timedelta(days=2), 'day': timedelta(days=30), 'week': timedelta(weeks=26)}
+    METRICS = ['body_temperature', 'pulse_rate', 'systolic', 'diastolic', 'blood_oxygen', 'respiration_rate', 'weight']
+    MAX_BUCKETS = 400
+
+    bucket = serializers.ChoiceField(choices=list(BUCKET_SIZES), default='day')
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    metrics = serializers.CharField(required=False, help_text="Comma separated metrics, defaults to all.")
+
+    def validate_metrics(self, value):
+        metrics = [metric.strip() for metric in value.split(',') if metric.strip()]
+        unknown = [metric for metric in metrics if metric not in self.METRICS]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown metrics: {', '.join(unknown)}. Choose from {', '.join(self.METRICS)}.")
+        return metrics or self.METRICS
+
+    def validate(self, attrs):
+        end = attrs.get('end') or timezone.now()
+        start = attrs.get('start') or end - self.DEFAULT_RANGES[attrs['bucket']]
+        if start >= end:
+            raise serializers.ValidationError("start must be before end.")
+        if (end - start) / self.BUCKET_SIZES[attrs['bucket']] > self.MAX_BUCKETS:
+            raise serializers.ValidationError(
+                f"The range spans more than {self.MAX_BUCKETS} {attrs['bucket']} buckets, use a larger bucket or a shorter range."
+            )
+        attrs.update(start=start, end=end, metrics=attrs.get('metrics') or self.METRICS)
+        return attrs
+
+
 class VitalSignSerializer(serializers.ModelSerializer):
     class Meta:
         model = VitalSign
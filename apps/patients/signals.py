@@ -0,0 +1,32 @@
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Patient, PatientDiagnosisDetails
+
+
+@receiver(post_save, sender=PatientDiagnosisDetails)
+def update_patient_diagnosis_summary_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Keeps Patient.latest_diagnosis and Patient.diagnosis_count current when a diagnosis is written.
+    A new diagnosis is always the latest one, so creation is a single UPDATE without a recount.
+    """
+    if raw:
+        return
+
+    if created:
+        Patient.objects.filter(pkid=instance.patient_id).update(
+            latest_diagnosis=instance,
+            diagnosis_count=F('diagnosis_count') + 1,
+        )
+    else:
+        instance.patient.refresh_diagnosis_summary()
+
+
+@receiver(post_delete, sender=PatientDiagnosisDetails)
+def update_patient_diagnosis_summary_on_delete(sender, instance, **kwargs):
+    """
+    Recomputes the patient's diagnosis summary after one of their diagnoses is removed.
+    """
+    patient = Patient.objects.filter(pkid=instance.patient_id).first()
+    if patient:
+        patient.refresh_diagnosis_summary()
@@ -1,38 +1,70 @@
+from datetime import datetime, timedelta, timezone
 from celery import shared_task
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.conf import settings
-import logging
+from apps.accounts.tasks import build_password_reset_link
+from apps.notifications.outbox import queue_emails
 
-logger = logging.getLogger(__name__)
 
-@shared_task(bind=True, max_retries=3)
-def send_patient_account_creation_notification_email(self, patient_email, patient_full_name, organization_name, patient_id):
+def build_patient_welcome_email(patient_email, patient_full_name, organization_name, set_password_url=None):
     """
-    Sends a welcome email to a patient after their account is successfully created.
+    Builds the welcome email sent to a patient after their account is created.
+    Accounts created without a password get `set_password_url` to choose one instead of the login link.
     """
-    try:
-        login_url = f"{settings.REACT_FRONTEND_URL}/auth/login"
-
-        context = {
-            'organization_name': organization_name,
-            'patient_email': patient_email,
-            'patient_full_name': patient_full_name,
-            'login_url': login_url,
-        }
-
-        subject = f"Welcome to {organization_name}, {patient_full_name}!"
-        html_message = render_to_string('patients/mails/patient_welcome_mail.html', context)
-
-        email = EmailMessage(
-            subject=subject,
-            body=html_message,
-            from_email=settings.EMAIL_HOST_USER,
-            to=[patient_email],
+    login_url = f"{settings.REACT_FRONTEND_URL}/auth/login"
+
+    context = {
+        'organization_name': organization_name,
+        'patient_email': patient_email,
+        'patient_full_name': patient_full_name,
+        'login_url': login_url,
+        'set_password_url': set_password_url,
+        'set_password_days': getattr(settings, 'PATIENT_SET_PASSWORD_LINK_DAYS', 7),
+    }
+
+    subject = f"Welcome to {organization_name}, {patient_full_name}!"
+    html_message = render_to_string('patients/mails/patient_welcome_mail.html', context)
+
+    email = EmailMessage(
+        subject=subject,
+        body=html_message,
+        from_email=settings.EMAIL_HOST_USER,
+        to=[patient_email],
+    )
+    email.content_subtype = "html"
+    return email
+
+
+def queue_patient_welcome_emails(patients, set_password=False):
+    """
+    Queues the welcome email of each patient in the outbox, within the caller's transaction.
+    Patients need their user and organization loaded. With `set_password`, for accounts created without
+    a password, the email links to the password reset page instead of the login page.
+    """
+    issued_at = datetime.now(timezone.utc)
+    lifetime = timedelta(days=getattr(settings, 'PATIENT_SET_PASSWORD_LINK_DAYS', 7))
+    queue_emails([
+        (
+            f"patient-welcome:{patient.id}",
+            build_patient_welcome_email(
+                patient_email=patient.user.email,
+                patient_full_name=f"{patient.first_name} {patient.last_name}",
+                organization_name=patient.organization.name,
+                set_password_url=build_password_reset_link(patient.user, issued_at, lifetime) if set_password else None,
+            ),
         )
-        email.content_subtype = "html"
-        email.send(fail_silently=False)
+        for patient in patients
+    ])
+
+
+@shared_task
+def process_patient_import(job_id):
+    """
+    Runs a bulk patient import job.
+    """
+    from .imports import PatientImporter
+    from .models import PatientImportJob
 
-    except Exception as e:
-        logger.error(f"Failed to send welcome email to {patient_email}: {str(e)}")
-        self.retry(countdown=60, exc=e)
\ No newline at end of file
+    job = PatientImportJob.objects.select_related('organization').get(id=job_id)
+    PatientImporter(job).run()
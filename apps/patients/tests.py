@@ -1,3 +1,54 @@
 from django.test import TestCase
+from apps.accounts.models import User
+from apps.accounts.user_roles import UserRoles
+from apps.organizations.models import Organization
+from .ingestion import validate_readings
+from .models import Patient
 
-# Create your tests here.
+
+class ValidateReadingsTests(TestCase):
+    """
+    Malformed readings are reported as errors on their row, never as a failure of the whole batch.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(email='admin@lagos.com', password='Test-pass-2025', role=UserRoles.ORGANIZATION)
+        cls.organization = Organization.objects.create(user=user, name='Lagos', acronym='LAG')
+        cls.patient = Patient.objects.create(
+            user=User.objects.create_user(email='patient@example.com', password='Test-pass-2025', role=UserRoles.PATIENT),
+            organization=cls.organization, first_name='Tunde', last_name='Eze',
+        )
+
+    def validate(self, **fields):
+        reading = {'medical_id': self.patient.medical_id, 'recorded_at': '2025-01-01T08:00:00Z', **fields}
+        return validate_readings([reading], self.organization)
+
+    def test_valid_reading(self):
+        rows, errors = self.validate(pulse_rate=72)
+        self.assertEqual(errors, [])
+        self.assertEqual(rows[0]['pulse_rate'], 72)
+
+    def test_non_finite_numbers_are_row_errors(self):
+        for value in (float('inf'), float('-inf'), float('nan')):
+            for metric in ('pulse_rate', 'body_temperature'):
+                with self.subTest(metric=metric, value=value):
+                    rows, errors = self.validate(**{metric: value})
+                    self.assertEqual(rows, [])
+                    self.assertIn(metric, errors[0]['errors'])
+
+    def test_blood_pressure_is_matched_whole_and_normalized(self):
+        for value in ('120/800\n', '120/80\n', ' 120/80', '120/80/1'):
+            with self.subTest(value=value):
+                rows, errors = self.validate(blood_pressure=value)
+                self.assertEqual(rows, [])
+                self.assertIn('blood_pressure', errors[0]['errors'])
+
+        rows, errors = self.validate(blood_pressure='120/080')
+        self.assertEqual(errors, [])
+        self.assertEqual((rows[0]['blood_pressure'], rows[0]['systolic'], rows[0]['diastolic']), ('120/80', 120, 80))
+
+    def test_non_string_medical_id_is_a_row_error(self):
+        rows, errors = validate_readings([{'medical_id': ['x'], 'pulse_rate': 72}], self.organization)
+        self.assertEqual(rows, [])
+        self.assertEqual(errors[0]['errors']['medical_id'], ["Enter a valid medical ID."])
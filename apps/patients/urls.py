@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 # from .views import (PatientUpdateRegistrationDetailsView,UpdatePatientBasicInfoView,PatientDetailByMedicalIDView,PatientDiagnosisDetailsRecordsView
 #                     ,PatientDiagnosisListView,CreatePatientDiagnosisWithVitalSignView,OrganizationUpdatePatientRegistrationDetailsView)
 from .views import (LatestPatientsView,PatientViewSet,TogglePatientStatusView,RegisterPatientView,PatientRegistrationDetailsByMedicalIDView,
-PatientDiagnosisListView,PatientDiagnosisHistoryView,SingleDiagnosisDetailView,CreatePatientDiagnosisWithVitalSignView,UpdatePatientDiagnosisWithVitalSignView,PatientBasicInfoView)
+PatientImportView,PatientImportJobDetailView,PatientDiagnosisListView,PatientDiagnosisHistoryView,DiagnosisSearchView,SingleDiagnosisDetailView,CreatePatientDiagnosisWithVitalSignView,UpdatePatientDiagnosisWithVitalSignView,PatientBasicInfoView,
+PatientExportView,DiagnosisExportView,VitalSignExportView,PatientVitalSignSeriesView,VitalSignIngestView)
 # PatientDiagnosisView)
 
 router = DefaultRouter()
@@ -16,13 +17,21 @@ urlpatterns = [
    path('latest-patients/', LatestPatientsView.as_view(),name='latest-patients'),
    path('toggle-patient-status/<str:slug>/', TogglePatientStatusView.as_view(),name='toggle-patient-status'),
    path('register-new-patient/', RegisterPatientView.as_view(), name='register-new-patient'),
+   path('bulk-import-patients/', PatientImportView.as_view(), name='bulk-import-patients'),
+   path('bulk-import-patients/<uuid:id>/', PatientImportJobDetailView.as_view(), name='bulk-import-patients-detail'),
    path('patient-registration-details-by-medical-id/<str:medical_id>/', PatientRegistrationDetailsByMedicalIDView.as_view(), name='register-new-patient'),
    path('patients-diagnoses/', PatientDiagnosisListView.as_view(), name='patient-diagnosis-list'),
    path('patient-diagnoses-history/<str:medical_id>/', PatientDiagnosisHistoryView.as_view(), name='patient-diagnosis-history'),
+   path('diagnoses-search/', DiagnosisSearchView.as_view(), name='diagnosis-search'),
    path('patient-diagnoses-detail/<uuid:id>/', SingleDiagnosisDetailView.as_view(), name='diagnosis-detail'),
+   path('vital-signs-series/<str:medical_id>/', PatientVitalSignSeriesView.as_view(), name='vital-signs-series'),
+   path('vital-signs-ingest/', VitalSignIngestView.as_view(), name='vital-signs-ingest'),
    path('create-patient-health-record/<str:patient_id>/',CreatePatientDiagnosisWithVitalSignView.as_view(),name='create-patient-health-record'),
    path('update-patient-health-record/<str:id>/',UpdatePatientDiagnosisWithVitalSignView.as_view(),name='update-patient-health-record'),
    path('patient-basic-info/<str:id>/',PatientBasicInfoView.as_view(),name='patient-basic-info'),
+   path('export-patients/', PatientExportView.as_view(), name='export-patients'),
+   path('export-diagnoses/', DiagnosisExportView.as_view(), name='export-diagnoses'),
+   path('export-vital-signs/', VitalSignExportView.as_view(), name='export-vital-signs'),
 
    
 ]
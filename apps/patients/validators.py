@@ -1,9 +1,23 @@
 import re
 from django.core.exceptions import ValidationError
 
+# Matched with fullmatch, `$` would also accept a trailing newline
+BLOOD_PRESSURE_PATTERN = re.compile(r'(\d{2,3})/(\d{2,3})')
+
 
 def validate_blood_pressure(value):
-    if not re.match(r'^\d{2,3}/\d{2,3}$', value):
+    if not BLOOD_PRESSURE_PATTERN.fullmatch(value):
         raise ValidationError(
             'Enter a valid blood pressure in the format "120/80".'
-        )
\ No newline at end of file
+        )
+
+
+def parse_blood_pressure(value):
+    """
+    Splits a blood pressure reading such as "120/80" into (systolic, diastolic) integers.
+    Returns (None, None) when the value is empty or malformed.
+    """
+    match = BLOOD_PRESSURE_PATTERN.fullmatch(value or '')
+    if not match:
+        return None, None
+    return int(match.group(1)), int(match.group(2))
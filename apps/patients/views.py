@@ -1,83 +1,76 @@
 from django.shortcuts import render,get_object_or_404
+from django.http import Http404
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import ListModelMixin
-from .serializers import OrganizationRegisterPatientSerializer,PatientDetailSerializer,PatientSerializer,DiagnosisSerializer,PatientDiagnosisWithVitalSignSerializer,PatientBasicInfoSerializer
+from .serializers import OrganizationRegisterPatientSerializer,PatientDetailSerializer,PatientListSerializer,PatientSerializer,DiagnosisSerializer,PatientDiagnosisWithVitalSignSerializer,PatientBasicInfoSerializer,DiagnosisSearchResultSerializer,PatientImportJobSerializer,VitalSignSeriesQuerySerializer
 # from .serializers import PatientBasicInfoSerializer, PatientDetailSerializer, UpdatePatientRegistrationDetailsSerializer,UpdatePatientBasicInfoSerializer,PatientSerializer,PatientDiagnosisDetailsSerializer,PatientDiagnosisListSerializer,CreatePatientDiagnosisWithVitalSignSerializer,OrganizationUpdatePatientRegistrationDetailsSerializer
-from .models import Patient, PatientDiagnosisDetails
+from .models import Patient, PatientDiagnosisDetails, PatientImportJob, VitalSign
+from .tasks import process_patient_import
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import UpdateAPIView,RetrieveAPIView,ListAPIView,CreateAPIView
-from .exceptions import PatientNotFoundException,PatientMedicalIDNotFoundException
+from .exceptions import PatientNotFoundException,PatientMedicalIDNotFoundException,PatientImportJobNotFoundException
 from shared.validators import validate_uuid
 from rest_framework.exceptions import ValidationError
 from .permissions import IsAllowedToUpdatePatientRegistrationDetails,IsPatient
 from apps.accounts.user_roles import UserRoles
+from apps.accounts.tenancy import get_request_organization, require_request_organization
 from rest_framework.exceptions import PermissionDenied,NotFound
 from apps.organizations.permissions import IsOrganization
 from apps.caregivers.permissions import IsCaregiver
-from django.db.models import Prefetch   
+from django.db.models import Avg, Count, Func, Max, Min, Prefetch, TextField, Value
+from django.db.models.functions import Trunc
+from django.contrib.postgres.search import SearchHeadline
 from apps.caregivers.models import Caregiver
 from rest_framework.response import Response
 from rest_framework import status
 from apps.caregivers.exceptions import CaregiverNotFoundException
-from django.db import transaction
+from django.db import connection, transaction
 from rest_framework.mixins import RetrieveModelMixin,UpdateModelMixin,DestroyModelMixin,ListModelMixin
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from shared.pagination import StandardResultsSetPagination
+from shared.pagination import KeysetPagination
+from shared.search import FullTextSearchFilter
+from .filters import DiagnosisSearchFilterSet, VitalSignFilterSet
+from .ingestion import MAX_INGEST_BATCH_SIZE, ingest_readings, validate_readings
+from shared.exports import StreamingExportView
+from shared.mixins import SerializerRelationsMixin, ValuesListMixin
 from rest_framework import generics
 
-
+# Free-text clinical fields of PatientDiagnosisDetails, indexed by the 0006_diagnosis_search_vector migration
+DIAGNOSIS_SEARCH_FIELDS = ['diagnoses', 'assessment', 'medication', 'health_allergies', 'notes']
+DIAGNOSIS_SEARCH_CONFIG = 'english'
 
 
 # Create your views here.
-class LatestPatientsView(ListAPIView):
+class LatestPatientsView(ValuesListMixin,ListAPIView):
     """
       Returns a list of top 5 latest patients associated with the organization or logged in caregiver organization.
     """
     # permission_classes = [IsAuthenticated, IsOrganizationOrCaregiver]
     permission_classes = [IsAuthenticated, IsOrganization]
     serializer_class = PatientSerializer
+    list_serializer_class = PatientListSerializer
 
     def get_queryset(self):
-        user = self.request.user
-
-        if user.role == UserRoles.ORGANIZATION:
-            organization = user.organization
-        elif user.role == UserRoles.CAREGIVER:
-            organization = user.caregiver.organization
-        else:
-            raise NotFound("Organization not found for user.")
-
-        if organization is None:
-            raise NotFound("Organization not found for user.")
+        organization = require_request_organization(self.request)
 
         return Patient.objects.filter(organization=organization,user__is_verified=True,user__is_active=True,user__role=UserRoles.PATIENT)[:5]
 
-class PatientViewSet(ListModelMixin,RetrieveModelMixin,UpdateModelMixin,DestroyModelMixin,viewsets.GenericViewSet):
+class PatientViewSet(ValuesListMixin,ListModelMixin,RetrieveModelMixin,UpdateModelMixin,DestroyModelMixin,viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated, IsOrganization]
     serializer_class = PatientSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    list_serializer_class = PatientListSerializer
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     search_fields = ['first_name', 'last_name', 'medical_id']
     filterset_fields = ['medical_id', 'user__is_active']
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetPagination
     lookup_field = 'slug'
 
     def get_queryset(self):
-        user = self.request.user
+        organization = require_request_organization(self.request)
 
-        if user.role == UserRoles.ORGANIZATION:
-            organization = user.organization
-        elif user.role == UserRoles.CAREGIVER:
-            organization = user.caregiver.organization
-
-        else:
-            raise NotFound("Organization not found for user.")
-
-        if organization is None:
-            raise NotFound("Organization not found for user.")
-
-        return Patient.objects.filter(organization=organization,user__is_verified=True,user__is_active=True,user__role=UserRoles.PATIENT)
+        return Patient.objects.filter(organization=organization,user__is_verified=True,user__is_active=True,user__role=UserRoles.PATIENT).select_related('user')
 
 class TogglePatientStatusView(UpdateAPIView):
     """
@@ -90,7 +83,7 @@ class TogglePatientStatusView(UpdateAPIView):
 
     def get_object(self):
         patient_slug = self.kwargs['slug']
-        patient = Patient.objects.filter(slug=patient_slug, organization=self.request.user.organization).first()
+        patient = Patient.objects.filter(slug=patient_slug, organization=require_request_organization(self.request)).first()
         if not patient:
             raise PatientNotFoundException()
         return patient
@@ -98,7 +91,9 @@ class TogglePatientStatusView(UpdateAPIView):
     def update(self, request, *args, **kwargs):
         patient = self.get_object()
         patient.user.is_active = not patient.user.is_active
-        patient.user.save() 
+        # The organization statistics are updated by a signal and must commit together with the toggle
+        with transaction.atomic():
+            patient.user.save()
         serializer = PatientSerializer(patient,many=False)
         return Response({ "message": "Patient status toggled successfully", "data": serializer.data},status=status.HTTP_200_OK)
 
@@ -116,6 +111,39 @@ class RegisterPatientView(CreateAPIView):
         with transaction.atomic():
             serializer.save()
 
+class PatientImportView(CreateAPIView):
+    """
+    Starts a bulk patient import from an uploaded CSV or JSONL file.
+    The file is processed in the background, poll the returned job for progress and row errors.
+    """
+    serializer_class = PatientImportJobSerializer
+    permission_classes = [IsAuthenticated, IsOrganization]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            job = serializer.save(organization=require_request_organization(request), created_by=request.user)
+            transaction.on_commit(lambda: process_patient_import.delay(str(job.id)))
+        return Response({"message": "Patient import started", "data": serializer.data}, status=status.HTTP_202_ACCEPTED)
+
+class PatientImportJobDetailView(RetrieveAPIView):
+    """
+    Returns the status, progress counters and row errors of a bulk patient import.
+    """
+    serializer_class = PatientImportJobSerializer
+    permission_classes = [IsAuthenticated, IsOrganization]
+    lookup_field = 'id'
+
+    def get_queryset(self):
+        return PatientImportJob.objects.filter(organization=require_request_organization(self.request))
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            raise PatientImportJobNotFoundException()
+
 class PatientRegistrationDetailsByMedicalIDView(generics.RetrieveUpdateAPIView):
     """
     Retrieve detailed information for a specific patient by medical_id.
@@ -130,15 +158,7 @@ class PatientRegistrationDetailsByMedicalIDView(generics.RetrieveUpdateAPIView):
         """
         Filter patients to only those belonging to the organization of the authenticated user or caregiver.
         """
-        user = self.request.user
-        if user.role == UserRoles.ORGANIZATION:
-            organization = user.organization
-        elif user.role == UserRoles.CAREGIVER:
-            organization = user.caregiver.organization
-        else:
-            raise PermissionDenied("You do not have permission to access this resource.")
-        if organization is None:
-            raise NotFound("Organization not found for user.")
+        organization = require_request_organization(self.request)
         return Patient.objects.filter(organization=organization).select_related('user').prefetch_related('patientmedicalrecord')
 
     def get_object(self):
@@ -207,30 +227,24 @@ from rest_framework.views import APIView
 from .serializers import PatientDiagnosisSerializer, SingleDiagnosisSerializer
 
 # Alternative approach using separate endpoints (RECOMMENDED)
-class PatientDiagnosisListView(ListAPIView):
+class PatientDiagnosisListView(SerializerRelationsMixin,ListAPIView):
     """
     Page 1: List of patients with their latest diagnosis only
     GET /api/patients/diagnoses/
     """
     serializer_class = PatientDiagnosisSerializer
     permission_classes = [IsAuthenticated, IsOrganization]
-    pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     search_fields = ['first_name', 'last_name', 'medical_id']
     ordering_fields = ['created_at', 'first_name', 'last_name']
     ordering = ['-created_at']
 
     def get_queryset(self):
+        organization = require_request_organization(self.request)
         return (
             Patient.objects
-            .prefetch_related(
-                Prefetch(
-                    'patientdiagnosisdetails_set',
-                    queryset=PatientDiagnosisDetails.objects.select_related('caregiver').order_by('-created_at')
-                )
-            )
-            .filter(patientdiagnosisdetails__isnull=False)
-            .distinct()
+            .filter(organization=organization, diagnosis_count__gt=0)
             .order_by('-created_at')
         )
 
@@ -249,11 +263,19 @@ class PatientDiagnosisListView(ListAPIView):
 
 class PatientDiagnosisHistoryView(generics.RetrieveAPIView):
     """
-    Get patient details with all their diagnoses
+    Get patient details with their diagnoses, paginated by keyset over (created_at, pkid)
     GET /api/patients/{medical_id}/diagnoses/
     """
     serializer_class = PatientDiagnosisSerializer
     permission_classes = [IsAuthenticated, IsOrganization]
+    pagination_class = KeysetPagination
+    filter_backends = [FullTextSearchFilter, OrderingFilter]
+    search_fields = DIAGNOSIS_SEARCH_FIELDS
+    search_config = DIAGNOSIS_SEARCH_CONFIG
+    search_query_type = 'websearch'
+    trigram_search_fields = []
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
     lookup_field = 'medical_id'
     lookup_url_kwarg = 'medical_id'
 
@@ -261,16 +283,7 @@ class PatientDiagnosisHistoryView(generics.RetrieveAPIView):
         """
         Return patients filtered by organization.
         """
-        user = self.request.user
-        if user.role == UserRoles.ORGANIZATION:
-            organization = user.organization
-        elif user.role == UserRoles.CAREGIVER:
-            organization = user.caregiver.organization
-        else:
-            raise PermissionDenied("You do not have permission to access this resource.")
-        
-        if organization is None:
-            raise NotFound("Organization not found for user.")
+        organization = require_request_organization(self.request)
         
         return Patient.objects.filter(organization=organization)
 
@@ -293,58 +306,99 @@ class PatientDiagnosisHistoryView(generics.RetrieveAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         """
-        Return patient info with all their diagnoses.
+        Return patient info with one page of their diagnoses.
         """
         patient = self.get_object()
         
-        # Get all diagnoses for the patient (you can add filtering/ordering here if needed)
         diagnoses = PatientDiagnosisDetails.objects.filter(
             patient=patient
-        ).select_related('caregiver', 'patient', 'organization').prefetch_related('vitalsign').order_by('-created_at')
+        ).select_related('caregiver', 'patient', 'organization').prefetch_related('vitalsign')
         
-        # Apply search filtering if search query is provided
-        search_query = request.GET.get('search', None)
-        if search_query:
-            diagnoses = diagnoses.filter(
-                Q(assessment__icontains=search_query) |
-                Q(diagnoses__icontains=search_query) |
-                Q(medication__icontains=search_query)
-            )
-        
-        # Apply ordering if specified
-        ordering = request.GET.get('ordering', '-created_at')
-        if ordering:
-            diagnoses = diagnoses.order_by(ordering)
+        # Full-text search over the clinical fields; results are ranked by relevance while searching,
+        # otherwise ordered (created_at or -created_at) by the paginator through the OrderingFilter
+        diagnoses = self.filter_queryset(diagnoses)
+        page = self.paginate_queryset(diagnoses)
         
         # Serialize the data
         patient_serializer = PatientDiagnosisSerializer(
             patient,
-            context={'request': request, 'diagnoses_queryset': diagnoses}
+            context={'request': request, 'diagnoses_queryset': page}
         )
         
         return Response({
             'success': True,
             'message': 'Patient diagnosis history retrieved successfully',
-            'data':  patient_serializer.data
+            'data':  {**patient_serializer.data, **self.paginator.get_pagination_data()}
         })
 
 
 
 
-class SingleDiagnosisDetailView(RetrieveAPIView):
+class DiagnosisSearchView(SerializerRelationsMixin,ListAPIView):
+    """
+    Organization-wide ranked search over diagnoses and clinical notes.
+    GET /api/patients/diagnoses-search/?search=<text>&caregiver=<uuid>&created_after=<date>&created_before=<date>
+    `search` accepts web-search syntax ("quoted phrases", or, -exclusions). Hits are ranked by relevance
+    and carry a highlighted headline of the matching text.
+    """
+    serializer_class = DiagnosisSearchResultSerializer
+    permission_classes = [IsAuthenticated, IsOrganization | IsCaregiver]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
+    filterset_class = DiagnosisSearchFilterSet
+    search_fields = DIAGNOSIS_SEARCH_FIELDS
+    search_config = DIAGNOSIS_SEARCH_CONFIG
+    search_query_type = 'websearch'
+    trigram_search_fields = []
+
+    def get_queryset(self):
+        """
+        Return diagnoses filtered by the organization of the authenticated user or caregiver.
+        """
+        organization = require_request_organization(self.request)
+
+        return PatientDiagnosisDetails.objects.filter(organization=organization)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        query = FullTextSearchFilter().get_search_query(self.request, self)
+        if query is None or connection.vendor != 'postgresql':
+            return queryset
+
+        # ts_headline re-parses the text, PostgreSQL only evaluates it for the rows that survive the LIMIT
+        document = Func(
+            Value(' | '), 'diagnoses', 'assessment', 'medication', 'health_allergies', 'notes',
+            function='CONCAT_WS', output_field=TextField(),
+        )
+        return queryset.annotate(headline=SearchHeadline(
+            document,
+            query,
+            config=DIAGNOSIS_SEARCH_CONFIG,
+            start_sel='<mark>',
+            stop_sel='</mark>',
+            max_fragments=3,
+            fragment_delimiter=' ... ',
+        ))
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        return Response({
+            "success": True,
+            "message": "Diagnoses retrieved successfully",
+            "data": response.data
+        })
+
+
+class SingleDiagnosisDetailView(SerializerRelationsMixin,RetrieveAPIView):
     """
     Page 3: Detailed view of a single diagnosis
     GET /api/diagnoses/{id}/
     """
+    queryset = PatientDiagnosisDetails.objects.all()
     serializer_class = SingleDiagnosisSerializer
     permission_classes = [IsAuthenticated, IsOrganization]
     lookup_field = 'id'
 
-    def get_queryset(self):
-        return PatientDiagnosisDetails.objects.select_related(
-            'patient', 'organization', 'caregiver'
-        ).prefetch_related('vitalsign')
-
     def retrieve(self, request, *args, **kwargs):
         response = super().retrieve(request, *args, **kwargs)
         return Response({
@@ -352,6 +406,101 @@ class SingleDiagnosisDetailView(RetrieveAPIView):
             "message": "Diagnosis details retrieved successfully",
             "data": response.data
         })
+class PatientVitalSignSeriesView(APIView):
+    """
+    Vital sign trend for one patient, downsampled in SQL.
+    GET /api/patients/vital-signs-series/{medical_id}/?bucket=hour|day|week&start=<datetime>&end=<datetime>&metrics=pulse_rate,systolic
+    Returns the reading count and the min, max and mean of each metric per bucket (Africa/Lagos time).
+    The number of buckets is capped, so the response size does not depend on how many readings exist.
+    """
+    permission_classes = [IsAuthenticated, IsOrganization | IsCaregiver]
+
+    def get_patient(self):
+        organization = require_request_organization(self.request)
+
+        patient = Patient.objects.filter(organization=organization, medical_id=self.kwargs['medical_id']).first()
+        if patient is None:
+            raise PatientNotFoundException()
+        return patient
+
+    def get(self, request, *args, **kwargs):
+        patient = self.get_patient()
+        query = VitalSignSeriesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        metrics = params['metrics']
+
+        aggregates = {}
+        for metric in metrics:
+            aggregates[f'{metric}__min'] = Min(metric)
+            aggregates[f'{metric}__max'] = Max(metric)
+            aggregates[f'{metric}__mean'] = Avg(metric)
+
+        # Served by vitalsign_patient_recorded_idx, one row per bucket comes back from the database
+        buckets = (
+            VitalSign.objects
+            .filter(patient=patient, recorded_at__gte=params['start'], recorded_at__lt=params['end'])
+            .annotate(bucket=Trunc('recorded_at', params['bucket']))
+            .values('bucket')
+            .annotate(count=Count('pkid'), **aggregates)
+            .order_by('bucket')
+        )
+
+        series = []
+        for row in buckets:
+            point = {'bucket': row['bucket'], 'count': row['count']}
+            for metric in metrics:
+                mean = row[f'{metric}__mean']
+                point[metric] = {
+                    'min': row[f'{metric}__min'],
+                    'max': row[f'{metric}__max'],
+                    'mean': round(float(mean), 2) if mean is not None else None,
+                }
+            series.append(point)
+
+        return Response({
+            "success": True,
+            "message": "Vital sign series retrieved successfully",
+            "data": {
+                'medical_id': patient.medical_id,
+                'bucket': params['bucket'],
+                'start': params['start'],
+                'end': params['end'],
+                'series': series,
+            }
+        })
+
+
+class VitalSignIngestView(APIView):
+    """
+    Ingests batches of vital sign readings for many patients, e.g. from ward monitors.
+    POST /api/patients/vital-signs-ingest/
+    {"readings": [{"medical_id": "ACME_0000002A", "recorded_at": "2025-03-01T10:15:00+01:00", "pulse_rate": 72, "blood_pressure": "120/80"}, ...]}
+    Readings do not need a diagnosis. Valid readings are written in one COPY (bulk_create outside PostgreSQL),
+    invalid ones are reported by their index in the batch. The request fails only when no reading is valid.
+    """
+    permission_classes = [IsAuthenticated, IsOrganization | IsCaregiver]
+
+    def post(self, request, *args, **kwargs):
+        organization = require_request_organization(request)
+
+        readings = request.data.get('readings') if isinstance(request.data, dict) else None
+        if not isinstance(readings, list) or not readings:
+            raise ValidationError({'readings': ["Provide a non-empty list of readings."]})
+        if len(readings) > MAX_INGEST_BATCH_SIZE:
+            raise ValidationError({'readings': [f"A batch can contain at most {MAX_INGEST_BATCH_SIZE} readings."]})
+
+        rows, errors = validate_readings(readings, organization)
+        if not rows:
+            raise ValidationError({'readings': {str(error['index']): error['errors'] for error in errors}})
+        ingest_readings(rows)
+
+        return Response({
+            "message": "Vital sign readings ingested successfully",
+            "data": {'accepted': len(rows), 'rejected': len(errors), 'errors': errors}
+        }, status=status.HTTP_201_CREATED)
+
+
 class CreatePatientDiagnosisWithVitalSignView(CreateAPIView):
     """
     Creates a new diagnosis and vital signs for a patient.
@@ -360,6 +509,7 @@ class CreatePatientDiagnosisWithVitalSignView(CreateAPIView):
     permission_classes = [IsAuthenticated, IsOrganization]
 
     def post(self, request, *args, **kwargs):
+        organization = require_request_organization(request)
         serializer = self.serializer_class(data=request.data, context={'request': request})
         caregiver_id = request.data.get('caregiver')
         if not caregiver_id:
@@ -368,36 +518,33 @@ class CreatePatientDiagnosisWithVitalSignView(CreateAPIView):
         # Validate caregiver
         if not validate_uuid(caregiver_id):
             raise ValidationError("Caregiver ID is invalid")
-        caregiver = get_object_or_404(Caregiver, id=caregiver_id, organization=self.request.user.organization)
+        caregiver = get_object_or_404(Caregiver, id=caregiver_id, organization=organization)
 
         # Validate patient
         patient_id = self.kwargs['patient_id']
         if not validate_uuid(patient_id):
             raise ValidationError("Patient ID is invalid")
-        patient = get_object_or_404(Patient, id=patient_id, organization=self.request.user.organization)
+        patient = get_object_or_404(Patient, id=patient_id, organization=organization)
 
         # Validate and save serializer
         serializer.is_valid(raise_exception=True)
-        serializer.save(organization=self.request.user.organization, patient=patient, caregiver=caregiver)
+        serializer.save(organization=organization, patient=patient, caregiver=caregiver)
 
         response_data = {"message": "Patient diagnosis and vital signs created successfully", "data": serializer.data}
         return Response(response_data, status=status.HTTP_201_CREATED)
 
 
-class UpdatePatientDiagnosisWithVitalSignView(UpdateAPIView):
+class UpdatePatientDiagnosisWithVitalSignView(SerializerRelationsMixin,UpdateAPIView):
     """
     Updates an existing diagnosis and vital signs for a patient.
     """
+    queryset = PatientDiagnosisDetails.objects.all()
     serializer_class = PatientDiagnosisWithVitalSignSerializer
     permission_classes = [IsAuthenticated, IsOrganization]
     lookup_field = 'id'
 
-    def get_queryset(self):
-        return PatientDiagnosisDetails.objects.select_related(
-            'patient', 'organization', 'caregiver'
-        ).prefetch_related('vitalsign')
-
     def update(self, request, *args, **kwargs):
+        organization = require_request_organization(request)
         diagnosis = self.get_object()
         caregiver_id = request.data.get('caregiver')
         if caregiver_id:
@@ -406,7 +553,7 @@ class UpdatePatientDiagnosisWithVitalSignView(UpdateAPIView):
             caregiver = get_object_or_404(
                 Caregiver, 
                 id=caregiver_id, 
-                organization=self.request.user.organization
+                organization=organization
             )
         else:
             caregiver = diagnosis.caregiver
@@ -414,7 +561,7 @@ class UpdatePatientDiagnosisWithVitalSignView(UpdateAPIView):
         patient = get_object_or_404(
             Patient, 
             id=diagnosis.patient.id, 
-            organization=self.request.user.organization
+            organization=organization
         )
 
         serializer = self.serializer_class(
@@ -425,7 +572,7 @@ class UpdatePatientDiagnosisWithVitalSignView(UpdateAPIView):
         )
 
         serializer.is_valid(raise_exception=True)
-        serializer.save(organization=self.request.user.organization, patient=patient, caregiver=caregiver)
+        serializer.save(organization=organization, patient=patient, caregiver=caregiver)
 
         response_data = {
             "message": "Patient diagnosis and vital signs updated successfully",
@@ -454,14 +601,13 @@ class PatientBasicInfoView(generics.RetrieveAPIView):
         user = self.request.user
 
         if user.role == UserRoles.ORGANIZATION:
-            return Patient.objects.filter(organization=user.organization)
+            return Patient.objects.filter(organization=require_request_organization(self.request))
 
         if user.role == UserRoles.CAREGIVER:
-            try:
-                caregiver = Caregiver.objects.get(user=user)
-            except Caregiver.DoesNotExist:
+            organization = get_request_organization(self.request)
+            if organization is None:
                 raise PermissionDenied("You are not a valid caregiver.")
-            return Patient.objects.filter(organization=caregiver.organization)
+            return Patient.objects.filter(organization=organization)
 
         if user.role == UserRoles.PATIENT:
             return Patient.objects.filter(user=user)
@@ -479,3 +625,93 @@ class PatientBasicInfoView(generics.RetrieveAPIView):
             return super().get_object()
         except NotFound:
             raise PatientNotFoundException()
+
+
+
+class PatientExportView(StreamingExportView):
+    """
+    Streams every patient of the organization with their medical record as CSV or NDJSON.
+    GET /api/patients/export-patients/?file_format=csv|ndjson
+    """
+    permission_classes = [IsAuthenticated, IsOrganization]
+    export_name = 'patients'
+    export_fields = [
+        ('id', 'id'),
+        ('medical_id', 'medical_id'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('email', 'user__email'),
+        ('active', 'user__is_active'),
+        ('date_of_birth', 'date_of_birth'),
+        ('gender', 'gender'),
+        ('marital_status', 'marital_status'),
+        ('phone_number', 'phone_number'),
+        ('emergency_phone_number', 'emergency_phone_number'),
+        ('address', 'address'),
+        ('blood_group', 'patientmedicalrecord__blood_group'),
+        ('genotype', 'patientmedicalrecord__genotype'),
+        ('weight', 'patientmedicalrecord__weight'),
+        ('height', 'patientmedicalrecord__height'),
+        ('allergies', 'patientmedicalrecord__allergies'),
+        ('created_at', 'created_at'),
+    ]
+
+    def get_queryset(self):
+        return Patient.objects.filter(organization=require_request_organization(self.request))
+
+
+class DiagnosisExportView(StreamingExportView):
+    """
+    Streams the organization's diagnoses as CSV or NDJSON, optionally for a single patient.
+    GET /api/patients/export-diagnoses/?file_format=csv|ndjson&medical_id=<medical_id>&caregiver=<uuid>&created_after=<date>&created_before=<date>
+    """
+    permission_classes = [IsAuthenticated, IsOrganization]
+    filterset_class = DiagnosisSearchFilterSet
+    export_name = 'diagnoses'
+    export_fields = [
+        ('id', 'id'),
+        ('medical_id', 'patient__medical_id'),
+        ('patient_first_name', 'patient__first_name'),
+        ('patient_last_name', 'patient__last_name'),
+        ('caregiver_staff_number', 'caregiver__staff_number'),
+        ('caregiver_first_name', 'caregiver__first_name'),
+        ('caregiver_last_name', 'caregiver__last_name'),
+        ('assessment', 'assessment'),
+        ('diagnoses', 'diagnoses'),
+        ('medication', 'medication'),
+        ('health_allergies', 'health_allergies'),
+        ('health_care_center', 'health_care_center'),
+        ('notes', 'notes'),
+        ('created_at', 'created_at'),
+    ]
+
+    def get_queryset(self):
+        return PatientDiagnosisDetails.objects.filter(organization=require_request_organization(self.request))
+
+
+class VitalSignExportView(StreamingExportView):
+    """
+    Streams the organization's vital signs as CSV or NDJSON, optionally for a single patient.
+    GET /api/patients/export-vital-signs/?file_format=csv|ndjson&medical_id=<medical_id>&recorded_after=<date>&recorded_before=<date>&systolic_min=<mmHg>
+    """
+    permission_classes = [IsAuthenticated, IsOrganization]
+    filterset_class = VitalSignFilterSet
+    export_name = 'vital-signs'
+    export_fields = [
+        ('id', 'id'),
+        ('diagnosis_id', 'patient_diagnoses_details__id'),
+        ('medical_id', 'patient__medical_id'),
+        ('body_temperature', 'body_temperature'),
+        ('pulse_rate', 'pulse_rate'),
+        ('blood_pressure', 'blood_pressure'),
+        ('systolic', 'systolic'),
+        ('diastolic', 'diastolic'),
+        ('blood_oxygen', 'blood_oxygen'),
+        ('respiration_rate', 'respiration_rate'),
+        ('weight', 'weight'),
+        ('recorded_at', 'recorded_at'),
+        ('created_at', 'created_at'),
+    ]
+
+    def get_queryset(self):
+        return VitalSign.objects.filter(patient__organization=require_request_organization(self.request))
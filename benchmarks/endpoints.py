@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone
+import jwt
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.tokens import get_password_fingerprint
+from apps.accounts.user_roles import UserRoles
+from .tenant import PASSWORD
+
+ORGANIZATION = UserRoles.ORGANIZATION
+CAREGIVER = UserRoles.CAREGIVER
+
+
+class Endpoint:
+    """
+    One benchmarked request. `kwargs` and `data` may be callables taking the seeded tenant.
+    `label` identifies the request in the baseline file and defaults to the URL name.
+    """
+
+    def __init__(self, url_name, method='get', role=ORGANIZATION, kwargs=None, query=None, data=None,
+                 format='json', status=200, label=None):
+        self.url_name = url_name
+        self.method = method
+        self.role = role
+        self.kwargs = kwargs
+        self.query = query
+        self.data = data
+        self.format = format
+        self.status = status
+        self.label = label or url_name
+
+    def resolve(self, value, tenant):
+        return value(tenant) if callable(value) else value
+
+    def __str__(self):
+        return f"{self.label} ({self.method.upper()})"
+
+
+def activation_token(tenant):
+    # Same token as the activation email, see queue_organization_activation_email
+    return str(RefreshToken.for_user(tenant.pending_organization.user).access_token)
+
+
+def password_reset_token(tenant):
+    issued_at = datetime.now(timezone.utc)
+    user = tenant.organization.user
+    payload = {
+        'user_id': str(user.id), 'pwd': get_password_fingerprint(user),
+        'exp': issued_at + timedelta(hours=1), 'iat': issued_at,
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+
+
+def import_file(tenant):
+    rows = ''.join(f'Amina,Yusuf{index},import{index}@example.com\n' for index in range(50))
+    return SimpleUploadedFile('patients.csv', f'first_name,last_name,email\n{rows}'.encode(), content_type='text/csv')
+
+
+def vital_sign_readings(tenant):
+    recorded_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    return {'readings': [
+        {'medical_id': patient.medical_id, 'recorded_at': recorded_at.isoformat(), 'pulse_rate': 72, 'blood_pressure': '120/80'}
+        for patient in tenant.patients[:25]
+    ]}
+
+
+def new_patient(tenant):
+    return {
+        'first_name': 'Zainab', 'last_name': 'Abubakar', 'email': 'zainab.abubakar@example.com', 'password': PASSWORD,
+        'gender': 'Female', 'phone_number': '08051234567', 'address': '4 Broad Street, Lagos',
+        'medical_record': {'blood_group': 'O+', 'genotype': 'AA', 'weight': '64.50', 'height': '168.0'},
+    }
+
+
+def health_record(tenant):
+    return {
+        'caregiver': str(tenant.caregiver.id), 'assessment': 'Fever and chills for three days', 'diagnoses': 'Malaria',
+        'medication': 'Artemether/lumefantrine', 'health_care_center': 'Lagos Health Ikeja', 'notes': 'Review in a week.',
+        'vital_sign': {'body_temperature': '38.6', 'pulse_rate': 96, 'blood_pressure': '118/76', 'blood_oxygen': '97.0', 'respiration_rate': 18},
+    }
+
+
+ENDPOINTS = [
+    # apps.accounts
+    Endpoint('organization-signup', 'post', role=None, status=201, data={
+        'name': 'Surulere Hospital', 'acronym': 'SRH', 'email': 'admin@surulerehospital.com', 'password': PASSWORD,
+    }),
+    Endpoint('verify-account', role=None, kwargs=lambda tenant: {'token': activation_token(tenant)}),
+    Endpoint('login-account', 'post', role=None, data=lambda tenant: {'email': tenant.organization.user.email, 'password': PASSWORD}),
+    Endpoint('resend-activation-link', 'post', role=None, data=lambda tenant: {'email': tenant.pending_organization.user.email}),
+    Endpoint('password-reset-request', 'post', role=None, data=lambda tenant: {'email': tenant.organization.user.email}),
+    Endpoint('password-reset-confirm', 'post', role=None, data=lambda tenant: {
+        'reset_token': password_reset_token(tenant), 'new_password': 'Fresh-pass-2025', 'confirm_password': 'Fresh-pass-2025',
+    }),
+    Endpoint('logout', 'post', data=lambda tenant: {'refresh_token': str(tenant.refresh_token(ORGANIZATION))}),
+    Endpoint('changed-password-view', 'post', data={
+        'current_password': PASSWORD, 'new_password': 'Fresh-pass-2025', 'confirm_password': 'Fresh-pass-2025',
+    }),
+    Endpoint('token_obtain_pair', 'post', role=None, data=lambda tenant: {'email': tenant.organization.user.email, 'password': PASSWORD}),
+    Endpoint('token_refresh', 'post', role=None, data=lambda tenant: {'refresh': str(tenant.refresh_token(ORGANIZATION))}),
+
+    # apps.organizations
+    Endpoint('organization-statistics'),
+    # OrganizationSerializer still lists the removed `logo` field
+    Endpoint('organization_profile', status=500),
+    Endpoint('organization-trends', query={'bucket': 'week'}),
+    Endpoint('caregiver-trends', query={'bucket': 'week'}),
+
+    # apps.caregivers
+    Endpoint('caregiver-list'),
+    Endpoint('caregiver-list', query={'search': 'okafor'}, label='caregiver-list-search'),
+    Endpoint('caregiver-detail', kwargs=lambda tenant: {'slug': tenant.caregiver.slug}),
+    Endpoint('caregiver-detail', 'patch', kwargs=lambda tenant: {'slug': tenant.caregiver.slug},
+             data={'address': '7 Awolowo Road, Ikoyi'}, label='caregiver-update'),
+    Endpoint('latest-caregivers'),
+    Endpoint('toggle-caregiver-status', 'patch', kwargs=lambda tenant: {'slug': tenant.caregiver.slug}),
+    Endpoint('all-caregivers-in-organization'),
+
+    # apps.patients
+    Endpoint('patient-list'),
+    Endpoint('patient-list', query={'search': 'okafor'}, label='patient-list-search'),
+    Endpoint('patient-detail', kwargs=lambda tenant: {'slug': tenant.patient.slug}),
+    Endpoint('patient-detail', 'patch', kwargs=lambda tenant: {'slug': tenant.patient.slug},
+             data={'address': '9 Herbert Macaulay Way, Yaba'}, label='patient-update'),
+    Endpoint('latest-patients'),
+    Endpoint('toggle-patient-status', 'patch', kwargs=lambda tenant: {'slug': tenant.patient.slug}),
+    Endpoint('register-new-patient', 'post', data=new_patient, status=201),
+    Endpoint('bulk-import-patients', 'post', data=lambda tenant: {'file': import_file(tenant)}, format='multipart', status=202),
+    Endpoint('bulk-import-patients-detail', kwargs=lambda tenant: {'id': tenant.import_job.id}),
+    Endpoint('register-new-patient', kwargs=lambda tenant: {'medical_id': tenant.patient.medical_id}, label='patient-registration-details'),
+    Endpoint('register-new-patient', 'patch', kwargs=lambda tenant: {'medical_id': tenant.patient.medical_id},
+             data={'address': '3 Ozumba Mbadiwe Avenue, Victoria Island', 'medical_record': {'weight': '70.00'}},
+             label='patient-registration-details-update'),
+    Endpoint('patient-diagnosis-list'),
+    Endpoint('patient-diagnosis-history', kwargs=lambda tenant: {'medical_id': tenant.diagnosed_patient.medical_id}),
+    Endpoint('diagnosis-search', query={'search': 'malaria'}),
+    Endpoint('diagnosis-detail', kwargs=lambda tenant: {'id': tenant.diagnoses[0].id}),
+    Endpoint('vital-signs-series', kwargs=lambda tenant: {'medical_id': tenant.patient.medical_id}),
+    Endpoint('vital-signs-ingest', 'post', role=CAREGIVER, data=vital_sign_readings, status=201),
+    Endpoint('create-patient-health-record', 'post', kwargs=lambda tenant: {'patient_id': tenant.patient.id}, data=health_record, status=201),
+    Endpoint('update-patient-health-record', 'patch', kwargs=lambda tenant: {'id': tenant.diagnoses[0].id},
+             data={'notes': 'Symptoms resolved.', 'vital_sign': {'pulse_rate': 80, 'blood_pressure': '120/80'}}),
+    Endpoint('patient-basic-info', role=CAREGIVER, kwargs=lambda tenant: {'id': tenant.patient.id}),
+    Endpoint('export-patients'),
+    Endpoint('export-diagnoses'),
+    Endpoint('export-vital-signs', query={'file_format': 'ndjson'}),
+
+    # apps.invites
+    Endpoint('invite-caregiver', 'post', data={'email': 'new.nurse@example.com', 'role': 'Nurse'}, status=201),
+    Endpoint('bulk-invite-caregivers', 'post', data=lambda tenant: {'invitations': [
+        {'email': f'bulk{index}@example.com', 'role': 'Nurse'} for index in range(40)
+    ] + [{'email': invite.email, 'role': invite.role} for invite in tenant.invitations[:10]]}),
+    Endpoint('caregiver-invitations'),
+    Endpoint('caregiver_accept_invitation', 'post', role=None, status=201,
+             kwargs=lambda tenant: {'token': tenant.pending_invitation().token},
+             data={'first_name': 'Halima', 'last_name': 'Sani', 'password': PASSWORD, 'password_confirmation': PASSWORD}),
+]
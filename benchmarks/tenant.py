@@ -0,0 +1,206 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.accounts.tokens import TenantRefreshToken
+from apps.accounts.user_roles import UserRoles
+from apps.caregivers.models import Caregiver
+from apps.invites.models import CaregiverInvite, InvitationStatus
+from apps.organizations.models import Organization
+from apps.organizations.rollups import catch_up_rollups
+from apps.patients.models import Patient, PatientDiagnosisDetails, PatientImportJob, PatientMedicalRecord, VitalSign
+from shared.text_choices import CaregiverTypes, Gender, ImportFileFormat, ImportStatus, MaritalStatus
+
+PASSWORD = 'Benchmark-pass-2024'
+
+# Size of the seeded tenant, list pages (10 rows) are full so an N+1 query shows up as a budget overrun
+CAREGIVERS = 12
+PATIENTS = 60
+MAX_DIAGNOSES_PER_PATIENT = 4
+READINGS_PER_PATIENT = 5
+INVITATIONS = 25
+HISTORY_DAYS = 60
+
+FIRST_NAMES = ['Ada', 'Chidi', 'Ngozi', 'Tunde', 'Amaka', 'Emeka', 'Funke', 'Bola', 'Ifeoma', 'Segun', 'Kemi', 'Yusuf']
+LAST_NAMES = ['Okafor', 'Adeyemi', 'Balogun', 'Eze', 'Nwosu', 'Bello', 'Okonkwo', 'Adebayo', 'Obi', 'Lawal']
+DIAGNOSES = [
+    ('Malaria', 'Artemether/lumefantrine'), ('Typhoid fever', 'Ciprofloxacin'), ('Hypertension', 'Amlodipine'),
+    ('Type 2 diabetes', 'Metformin'), ('Peptic ulcer', 'Omeprazole'), ('Upper respiratory infection', 'Amoxicillin'),
+    ('Asthma', 'Salbutamol inhaler'), ('Migraine', 'Ibuprofen'),
+]
+
+
+class Tenant:
+    """
+    An organization with caregivers, patients, diagnoses, vital signs and invitations, plus one account per role.
+    """
+
+    def __init__(self, organization, pending_organization, caregivers, patients, diagnoses, invitations, import_job):
+        self.organization = organization
+        # Signed up but not activated yet
+        self.pending_organization = pending_organization
+        self.caregivers = caregivers
+        self.patients = patients
+        self.diagnoses = diagnoses
+        self.invitations = invitations
+        self.import_job = import_job
+
+    @property
+    def caregiver(self):
+        return self.caregivers[0]
+
+    @property
+    def patient(self):
+        return self.patients[0]
+
+    @property
+    def diagnosed_patient(self):
+        return self.diagnoses[0].patient
+
+    def pending_invitation(self):
+        return next(invite for invite in self.invitations if invite.status == InvitationStatus.PENDING)
+
+    def user(self, role):
+        return {
+            UserRoles.ORGANIZATION: self.organization.user,
+            UserRoles.CAREGIVER: self.caregiver.user,
+            UserRoles.PATIENT: self.patient.user,
+        }[role]
+
+    def refresh_token(self, role):
+        return TenantRefreshToken.for_user(self.user(role))
+
+    def access_token(self, role):
+        return str(self.refresh_token(role).access_token)
+
+
+def create_user(email, role, password):
+    return User.objects.create(email=email, role=role, password=password, is_active=True, is_verified=True)
+
+
+def seed_tenant(seed=2024):
+    """
+    Creates a realistic tenant through the ORM, so the signals maintaining statistics and
+    diagnosis summaries run as they do in production. The data is the same on every run.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    # Hashed once, every seeded account shares the password
+    password = make_password(PASSWORD)
+
+    organization = Organization.objects.create(
+        user=create_user('admin@lagoshealth.com', UserRoles.ORGANIZATION, password),
+        name='Lagos Health', acronym='LGH', address='12 Marina Road, Lagos', phone_number='08031234567',
+    )
+
+    pending_organization = Organization.objects.create(
+        user=User.objects.create(email='admin@ikejaclinic.com', role=UserRoles.ORGANIZATION, password=password),
+        name='Ikeja Clinic', acronym='IKC',
+    )
+
+    caregiver_types = [CaregiverTypes.DOCTOR, CaregiverTypes.NURSE, CaregiverTypes.PHARMACIST, CaregiverTypes.SURGEON]
+    caregivers = [
+        Caregiver.objects.create(
+            user=create_user(f'caregiver{index}@lagoshealth.com', UserRoles.CAREGIVER, password),
+            organization=organization,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            caregiver_type=caregiver_types[index % len(caregiver_types)],
+            gender=rng.choice(Gender.values),
+        )
+        for index in range(CAREGIVERS)
+    ]
+
+    patients, diagnoses = [], []
+    for index in range(PATIENTS):
+        patient = Patient.objects.create(
+            user=create_user(f'patient{index}@example.com', UserRoles.PATIENT, password),
+            organization=organization,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            date_of_birth=(now - timedelta(days=rng.randint(365, 80 * 365))).date(),
+            gender=rng.choice(Gender.values),
+            marital_status=rng.choice(MaritalStatus.values),
+            phone_number=f'0803{index:07d}',
+            address=f'{index + 1} Allen Avenue, Ikeja',
+        )
+        PatientMedicalRecord.objects.create(
+            patient=patient,
+            blood_group=rng.choice(['A+', 'B+', 'O+', 'O-', 'AB+']),
+            genotype=rng.choice(['AA', 'AS', 'SS']),
+            weight=Decimal(rng.randint(450, 1100)) / 10,
+            height=Decimal(rng.randint(1500, 1950)) / 10,
+        )
+        patients.append(patient)
+
+        # Roughly one patient in five has no diagnosis yet
+        for _ in range(rng.choice([0, 1, 1, 2, 3, MAX_DIAGNOSES_PER_PATIENT])):
+            diagnosis, medication = rng.choice(DIAGNOSES)
+            record = PatientDiagnosisDetails.objects.create(
+                patient=patient,
+                organization=organization,
+                caregiver=rng.choice(caregivers),
+                assessment=f'Presented with symptoms consistent with {diagnosis.lower()}',
+                diagnoses=diagnosis,
+                medication=medication,
+                health_care_center='Lagos Health Ikeja',
+                notes='Review in two weeks.',
+            )
+            VitalSign.objects.create(
+                patient_diagnoses_details=record,
+                body_temperature=Decimal(rng.randint(360, 395)) / 10,
+                pulse_rate=rng.randint(55, 110),
+                blood_pressure=f'{rng.randint(100, 160)}/{rng.randint(60, 100)}',
+                blood_oxygen=Decimal(rng.randint(920, 1000)) / 10,
+                respiration_rate=rng.randint(12, 22),
+            )
+            diagnoses.append(record)
+
+        # Readings pushed by ward monitors, without a diagnosis
+        for _ in range(READINGS_PER_PATIENT):
+            VitalSign.objects.create(
+                patient=patient,
+                recorded_at=now - timedelta(hours=rng.randint(1, 24 * 20)),
+                pulse_rate=rng.randint(55, 110),
+                blood_pressure=f'{rng.randint(100, 160)}/{rng.randint(60, 100)}',
+            )
+
+    # Spread the history over the last HISTORY_DAYS days so the trends have something to aggregate
+    for record in diagnoses:
+        PatientDiagnosisDetails.objects.filter(pkid=record.pkid).update(
+            created_at=now - timedelta(days=rng.randint(0, HISTORY_DAYS), minutes=rng.randint(0, 1440))
+        )
+    catch_up_rollups((now - timedelta(days=HISTORY_DAYS + 1)).date())
+
+    statuses = [InvitationStatus.PENDING, InvitationStatus.PENDING, InvitationStatus.ACCEPTED, InvitationStatus.EXPIRED]
+    invitations = []
+    for index in range(INVITATIONS):
+        status = statuses[index % len(statuses)]
+        invitations.append(CaregiverInvite.objects.create(
+            email=f'invitee{index}@example.com',
+            organization=organization,
+            role=rng.choice(caregiver_types),
+            invited_by=organization.user,
+            status=status,
+            expires_at=now - timedelta(days=1) if status == InvitationStatus.EXPIRED else now + timedelta(days=7),
+        ))
+
+    import_job = PatientImportJob.objects.create(
+        organization=organization,
+        created_by=organization.user,
+        file=ContentFile(b'first_name,last_name,email\n', name='patients.csv'),
+        file_format=ImportFileFormat.CSV,
+        status=ImportStatus.COMPLETED,
+        processed_rows=120,
+        created_count=118,
+        failed_count=2,
+        errors=[{'row': 14, 'errors': {'email': ['Enter a valid email address.']}}, {'row': 77, 'errors': {'email': ['Duplicate email.']}}],
+        completed_at=now,
+    )
+
+    return Tenant(
+        organization, pending_organization, caregivers, patients, sorted(diagnoses, key=lambda record: record.pkid), invitations, import_job,
+    )
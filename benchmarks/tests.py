@@ -0,0 +1,187 @@
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urlencode
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, resolve, reverse
+from rest_framework.test import APIClient
+from apps.accounts.blacklist import publish_blacklist_version
+from .endpoints import ENDPOINTS
+from .tenant import seed_tenant
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 20))
+WARMUP_ITERATIONS = 2
+# Timings and allocations vary between machines and runs, a regression is a value above baseline * (1 + tolerance) + slack
+LATENCY_TOLERANCE = float(os.environ.get('BENCHMARK_LATENCY_TOLERANCE', 0.5))
+LATENCY_SLACK_MS = 5
+MEMORY_TOLERANCE = float(os.environ.get('BENCHMARK_MEMORY_TOLERANCE', 0.25))
+MEMORY_SLACK_KIB = 256
+# Savepoints of the benchmark's own transactions, outside tests these are a BEGIN and COMMIT that Django does not log
+SAVEPOINT_STATEMENTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+def app_routes():
+    """
+    Yields (route, url name) of every URL pattern served by a view in `apps`, without the router's format suffix variants.
+    """
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            # Joined like ResolverMatch.route, which drops the "^" of nested regex patterns
+            route = prefix + str(pattern.pattern).removeprefix('^')
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, route)
+            elif pattern.lookup_str.startswith('apps.') and '(?P<format>' not in route:
+                yield route, pattern.name
+    return walk(get_resolver().url_patterns, '')
+
+
+def load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def percentile(values, percent):
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+class EndpointBenchmarkTests(TestCase):
+    """
+    Runs every endpoint against a seeded tenant and compares its query count, p50/p95 latency and peak
+    memory with benchmarks/baseline.json, which holds one section per database vendor.
+
+    Query counts are budgets and must not grow. The median latency and the peak memory fail only past
+    the tolerances above, the p95 is recorded for reference.
+    Each request runs in a transaction that is rolled back, so every iteration sees the same data.
+
+        python manage.py test benchmarks --settings=medipt.settings.benchmark
+        BENCHMARK_UPDATE_BASELINE=1 python manage.py test benchmarks --settings=medipt.settings.benchmark
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = seed_tenant()
+        cls.tokens = {role: cls.tenant.access_token(role) for role in {endpoint.role for endpoint in ENDPOINTS} if role}
+
+    def setUp(self):
+        self.reset_caches()
+
+    def reset_caches(self):
+        # Requests leave throttling history and token deny list entries behind, rolling back does not remove them
+        for cache in caches.all():
+            cache.clear()
+        publish_blacklist_version()
+
+    def get_client(self, endpoint):
+        # Server errors are measured like any other response instead of raised
+        client = APIClient(raise_request_exception=False)
+        if endpoint.role:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.tokens[endpoint.role]}')
+        return client
+
+    def get_path(self, endpoint):
+        path = reverse(endpoint.url_name, kwargs=endpoint.resolve(endpoint.kwargs, self.tenant))
+        if endpoint.query:
+            path = f'{path}?{urlencode(endpoint.query)}'
+        return path
+
+    def request(self, endpoint, count_queries=False, trace_memory=False):
+        """
+        Sends the request once and returns (response, seconds, queries or None, peak KiB or None).
+        """
+        client = self.get_client(endpoint)
+        queries = peak = None
+        with transaction.atomic():
+            path = self.get_path(endpoint)
+            data = endpoint.resolve(endpoint.data, self.tenant)
+            with CaptureQueriesContext(connection) as captured:
+                if trace_memory:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                response = getattr(client, endpoint.method)(path, data, format=endpoint.format)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = time.perf_counter() - start
+                if trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1] / 1024
+                    tracemalloc.stop()
+            transaction.set_rollback(True)
+        self.reset_caches()
+        if count_queries:
+            queries = len([query for query in captured.captured_queries if not query['sql'].startswith(SAVEPOINT_STATEMENTS)])
+        return response, elapsed, queries, peak
+
+    def measure(self, endpoint):
+        for _ in range(WARMUP_ITERATIONS):
+            self.request(endpoint)
+        response, _, queries, _ = self.request(endpoint, count_queries=True)
+        content = b'' if response.streaming else response.content[:500]
+        self.assertEqual(response.status_code, endpoint.status, f"{endpoint}: {content!r}")
+
+        timings = [self.request(endpoint)[1] * 1000 for _ in range(ITERATIONS)]
+        peak = self.request(endpoint, trace_memory=True)[3]
+        return {
+            'queries': queries,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'peak_kib': round(peak, 1),
+        }
+
+    def compare(self, label, result, expected):
+        if expected is None:
+            return [f"{label}: missing from the baseline, run with BENCHMARK_UPDATE_BASELINE=1"]
+        failures = []
+        if result['queries'] > expected['queries']:
+            failures.append(f"{label}: {result['queries']} queries, the budget is {expected['queries']}")
+        # The median, a single slow iteration on a busy machine moves the p95 too much to fail on
+        latency_limit = expected['p50_ms'] * (1 + LATENCY_TOLERANCE) + LATENCY_SLACK_MS
+        if result['p50_ms'] > latency_limit:
+            failures.append(f"{label}: p50 {result['p50_ms']} ms, the baseline is {expected['p50_ms']} ms")
+        memory_limit = expected['peak_kib'] * (1 + MEMORY_TOLERANCE) + MEMORY_SLACK_KIB
+        if result['peak_kib'] > memory_limit:
+            failures.append(f"{label}: peak memory {result['peak_kib']} KiB, the baseline is {expected['peak_kib']} KiB")
+        return failures
+
+    def report(self, results, baseline):
+        print(f"\n{'endpoint':<40} {'queries':>8} {'budget':>7} {'p50 ms':>9} {'p95 ms':>9} {'peak KiB':>10}")
+        for label, result in results.items():
+            budget = baseline.get(label, {}).get('queries', '-')
+            print(
+                f"{label:<40} {result['queries']:>8} {budget:>7} {result['p50_ms']:>9.2f} "
+                f"{result['p95_ms']:>9.2f} {result['peak_kib']:>10.1f}"
+            )
+
+    def test_every_app_url_is_benchmarked(self):
+        benchmarked = set()
+        for endpoint in ENDPOINTS:
+            match = resolve(self.get_path(endpoint).split('?')[0])
+            benchmarked.add((match.route, match.url_name))
+        missing = [f"{name} ({route})" for route, name in app_routes() if (route, name) not in benchmarked]
+        self.assertEqual(missing, [], "Add these URLs to benchmarks/endpoints.py")
+
+    def test_endpoints_within_baseline(self):
+        labels = [endpoint.label for endpoint in ENDPOINTS]
+        self.assertEqual(len(labels), len(set(labels)), "Endpoint labels must be unique")
+
+        results = {endpoint.label: self.measure(endpoint) for endpoint in ENDPOINTS}
+        baselines = load_baseline()
+        baseline = baselines.get(connection.vendor, {})
+        self.report(results, baseline)
+
+        if os.environ.get('BENCHMARK_UPDATE_BASELINE'):
+            baselines[connection.vendor] = results
+            BASELINE_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n')
+            return
+
+        failures = []
+        for label, result in results.items():
+            failures.extend(self.compare(label, result, baseline.get(label)))
+        if failures:
+            self.fail("Endpoint benchmarks regressed:\n" + "\n".join(failures))
@@ -34,6 +34,9 @@ if urlparse(broker_url).scheme == 'rediss':
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
 
+# Task duration, queue wait, retry and failure metrics, see shared.task_metrics
+import shared.task_metrics  # noqa: E402,F401
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -3,6 +3,7 @@ import os
 import cloudinary 
 import environ
 from datetime import timedelta
+from celery.schedules import crontab
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -32,6 +33,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 LOCAL_APPS = [
@@ -40,6 +42,7 @@ LOCAL_APPS = [
     'apps.caregivers',
     'apps.patients',
     'apps.invites',
+    'apps.notifications',
 ]
 
 THIRD_PARTY_APPS=[
@@ -59,6 +62,8 @@ THIRD_PARTY_APPS=[
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS 
 
 MIDDLEWARE = [
+    'shared.middleware.PrometheusMetricsMiddleware',
+    'shared.middleware.NPlusOneDetectionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -175,7 +180,7 @@ REST_FRAMEWORK = {
        'rest_framework.renderers.JSONRenderer',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.ClaimsJWTAuthentication',
          'rest_framework.authentication.TokenAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
@@ -197,8 +202,44 @@ SIMPLE_JWT = {
     'JTI_CLAIM': 'jti',
     'BLACKLIST_ENABLED': True,
     'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.accounts.serializers.TenantTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.serializers.TenantTokenRefreshSerializer',
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Revoked access tokens, must be shared by every process (Redis outside local development)
+    'auth': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'KEY_PREFIX': 'auth',
+    },
+}
+AUTH_DENYLIST_CACHE = 'auth'
+
+# Bearer token required to scrape /metrics, without one the metrics are only served with DEBUG on
+METRICS_TOKEN = env('METRICS_TOKEN', default=None)
+
+# N+1 query detection, see shared.middleware.NPlusOneDetectionMiddleware: "log", "raise" or empty for off
+N_PLUS_ONE_DETECTION = env('N_PLUS_ONE_DETECTION', default=None)
+N_PLUS_ONE_THRESHOLD = 2  # lazy loads of one relation, or runs of one identical query, per request
+# Mode under `manage.py test`, whatever the settings module
+TEST_RUNNER = 'shared.test_runner.NPlusOneDetectionRunner'
+TEST_N_PLUS_ONE_DETECTION = env('TEST_N_PLUS_ONE_DETECTION', default='raise')
+
+# Refresh token blacklist filter, see apps.accounts.blacklist
+TOKEN_BLACKLIST_FILTER_CAPACITY = 200_000
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = 0.001
+TOKEN_BLACKLIST_FILTER_REBUILD_INTERVAL = 300  # seconds
+TOKEN_PRUNE_BATCH_SIZE = 1000
+
+# Email outbox, see apps.notifications.outbox
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60  # seconds, doubled after every failed attempt
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 600  # seconds an email may stay in SENDING before it counts as interrupted
+
 
 SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,  # Prevents login redirection
@@ -218,6 +259,31 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 INVITATION_EXPIRY_DAYS = 7  # Default to 7 days
 MAX_INVITATION_RESENDS = 3  # Maximum resends allowed
+MAX_BULK_INVITATIONS = 500  # Maximum entries in one bulk invitation request
+PATIENT_SET_PASSWORD_LINK_DAYS = 7  # Validity of the link in the welcome email of imported patients
+
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-organization-statistics': {
+        'task': 'apps.organizations.tasks.reconcile_organization_statistics',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'build-daily-rollups': {
+        'task': 'apps.organizations.tasks.build_daily_rollups',
+        'schedule': crontab(minute='*/15'),
+    },
+    'drain-email-outbox': {
+        'task': 'apps.notifications.tasks.drain_email_outbox',
+        'schedule': crontab(minute='*'),
+    },
+    'expire-overdue-invitations': {
+        'task': 'apps.invites.tasks.expire_overdue_invitations',
+        'schedule': crontab(minute='*/15'),
+    },
+    'prune-expired-refresh-tokens': {
+        'task': 'apps.accounts.tasks.prune_expired_refresh_tokens',
+        'schedule': crontab(hour=3, minute=0),
+    },
+}
 
 cloudinary.config(
     cloud_name=env('CLOUDINARY_CLOUD_NAME'),
@@ -0,0 +1,55 @@
+import os
+
+# The benchmarks never reach an external service, placeholders satisfy the variables read by the base settings
+for name, value in {
+    'SECRET_KEY': 'benchmark-secret-key',
+    'DEBUG': 'False',
+    'ALLOWED_HOSTS': 'testserver localhost',
+    'DATABASE_NAME': 'medipt',
+    'DATABASE_USER': 'postgres',
+    'DATABASE_PASSWORD': '',
+    'DATABASE_HOST': 'localhost',
+    'DATABASE_PORT': '5432',
+    'CLOUDINARY_CLOUD_NAME': 'benchmark',
+    'CLOUDINARY_API_KEY': 'benchmark',
+    'CLOUDINARY_API_SECRET': 'benchmark',
+}.items():
+    os.environ.setdefault(name, value)
+
+from .base import *
+
+# Settings for the endpoint benchmarks, see benchmarks/tests.py
+# python manage.py test benchmarks --settings=medipt.settings.benchmark
+# SQLite by default, BENCHMARK_DATABASE=postgres uses the DATABASE_* variables of a local PostgreSQL
+if env('BENCHMARK_DATABASE', default='sqlite') != 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'benchmark.sqlite3',
+        }
+    }
+
+# In-process stand-ins for Redis, SMTP, the Celery broker and Cloudinary uploads
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'auth': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'KEY_PREFIX': 'auth',
+    },
+}
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+EMAIL_HOST_USER = 'noreply@medipt.com'
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+CELERY_TASK_ALWAYS_EAGER = True
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+REACT_FRONTEND_URL = 'http://localhost:5173'
+
+# Password hashing would dominate the latency of every endpoint that logs in or creates a user
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
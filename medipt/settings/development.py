@@ -12,8 +12,16 @@ CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
 CELERY_RESULT_EXPIRES = 3600  # Task state expires after 1 hour
 CELERY_TIMEZONE = 'Africa/Lagos'
 
+CACHES['auth'] = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': "redis://localhost:6379/1",
+    'KEY_PREFIX': 'auth',
+}
+
 REACT_FRONTEND_URL = 'http://localhost:5173'
 
+N_PLUS_ONE_DETECTION = env('N_PLUS_ONE_DETECTION', default='log')
+
 EMAIL_USE_TLS=True
 EMAIL_HOST=env('DEVELOPMENT_EMAIL_HOST')
 EMAIL_HOST_USER=env('DEVELOPMENT_EMAIL_HOST_USER')
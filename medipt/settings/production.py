@@ -5,6 +5,9 @@ import os
 # Production-specific settings
 DEBUG = True
 
+# /metrics exposes per view traffic and database timings, production never serves it without a token
+METRICS_TOKEN = env('METRICS_TOKEN')
+
 # Production database settings
 DATABASES = {
     'default': dj_database_url.config(
@@ -82,6 +85,12 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_EXPIRES = 3600
 CELERY_TIMEZONE = 'Africa/Lagos'
 
+CACHES['auth'] = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': CELERY_BROKER_URL,
+    'KEY_PREFIX': 'auth',
+}
+
 # Logging configuration
 LOGGING = {
     'version': 1,
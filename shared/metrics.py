@@ -0,0 +1,84 @@
+import hmac
+import os
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+
+# Views are labeled by URL name, unresolved paths (404s) share one label to keep the series count bounded
+UNRESOLVED_VIEW = '<unresolved>'
+
+REQUEST_LATENCY = Histogram(
+    'medipt_http_request_duration_seconds',
+    'Time spent handling a request, from the first middleware to the rendered response.',
+    ['view', 'method', 'status'],
+)
+REQUEST_DB_QUERIES = Histogram(
+    'medipt_http_request_db_queries',
+    'Database queries run while handling a request.',
+    ['view'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf')),
+)
+REQUEST_DB_DURATION = Histogram(
+    'medipt_http_request_db_duration_seconds',
+    'Total time spent in database queries while handling a request.',
+    ['view'],
+)
+RESPONSE_SIZE = Histogram(
+    'medipt_http_response_size_bytes',
+    'Size of the response body, streaming responses are not measured.',
+    ['view'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, float('inf')),
+)
+RENDER_DURATION = Histogram(
+    'medipt_http_response_render_duration_seconds',
+    'Time spent rendering the response, e.g. by the DRF renderer.',
+    ['view'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, float('inf')),
+)
+
+TASK_DURATION = Histogram(
+    'medipt_celery_task_duration_seconds',
+    'Time spent running a Celery task, labeled by its final state.',
+    ['task', 'state'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, float('inf')),
+)
+TASK_QUEUE_WAIT = Histogram(
+    'medipt_celery_task_queue_wait_seconds',
+    'Time a task message waited in the broker, from publishing (or its ETA) until a worker started it.',
+    ['task'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, float('inf')),
+)
+TASK_RETRIES = Counter('medipt_celery_task_retries_total', 'Celery task retries.', ['task'])
+TASK_FAILURES = Counter('medipt_celery_task_failures_total', 'Celery tasks that raised an exception.', ['task', 'exception'])
+
+
+def get_registry():
+    """
+    Returns the registry to export. With several worker processes (PROMETHEUS_MULTIPROC_DIR set),
+    the samples written by every process are merged.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def is_scrape_allowed(authorization):
+    """
+    Checks the Authorization header of a scrape. The scraper must send METRICS_TOKEN as a bearer token,
+    without a token the metrics are only served with DEBUG on.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token:
+        return settings.DEBUG
+    return hmac.compare_digest(authorization, f'Bearer {token}')
+
+
+def metrics_view(request):
+    """
+    Exposes the metrics in the Prometheus text format, see is_scrape_allowed().
+    """
+    if not is_scrape_allowed(request.headers.get('Authorization', '')):
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
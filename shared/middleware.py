@@ -0,0 +1,170 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from .metrics import (
+    RENDER_DURATION, REQUEST_DB_DURATION, REQUEST_DB_QUERIES, REQUEST_LATENCY, RESPONSE_SIZE, UNRESOLVED_VIEW,
+)
+from .relations import get_caller_location, get_serializer_field, track_lazy_loads
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting the queries of a request and the time they take.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Records per view request latency, database query count and time, response size and render time.
+    Place it first so the latency covers the other middleware too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        view = self.get_view_name(request)
+        REQUEST_LATENCY.labels(view, request.method, f'{response.status_code // 100}xx').observe(duration)
+        REQUEST_DB_QUERIES.labels(view).observe(recorder.count)
+        REQUEST_DB_DURATION.labels(view).observe(recorder.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(view).observe(len(response.content))
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before the response is rendered, the callback runs right after
+        render_start = time.perf_counter()
+
+        def observe_render(rendered_response):
+            RENDER_DURATION.labels(self.get_view_name(request)).observe(time.perf_counter() - render_start)
+        response.add_post_render_callback(observe_render)
+        return response
+
+    def get_view_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return UNRESOLVED_VIEW
+        # Falls back to the dotted path of the view for URL patterns without a name
+        return match.view_name
+
+
+class NPlusOneQueryError(Exception):
+    """
+    Raised by NPlusOneDetectionMiddleware in "raise" mode, the message lists every problem of the request.
+    """
+
+
+class RepeatedQueryRecorder:
+    """
+    Database execute wrapper counting identical statements, SQL and parameters, of a request.
+    The location of a statement is taken when it reaches the threshold, so single queries cost a counter update.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.locations = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many:
+            key = (sql, repr(params))
+            self.counts[key] += 1
+            if self.counts[key] == self.threshold:
+                self.locations[key] = (get_caller_location(), get_serializer_field())
+        return execute(sql, params, many, context)
+
+    def repeated(self):
+        for key, (location, serializer_field) in self.locations.items():
+            yield key[0], self.counts[key], location, serializer_field
+
+
+class NPlusOneDetectionMiddleware:
+    """
+    Reports the N+1 queries of a request: a foreign key or one-to-one relation loaded lazily, or an identical
+    SQL statement executed, N_PLUS_ONE_THRESHOLD times or more. Each problem names the view, the serializer
+    field being rendered and the first line of the apps' code that ran the query.
+
+    N_PLUS_ONE_DETECTION is "log" to log a warning per problem or "raise" to raise NPlusOneQueryError once
+    the response is built. The middleware removes itself when the setting is empty, as in production.
+    """
+
+    def __init__(self, get_response):
+        self.mode = getattr(settings, 'N_PLUS_ONE_DETECTION', None)
+        if not self.mode:
+            raise MiddlewareNotUsed
+        if self.mode not in ('log', 'raise'):
+            raise ValueError(f'N_PLUS_ONE_DETECTION must be "log" or "raise", not {self.mode!r}')
+        self.threshold = getattr(settings, 'N_PLUS_ONE_THRESHOLD', 2)
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = RepeatedQueryRecorder(self.threshold)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            lazy_loads = stack.enter_context(track_lazy_loads())
+            response = self.get_response(request)
+        # Streaming responses, the exports, query while they are consumed and are not checked
+        problems = self.get_problems(lazy_loads, recorder)
+
+        if problems:
+            view = self.get_view_name(request)
+            problems = [f"{view}: {problem}" for problem in problems]
+            if self.mode == 'raise':
+                raise NPlusOneQueryError("N+1 queries in " + "\n".join(problems))
+            for problem in problems:
+                logger.warning(f"N+1 queries in {problem}")
+        return response
+
+    def get_problems(self, lazy_loads, recorder):
+        problems = []
+        loads = {}
+        for lazy_load in lazy_loads:
+            loads.setdefault(lazy_load.relation, []).append(lazy_load)
+        for relation, relation_loads in loads.items():
+            if len(relation_loads) >= self.threshold:
+                first = relation_loads[0]
+                problems.append(
+                    f"{relation} loaded lazily {len(relation_loads)} times"
+                    f"{self.describe(first.location, first.serializer_field)}"
+                )
+        for sql, count, location, serializer_field in recorder.repeated():
+            problems.append(f"same query executed {count} times{self.describe(location, serializer_field)}: {sql}")
+        return problems
+
+    def describe(self, location, serializer_field):
+        field = f", serializer field {serializer_field}" if serializer_field else ""
+        return f" at {location}{field}"
+
+    def get_view_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return UNRESOLVED_VIEW
+        view = getattr(match.func, 'view_class', getattr(match.func, 'cls', match.func))
+        return f"{match.view_name} ({view.__name__})"
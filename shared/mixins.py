@@ -0,0 +1,62 @@
+import logging
+from django.conf import settings
+from rest_framework.response import Response
+from .relations import get_serializer_relations, track_lazy_loads
+
+logger = logging.getLogger(__name__)
+
+
+class ValuesListMixin:
+    """
+    Serves the list action of a GenericAPIView through `list_serializer_class`, a ValuesSerializer, so each
+    page is read as values() rows with its relations joined instead of as model instances.
+    Other actions keep using `serializer_class`.
+    """
+    list_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.list_serializer_class
+        queryset = serializer_class.get_values_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+            return self.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(queryset, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
+
+
+class SerializerRelationsMixin:
+    """
+    Loads the relations read by the serializer's fields with the queryset of a GenericAPIView, so views do not
+    have to keep their select_related calls in step with the serializer.
+
+    Dotted sources (`user.is_active`), nested serializers and related fields are followed through the model:
+    single-valued relations are joined with select_related and to-many ones prefetched. SerializerMethodFields
+    cannot be inspected, a serializer lists the relations they read in `Meta.related_fields`.
+    The lookups are applied in filter_queryset(), which the list and detail actions call on get_queryset().
+
+    With the REPORT_LAZY_LOADS setting, every foreign key or one-to-one relation still loaded lazily during
+    the request is logged with its location.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        select_related, prefetch_related = get_serializer_relations(self.get_serializer_class(), queryset.model)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def dispatch(self, request, *args, **kwargs):
+        if not getattr(settings, 'REPORT_LAZY_LOADS', False):
+            return super().dispatch(request, *args, **kwargs)
+
+        with track_lazy_loads() as lazy_loads:
+            response = super().dispatch(request, *args, **kwargs)
+        for lazy_load in lazy_loads:
+            field = f", serializer field {lazy_load.serializer_field}" if lazy_load.serializer_field else ""
+            logger.warning(f"Lazy load of {lazy_load.relation} in {type(self).__name__} at {lazy_load.location}{field}")
+        return response
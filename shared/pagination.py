@@ -1,6 +1,167 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from urllib import parse
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 1
     page_size_query_param = 'page_size'
-    max_page_size = 10
\ No newline at end of file
+    max_page_size = 10
+
+
+KeysetCursor = namedtuple('KeysetCursor', ['position', 'pkid', 'reverse'])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination over the compound key (ordering field, pkid).
+
+    Pages are fetched with `WHERE (field, pkid) < (last_field, last_pkid) ORDER BY field, pkid LIMIT n`,
+    so every page costs the same regardless of depth, unlike OFFSET based pagination.
+    The ordering field defaults to `-created_at` and may be changed by an ordering-aware filter backend on the view.
+    The total count is returned unless the client passes `skip_count=true`.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+    tiebreaker_field = 'pkid'
+    skip_count_query_param = 'skip_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        self.count = None
+        if not self.should_skip_count(request):
+            self.count = queryset.order_by().count()
+
+        key_field = self.ordering[0]
+        descending = key_field.startswith('-')
+        field_name = key_field.lstrip('-')
+
+        # A reversed cursor walks backwards from the first row of the current page
+        reverse = self.cursor is not None and self.cursor.reverse
+        walk_descending = descending != reverse
+        prefix = '-' if walk_descending else ''
+        queryset = queryset.order_by(f'{prefix}{field_name}', f'{prefix}{self.tiebreaker_field}')
+
+        if self.cursor is not None:
+            lookup = 'lt' if walk_descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field_name}__{lookup}': self.cursor.position}) |
+                Q(**{field_name: self.cursor.position, f'{self.tiebreaker_field}__{lookup}': self.cursor.pkid})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Uses the first filter backend that provides an ordering for this request, e.g. the
+        search backend's relevance ranking, then an OrderingFilter, then the default ordering.
+        """
+        for filter_cls in getattr(view, 'filter_backends', []):
+            if not hasattr(filter_cls, 'get_ordering'):
+                continue
+            ordering = filter_cls().get_ordering(request, queryset, view)
+            if ordering:
+                return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        return (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+
+    def should_skip_count(self, request):
+        value = request.query_params.get(self.skip_count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._get_cursor_from_instance(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._get_cursor_from_instance(self.page[0], reverse=True))
+
+    def _get_cursor_from_instance(self, instance, reverse):
+        position = self._get_position_from_instance(instance, self.ordering)
+        if isinstance(instance, dict):
+            pkid = instance[self.tiebreaker_field]
+        else:
+            pkid = getattr(instance, self.tiebreaker_field)
+        return KeysetCursor(position=position, pkid=pkid, reverse=reverse)
+
+    def _get_position_from_instance(self, instance, ordering):
+        field_name = ordering[0].lstrip('-')
+        if isinstance(instance, dict):
+            attr = instance[field_name]
+        else:
+            attr = getattr(instance, field_name)
+        return attr.isoformat() if hasattr(attr, 'isoformat') else str(attr)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('utf-8')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            position = tokens['p'][0]
+            pkid = int(tokens['k'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return KeysetCursor(position=position, pkid=pkid, reverse=reverse)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': cursor.position, 'k': str(cursor.pkid)}
+        if cursor.reverse:
+            tokens['r'] = '1'
+
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_pagination_data(self):
+        data = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.count is not None:
+            data['count'] = self.count
+        return data
+
+    def get_paginated_response(self, data):
+        return Response({**self.get_pagination_data(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {
+            'type': 'integer',
+            'example': 123,
+            'description': f'Omitted when `{self.skip_count_query_param}=true` is passed.',
+        }
+        return response_schema
@@ -0,0 +1,160 @@
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from django.conf import settings
+from django.db.models.fields.related_descriptors import ForwardManyToOneDescriptor, ReverseOneToOneDescriptor
+from rest_framework import serializers
+
+LazyLoad = namedtuple('LazyLoad', ['relation', 'location', 'serializer_field'])
+
+_lazy_loads = ContextVar('lazy_loads', default=())
+
+
+def get_relation(model, attr):
+    """
+    Returns the relation reached through the attribute `attr` of the model, or None when it is not a relation.
+    Reverse relations are looked up by accessor name (e.g. `vital_signs`, `patientdiagnosisdetails_set`).
+    """
+    for field in model._meta.get_fields():
+        if not field.is_relation:
+            continue
+        accessor = field.get_accessor_name() if field.auto_created and not field.concrete else field.name
+        if accessor == attr:
+            return field
+    return None
+
+
+def follow_relations(model, attrs, path, prefetched, select_related, prefetch_related):
+    """
+    Walks `attrs` through the model's relations, adding the lookup of each relation crossed.
+    Single-valued relations are joined until a to-many relation is crossed, which is prefetched along
+    with everything after it. Returns (model, path, prefetched) after the last attribute, with model None
+    when the attributes do not end on a relation.
+    """
+    for attr in attrs:
+        relation = get_relation(model, attr)
+        if relation is None:
+            return None, path, prefetched
+        prefetched = prefetched or relation.one_to_many or relation.many_to_many
+        if prefetched:
+            path = f'{path}__{attr}' if path else attr
+            prefetch_related.add(path)
+        else:
+            # select_related follows a reverse one-to-one by its query name
+            path = f'{path}__{relation.name}' if path else relation.name
+            select_related.add(path)
+        model = relation.related_model
+    return model, path, prefetched
+
+
+def collect_relations(serializer, model, path, prefetched, select_related, prefetch_related):
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        attrs = [] if field.source == '*' else field.source_attrs
+        if isinstance(field, serializers.RelatedField) and field.use_pk_only_optimization():
+            # Reads the foreign key column, the related object is never loaded
+            attrs = attrs[:-1]
+        target, target_path, target_prefetched = follow_relations(model, attrs, path, prefetched, select_related, prefetch_related)
+        if target is None:
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            collect_relations(field, target, target_path, target_prefetched, select_related, prefetch_related)
+
+    # SerializerMethodFields cannot be inspected, the serializer lists the relations they read
+    for lookup in getattr(getattr(serializer, 'Meta', None), 'related_fields', []):
+        follow_relations(model, lookup.split('.'), path, prefetched, select_related, prefetch_related)
+
+
+@lru_cache(maxsize=None)
+def get_serializer_relations(serializer_class, model):
+    """
+    Returns the (select_related, prefetch_related) lookups that load every relation the serializer reads.
+    """
+    select_related, prefetch_related = set(), set()
+    collect_relations(serializer_class(), model, '', False, select_related, prefetch_related)
+    return sorted(select_related), sorted(prefetch_related)
+
+
+def get_caller_location():
+    """
+    Returns "path:line in function" of the innermost frame in the apps' own code, skipping these shared helpers.
+    """
+    base_dir = str(settings.BASE_DIR)
+    shared_dir = str(Path(__file__).parent)
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(base_dir) and not filename.startswith(shared_dir) and 'site-packages' not in filename:
+            return f"{Path(filename).relative_to(base_dir)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown location"
+
+
+def get_serializer_field():
+    """
+    Returns "Serializer.field" for the field the innermost serializer is rendering, or None outside of rendering.
+    Relies on Serializer.to_representation looping over its fields as `field`.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        serializer, field = frame.f_locals.get('self'), frame.f_locals.get('field')
+        if (frame.f_code.co_name == 'to_representation' and isinstance(serializer, serializers.Serializer)
+                and isinstance(field, serializers.Field)):
+            return f"{type(serializer).__name__}.{field.field_name}"
+        frame = frame.f_back
+    return None
+
+
+def record_lazy_load(instance, name):
+    trackers = _lazy_loads.get()
+    if trackers:
+        lazy_load = LazyLoad(f"{type(instance).__name__}.{name}", get_caller_location(), get_serializer_field())
+        for loads in trackers:
+            loads.append(lazy_load)
+
+
+def install_lazy_load_hooks():
+    """
+    Wraps the descriptors that load a foreign key or one-to-one relation missing from the instance cache.
+    Loads are only recorded inside track_lazy_loads(), elsewhere the hooks do nothing.
+    """
+    if getattr(ForwardManyToOneDescriptor.get_object, 'records_lazy_loads', False):
+        return
+
+    get_object = ForwardManyToOneDescriptor.get_object
+    get_queryset = ReverseOneToOneDescriptor.get_queryset
+
+    def get_forward_object(self, instance):
+        record_lazy_load(instance, self.field.name)
+        return get_object(self, instance)
+
+    def get_reverse_queryset(self, **hints):
+        # The instance hint is only passed when loading the object of one instance, not when prefetching
+        if 'instance' in hints:
+            record_lazy_load(hints['instance'], self.related.get_accessor_name())
+        return get_queryset(self, **hints)
+
+    get_forward_object.records_lazy_loads = True
+    ForwardManyToOneDescriptor.get_object = get_forward_object
+    ReverseOneToOneDescriptor.get_queryset = get_reverse_queryset
+
+
+@contextmanager
+def track_lazy_loads():
+    """
+    Collects the foreign key and one-to-one relations loaded lazily inside the block, as LazyLoad tuples.
+    Blocks can be nested, a load is collected by every enclosing block.
+    """
+    install_lazy_load_hooks()
+    loads = []
+    token = _lazy_loads.set((*_lazy_loads.get(), loads))
+    try:
+        yield loads
+    finally:
+        _lazy_loads.reset(token)
@@ -0,0 +1,104 @@
+import re
+from functools import reduce
+from operator import and_, or_
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast, Greatest
+from rest_framework.filters import SearchFilter
+
+SEARCH_CONFIG = 'simple'
+
+
+def build_prefix_query(terms, config=SEARCH_CONFIG):
+    """
+    Builds a raw tsquery that matches every word of the search terms as a prefix, e.g. "ada lov" -> "ada:* & lov:*".
+    Only word characters are kept so user input can never produce an invalid tsquery.
+    """
+    words = [word for term in terms for word in re.findall(r'\w+', term)]
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=config)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for DRF's SearchFilter backed by PostgreSQL full-text and trigram indexes.
+
+    On PostgreSQL a row matches when its `search_vector` matches every search word as a prefix,
+    or when every word is trigram-similar to one of the `search_fields` (typo tolerance).
+    Matches are annotated with `search_rank` and ranked by KeysetPagination through `get_ordering`.
+    Other databases fall back to the regular SearchFilter `icontains` behaviour.
+
+    Views may set:
+    - `search_vector_field`: the tsvector column, defaults to `search_vector`.
+    - `search_config`: the text search configuration the vector was built with, defaults to `simple`.
+    - `search_query_type`: `prefix` (every word as a prefix, for names and codes) or `websearch`
+      (quoted phrases, `or` and `-` exclusions, for free text).
+    - `trigram_search_fields`: fields matched by trigram similarity, defaults to `search_fields`.
+    """
+    rank_annotation = 'search_rank'
+
+    def is_full_text_available(self, queryset):
+        return connections[queryset.db].vendor == 'postgresql'
+
+    def get_search_vector_field(self, view):
+        return getattr(view, 'search_vector_field', 'search_vector')
+
+    def get_trigram_fields(self, view, request):
+        fields = getattr(view, 'trigram_search_fields', None)
+        if fields is None:
+            fields = self.get_search_fields(view, request) or []
+        # Strip DRF lookup prefixes such as '^', '=' and '@'
+        return [field.lstrip('^=@$') for field in fields]
+
+    def get_search_query(self, request, view):
+        """
+        Returns the SearchQuery for this request, or None when there is nothing to search for.
+        """
+        config = getattr(view, 'search_config', SEARCH_CONFIG)
+        if getattr(view, 'search_query_type', 'prefix') == 'websearch':
+            text = request.query_params.get(self.search_param, '').replace('\x00', '').strip()
+            return SearchQuery(text, search_type='websearch', config=config) if text else None
+        return build_prefix_query(self.get_search_terms(request), config)
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not self.is_full_text_available(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        query = self.get_search_query(request, view)
+        if query is None:
+            return queryset
+
+        vector_field = self.get_search_vector_field(view)
+        trigram_fields = self.get_trigram_fields(view, request)
+        phrase = ' '.join(search_terms)
+
+        condition = Q(**{vector_field: query})
+        if trigram_fields:
+            fuzzy = reduce(and_, (
+                reduce(or_, (Q(**{f'{field}__trigram_word_similar': term}) for field in trigram_fields))
+                for term in search_terms
+            ))
+            condition |= fuzzy
+
+        similarities = [TrigramWordSimilarity(phrase, field) for field in trigram_fields]
+        rank = SearchRank(F(vector_field), query)
+        if len(similarities) > 1:
+            rank = rank + Greatest(*similarities)
+        elif similarities:
+            rank = rank + similarities[0]
+
+        # ts_rank returns a real; casting keeps the value exact when KeysetPagination round-trips it through a cursor
+        rank = Cast(rank, output_field=FloatField())
+        return queryset.filter(condition).annotate(**{self.rank_annotation: rank})
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Ranks search results by relevance. Returns None when no search is active so that
+        other ordering backends (or the paginator default) decide the ordering.
+        """
+        if self.get_search_terms(request) and self.is_full_text_available(queryset):
+            return (f'-{self.rank_annotation}',)
+        return None
@@ -0,0 +1,107 @@
+from collections import defaultdict
+from cloudinary import CloudinaryResource
+from rest_framework import serializers
+
+
+def get_lookup(source):
+    return source.replace('.', '__')
+
+
+class CloudinaryValueField(serializers.Field):
+    """
+    Renders a CloudinaryField read through values() the way ModelSerializer renders it, e.g. "image/upload/default.png".
+    """
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return value.get_prep_value() if isinstance(value, CloudinaryResource) else value
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """
+    Loads the to-many relations of a page of rows with one query per relation before rendering it.
+    """
+    def to_representation(self, data):
+        rows = list(data)
+        for field in self.child.get_prefetched_fields():
+            self.child.prefetch(field, rows)
+        return [self.child.to_representation(row) for row in rows]
+
+
+class ValuesSerializer(serializers.Serializer):
+    """
+    Read-only serializer for list endpoints that renders `values()` rows instead of model instances.
+
+    Fields declare what they read with `source`, a dotted source such as `user.email` reads the
+    `user__email` lookup, so `get_values_queryset()` joins every forward relation in the page query
+    (the values() counterpart of select_related). Nested ValuesSerializers declared with `many=True` are
+    loaded with one query per page, like prefetch_related, and nested ones without it are joined.
+    `Meta.model` is the model of the rows.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs['child'] = cls(context=kwargs.get('context', {}))
+        return ValuesListSerializer(*args, **kwargs)
+
+    @classmethod
+    def get_lookups(cls, prefix=''):
+        """
+        Returns the values() lookups read by the declared fields.
+        """
+        lookups = []
+        for name, field in cls._declared_fields.items():
+            if isinstance(field, serializers.ListSerializer):
+                continue
+            lookup = prefix + get_lookup(field.source or name)
+            if isinstance(field, ValuesSerializer):
+                lookups.extend(field.get_lookups(prefix=f'{lookup}__'))
+            elif field.source != '*':
+                lookups.append(lookup)
+        return lookups
+
+    @classmethod
+    def get_values_queryset(cls, queryset, *lookups):
+        """
+        Turns the queryset into one returning the rows this serializer renders, plus the given lookups.
+        The primary key and the annotations, e.g. a search rank used for ordering, are always selected.
+        """
+        pk = queryset.model._meta.pk.attname
+        return queryset.values(*dict.fromkeys([pk, *lookups, *cls.get_lookups(), *queryset.query.annotations]))
+
+    def get_prefetched_fields(self):
+        return [
+            field for field in self.fields.values()
+            if isinstance(field, serializers.ListSerializer) and isinstance(field.child, ValuesSerializer)
+        ]
+
+    def prefetch(self, field, rows):
+        """
+        Stores the related rows of the reverse relation named by the field's source on every row, under that source.
+        """
+        relation = self.Meta.model._meta.get_field(field.source)
+        key, foreign_key = relation.field.target_field.attname, relation.field.attname
+        queryset = relation.related_model._default_manager.filter(**{f'{relation.field.name}__in': [row[key] for row in rows]})
+        related = defaultdict(list)
+        for related_row in field.child.get_values_queryset(queryset, foreign_key):
+            related[related_row[foreign_key]].append(related_row)
+        for row in rows:
+            row[field.source] = related[row[key]]
+
+    def to_representation(self, row, prefix=''):
+        representation = {}
+        for field in self._readable_fields:
+            if field.source == '*':
+                representation[field.field_name] = field.to_representation(row)
+                continue
+            lookup = prefix + get_lookup(field.source)
+            if isinstance(field, ValuesSerializer):
+                representation[field.field_name] = field.to_representation(row, prefix=f'{lookup}__')
+            elif isinstance(field, serializers.ListSerializer):
+                representation[field.field_name] = field.to_representation(row[field.source])
+            else:
+                value = row[lookup]
+                representation[field.field_name] = None if value is None else field.to_representation(value)
+        return representation
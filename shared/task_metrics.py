@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+from celery.signals import (
+    before_task_publish, task_failure, task_postrun, task_prerun, task_retry, worker_init, worker_process_shutdown,
+)
+from prometheus_client import make_wsgi_app, multiprocess
+from prometheus_client.exposition import ThreadingWSGIServer
+from .metrics import TASK_DURATION, TASK_FAILURES, TASK_QUEUE_WAIT, TASK_RETRIES, get_registry, is_scrape_allowed
+
+logger = logging.getLogger(__name__)
+
+ENQUEUED_AT_HEADER = 'enqueued_at'
+
+# Start times of the tasks running in this process, by task id
+started_at = {}
+
+
+@before_task_publish.connect
+def stamp_enqueue_time(headers=None, **kwargs):
+    if headers is not None:
+        headers[ENQUEUED_AT_HEADER] = time.time()
+
+
+def get_queue_wait(request, now):
+    enqueued_at = getattr(request, ENQUEUED_AT_HEADER, None) or (request.headers or {}).get(ENQUEUED_AT_HEADER)
+    if enqueued_at is None:
+        # Eager tasks and messages published before the header existed
+        return None
+    ready_at = float(enqueued_at)
+    # A countdown or retry delay is not time spent waiting for a worker
+    if request.eta:
+        eta = request.eta if isinstance(request.eta, datetime) else datetime.fromisoformat(request.eta)
+        ready_at = max(ready_at, eta.timestamp())
+    return max(now - ready_at, 0)
+
+
+@task_prerun.connect
+def record_task_start(task_id=None, task=None, **kwargs):
+    now = time.time()
+    started_at[task_id] = time.perf_counter()
+    wait = get_queue_wait(task.request, now)
+    if wait is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(wait)
+
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    start = started_at.pop(task_id, None)
+    if start is not None:
+        TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - start)
+
+
+@task_retry.connect
+def count_task_retry(sender=None, **kwargs):
+    TASK_RETRIES.labels(sender.name).inc()
+
+
+@task_failure.connect
+def count_task_failure(sender=None, exception=None, **kwargs):
+    TASK_FAILURES.labels(sender.name, type(exception).__name__).inc()
+
+
+class SilentRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        # One line per scrape would drown the worker log
+        pass
+
+
+def make_metrics_app():
+    metrics_app = make_wsgi_app(get_registry())
+
+    def app(environ, start_response):
+        if not is_scrape_allowed(environ.get('HTTP_AUTHORIZATION', '')):
+            start_response('403 Forbidden', [('Content-Type', 'text/plain')])
+            return [b'Forbidden']
+        return metrics_app(environ, start_response)
+    return app
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    """
+    Serves the worker metrics on CELERY_METRICS_PORT, bound to CELERY_METRICS_ADDR (localhost by default) and
+    behind the same METRICS_TOKEN as /metrics. Prefork children record into PROMETHEUS_MULTIPROC_DIR,
+    which the server merges, so set it for any pool other than solo or threads.
+    """
+    port = os.environ.get('CELERY_METRICS_PORT')
+    if not port:
+        return
+    addr = os.environ.get('CELERY_METRICS_ADDR', '127.0.0.1')
+    server = make_server(addr, int(port), make_metrics_app(), ThreadingWSGIServer, handler_class=SilentRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Serving Celery metrics on {addr}:{port}")
+
+
+@worker_process_shutdown.connect
+def mark_process_dead(pid=None, **kwargs):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class NPlusOneDetectionRunner(DiscoverRunner):
+    """
+    Test runner turning on NPlusOneDetectionMiddleware in TEST_N_PLUS_ONE_DETECTION mode, "raise" by default,
+    whatever the settings module, so N+1 queries fail the tests that send requests.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.n_plus_one_detection = override_settings(
+            N_PLUS_ONE_DETECTION=getattr(settings, 'TEST_N_PLUS_ONE_DETECTION', 'raise')
+        )
+        self.n_plus_one_detection.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.n_plus_one_detection.disable()
+        super().teardown_test_environment(**kwargs)
@@ -42,3 +42,13 @@ class MaritalStatus(models.TextChoices):
 class Gender(models.TextChoices):
     MALE = "Male",_("Male")
     FEMALE = "Female",_("Female")
+
+class ImportStatus(models.TextChoices):
+    PENDING = "Pending",_("Pending")
+    PROCESSING = "Processing",_("Processing")
+    COMPLETED = "Completed",_("Completed")
+    FAILED = "Failed",_("Failed")
+
+class ImportFileFormat(models.TextChoices):
+    CSV = "csv",_("CSV")
+    JSONL = "jsonl",_("JSON Lines")